@@ -7,35 +7,76 @@ import cv2
 import time
 from src.detector.template_matcher import TemplateMatcher
 from src.detector.table_detector import PokerTableDetector
+from src.detector.table_frame import TableFrame
 from src.utils.device_connector import DeviceConnector
 from src.utils.bot_controller import BotController
 from src.engine.preflop_strategy import PreFlopStrategy
+from src.engine.stub_post_flop_engine import StubPostFlopEngine
 from src.models.hand_history import HandHistory
-from src.engine.post_flop_engine import PostFlopEngine
-from src.engine.claude_post_flop_engine import ClaudePostFlopEngine
 from src.utils.logger import PokerBotLogger  # Import the new logger
+from src.utils.tick_timer import TickTimer, span
+from src.utils.trace_log import TraceDashboard, TraceLog
+from src.utils.frame_recorder import FrameRecorder
+from src.utils.poll_scheduler import PollScheduler, frame_signature
+from src.utils.screen_capture import create_screen_capture
 from dotenv import load_dotenv
 load_dotenv()  # Load environment variables for OpenAI API key
 
 class PokerDetectorApp:
-    def __init__(self):
-        self.device = DeviceConnector.connect_device()
-        self.template_matcher = TemplateMatcher('card_templates')
-        self.table_detector = PokerTableDetector(self.template_matcher)
+    def __init__(self, device=None, ai_provider: str = None, realtime: bool = True):
+        """
+        Args:
+            device: ppadb device, or a FakeDevice for replays; connects to the emulator if omitted
+            ai_provider (str): 'openai', 'claude' or 'stub', defaults to the AI_PROVIDER environment variable
+            realtime (bool): Sleep between ticks and after taps; replays run as fast as frames can be processed
+        """
+        self.device = device or DeviceConnector.connect_device()
+        self.realtime = realtime
+        # 'png' (screencap -p), 'raw' (uncompressed framebuffer, converted per region)
+        # or 'stream' (background thread keeping the latest frames in a ring buffer)
+        capture_backend = os.environ.get("CAPTURE_BACKEND", "png").lower()
+        self.screen_capture = create_screen_capture(self.device, capture_backend)
+        # Presence checks (hero turn, next hand, dealer button, pot type) read a frame subsampled
+        # by this factor; cards and amounts always use full-resolution crops. 1 disables the tier
+        presence_downscale = int(os.environ.get("PRESENCE_DOWNSCALE", "2"))
+        self.template_matcher = TemplateMatcher('card_templates', presence_downscale=presence_downscale)
+        # 'auto' uses a persistent tesserocr handle when installed, else one tesseract process per frame
+        ocr_engine = os.environ.get("OCR_ENGINE", "auto").lower()
+        # Region jobs of detect_table_state run 'serial' (default), or on a 'thread' or 'process' pool (see readme)
+        region_executor = os.environ.get("REGION_EXECUTOR", "serial").lower()
+        region_workers = int(os.environ.get("REGION_WORKERS", "0")) or None
+        # GLYPH_DIGITS=1 reads amounts from digit glyph templates first (needs all ten, see readme)
+        glyph_digits = os.environ.get("GLYPH_DIGITS", "0") == "1"
+        self.table_detector = PokerTableDetector(self.template_matcher, ocr_engine=ocr_engine,
+                                                 executor=region_executor, workers=region_workers,
+                                                 glyph_digits=glyph_digits)
         self.bot_controller = BotController()
+        self.bot_controller.register_cleanup(self.table_detector.shutdown)
         self.preflop_strategy = PreFlopStrategy()
         
         # Initialize the logger
         self.logger = PokerBotLogger()
+        self.logger.log_text(f"Capture backend: {capture_backend}")
+        self.logger.log_text(f"OCR engine: {self.table_detector.text_detector.engine.name}")
+        self.logger.log_text(f"Presence tier downscale: {self.template_matcher.presence_downscale}x")
+        self.logger.log_text(f"Region executor: {region_executor} "
+                             f"({self.table_detector.executor.workers} workers)")
         self.logged_hand_ids = set()
         
         # Choose which engine to use based on environment variable
-        ai_provider = os.environ.get("AI_PROVIDER", "openai").lower()
+        ai_provider = (ai_provider or os.environ.get("AI_PROVIDER", "openai")).lower()
+        # LLM clients are imported on demand so replays run without the API packages
         if ai_provider == "claude":
+            from src.engine.claude_post_flop_engine import ClaudePostFlopEngine
             print("Using Claude API for post-flop decision making")
             self.logger.log_text("Using Claude API for post-flop decision making")
             self.post_flop_engine = ClaudePostFlopEngine()
+        elif ai_provider == "stub":
+            print("Using the deterministic stub for post-flop decision making")
+            self.logger.log_text("Using the deterministic stub for post-flop decision making")
+            self.post_flop_engine = StubPostFlopEngine()
         else:
+            from src.engine.post_flop_engine import PostFlopEngine
             print("Using OpenAI API for post-flop decision making")
             self.logger.log_text("Using OpenAI API for post-flop decision making")
             self.post_flop_engine = PostFlopEngine()
@@ -43,11 +84,92 @@ class PokerDetectorApp:
         self.current_hand = None
         self.hand_id_counter = 0
         self.last_action_taken = None
+        self.tick_timer = TickTimer()
+        # Detectors report nested spans (OCR, region jobs, capture decode) to this tick's timer
+        self.tick_timer.activate()
+        self.trace_log = TraceLog(os.path.join(self.logger.session_dir, 'trace.jsonl'))
+        # TRACE_HTTP_PORT serves rolling per-stage percentiles on localhost, 0 disables it
+        self.dashboard = None
+        dashboard_port = int(os.environ.get("TRACE_HTTP_PORT", "0"))
+        if dashboard_port:
+            self.dashboard = TraceDashboard(self.trace_log, dashboard_port)
+            self.dashboard.start()
+            print(f"Latency dashboard at {self.dashboard.url}")
+            self.logger.log_text(f"Latency dashboard at {self.dashboard.url}")
+        # Region layout of the device screen, calibrated from the first frame showing the anchor.
+        # The anchor is missing in about half the hands; until it shows up the width-based layout
+        # is used and the anchor is searched again only every CALIBRATION_RETRY_FRAMES captures
+        self.geometry = None
+        self.calibration_retry_frames = int(os.environ.get("CALIBRATION_RETRY_FRAMES", "20"))
+        self._captures_since_calibration = 0
+        # Ticks follow each other every POLL_MIN_INTERVAL s while the table moves and back off
+        # to POLL_INTERVAL s while it is idle; taps wait until the screen reacts, at most SETTLE_TIMEOUT s
+        self.poll_interval = float(os.environ.get("POLL_INTERVAL", "1.0"))
+        self.scheduler = PollScheduler(min_interval=float(os.environ.get("POLL_MIN_INTERVAL", "0.1")),
+                                       max_interval=self.poll_interval,
+                                       settle_timeout=float(os.environ.get("SETTLE_TIMEOUT", "3.0")))
+        # What the last tick saw and did, for replays and benchmarks
+        self.last_tick: dict = {}
+        # RECORD_FRAMES=1 archives every tick's table regions, state and action next to the session log
+        self.recorder = None
+        if os.environ.get("RECORD_FRAMES", "0") == "1":
+            self.recorder = FrameRecorder(os.path.join(self.logger.session_dir, 'frames'))
+            self.logger.log_text(f"Recording frames to {self.recorder.archive_dir}")
+
+    def wait(self, seconds: float):
+        """Sleep for UI animations and polling; a no-op when replaying recorded frames"""
+        if self.realtime:
+            with span('sleep'):
+                time.sleep(seconds)
+
+    def tap(self, x: int, y: int):
+        """Send a tap to the device and mark when it left, for capture-to-tap latency"""
+        with span('tap'):
+            self.device.shell(f"input tap {x} {y}")
+        self.tick_timer.mark('tap')
+
+    def tap_and_settle(self, x: int, y: int, regions, timeout: float):
+        """
+        Tap, then wait until one of the regions changes instead of sleeping a fixed time
+
+        Args:
+            x, y (int): Screen position to tap
+            regions (list): Regions the tap is expected to change, e.g. the action strip
+            timeout (float): Longest wait, the fixed sleep this replaces
+        """
+        frame = self.last_tick.get('frame')
+        before = frame_signature(frame, regions) if self.realtime and frame is not None else None
+        self.tap(x, y)
+        if before is None:
+            return
+        if self.scheduler.wait_for_change(self.capture_frame, before, timeout) is None:
+            print(f"Screen did not react to the tap at ({x},{y}) within {timeout:.1f}s")
+            self.logger.log_text(f"No change in {regions} {timeout:.1f}s after tapping ({x},{y})")
+
+    def pace(self, frame: TableFrame):
+        """Wait before the next tick: briefly while the table moves, backing off while it is idle"""
+        self.wait(self.scheduler.after_tick(frame, acted='tap' in self.tick_timer.marks))
 
     def capture_screen(self) -> np.ndarray:
-        screenshot_data = self.device.screencap()
-        nparr = np.frombuffer(screenshot_data, np.uint8)
-        return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        return self.screen_capture.capture()
+
+    def capture_frame(self) -> TableFrame:
+        """Capture a frame laid out with the device's table geometry, calibrating it until that succeeds"""
+        frame = TableFrame(self.capture_screen(), self.geometry)
+        if self.geometry is not None and self.geometry.calibrated:
+            return frame
+        self._captures_since_calibration += 1
+        if self.geometry is not None and self._captures_since_calibration < self.calibration_retry_frames:
+            return frame
+
+        self._captures_since_calibration = 0
+        self.geometry = self.template_matcher.calibrate(frame)
+        if self.geometry.calibrated:
+            message = (f"Table geometry calibrated: scale {self.geometry.scale:.3f}, "
+                       f"offset ({self.geometry.offset_x:.0f}, {self.geometry.offset_y:.0f})")
+            print(message)
+            self.logger.log_text(message)
+        return TableFrame(frame.screen, self.geometry)
 
     def print_available_actions(self, actions):
         print("\nAvailable Actions:")
@@ -68,18 +190,20 @@ class PokerDetectorApp:
         if check_info['available'] and check_info['position'] is not None:
             x, y = check_info['position']
             print(f"Automatically tapping CHECK at ({x},{y})")
-            self.device.shell(f"input tap {x} {y}")
+            self.tap_and_settle(x, y, ['action_strip', 'hero_turn'], timeout=2)
 
-            time.sleep(2)  # Wait for a second before the next action
-
-    def check_and_click_next_hand(self) -> bool:
+    def check_and_click_next_hand(self, screen: np.ndarray = None) -> bool:
         """
         Check for the 'Next Hand' button and click it if detected.
         
+        Args:
+            screen (np.ndarray): Frame captured for this tick, a new one is taken if omitted
+            
         Returns:
             bool: True if button was found and clicked, False otherwise
         """
-        screen = self.capture_screen()
+        if screen is None:
+            screen = self.capture_screen()
         is_detected, position = self.template_matcher.detect_next_hand_button(screen)
         
         if is_detected:
@@ -108,8 +232,9 @@ class PokerDetectorApp:
                 self.logger.log_text(f"Completed hand #{self.hand_id_counter}")
                 self.logged_hand_ids.add(self.current_hand.hand_id)
                 
-            self.device.shell(f"input tap {x} {y}")
-            time.sleep(1)  # Give time for the action to take effect
+            # Until the button is gone; the next hand's cards are picked up by the fast polls after it
+            self.tap_and_settle(x, y, ['next_hand'], timeout=4)
+            self.table_detector.reset_hand_cache()  # Cards memoized for this hand are no longer valid
             self.current_hand = None  # Reset hand history
             self.last_action_taken = None  # Clear last action as well
             return True
@@ -231,7 +356,8 @@ class PokerDetectorApp:
         """Take an action based on the current state and street."""
         # If it's preflop, use preflop strategy
         if current_state['street'] == "Preflop":
-            action_info = self.preflop_strategy.get_action(current_state)
+            with span('preflop_strategy'):
+                action_info = self.preflop_strategy.get_action(current_state)
         else:
             # For post-flop, use the ChatGPT engine
             if self.current_hand is None:
@@ -239,7 +365,8 @@ class PokerDetectorApp:
                 self.start_new_hand(current_state['hero_cards'])
                 self.update_hand_history(current_state, None)
             
-            action_info = self.post_flop_engine.get_decision(current_state, self.current_hand)
+            with span('post_flop_engine'):
+                action_info = self.post_flop_engine.get_decision(current_state, self.current_hand)
         
         action = action_info['action']
         position = action_info.get('position')
@@ -259,86 +386,128 @@ class PokerDetectorApp:
         if position is not None:
             x, y = position
             print(f"Tapping at ({x},{y})")
-            self.device.shell(f"input tap {x} {y}")
-            time.sleep(3)  # Wait for animation or next state
+            # Until the action buttons or the turn bar react, not a fixed animation time
+            self.tap_and_settle(x, y, ['action_strip', 'hero_turn'], timeout=self.scheduler.settle_timeout)
             
         # Store the action and the current street for hand history tracking
         action_info['street'] = current_state['street']
         self.last_action_taken = action_info
         return action_info
 
-    def run(self):
-        previous_state = None
-        
-        print("Bot started. Press Ctrl+C to stop.") 
-        self.logger.log_text("Bot started. Press Ctrl+C to stop.")
-        
-        while self.bot_controller.should_continue():
-            try:
-                # First check if the next hand button is visible
-                if self.check_and_click_next_hand():
-                    print("Moving to next hand...")
-                    self.logger.log_text("Moving to next hand...")
-                    time.sleep(3)  # Give extra time for next hand to load
-                    self.current_hand = None  # Reset hand history
-                    previous_state = None  # Reset previous state
-                    continue  # Skip to next iteration
-
-                screen = self.capture_screen()
-                is_hero_turn = self.table_detector.detect_hero_turn(screen)
+    def tick(self, previous_state):
+        """
+        One iteration of the bot loop on a freshly captured frame
+
+        Args:
+            previous_state (dict): State of the last change this hand, None at the start of a hand
+
+        Returns:
+            dict: The state the next tick compares against
+        """
+        self.last_tick = {'frame': None, 'snapshot': None, 'next_hand': False, 'hero_turn': False,
+                          'state': None, 'action': None}
+        # One capture per tick, shared by every stage below along with its region views
+        self.tick_timer.reset()
+        with self.tick_timer.stage('capture'):
+            screen = self.capture_frame()
+        self.last_tick['frame'] = screen
+        if self.recorder is not None:
+            # Pin the recorded regions to this capture, before taps and settle waits
+            self.last_tick['snapshot'] = self.recorder.snapshot(screen)
+
+        # First check if the next hand button is visible
+        with self.tick_timer.stage('next_hand'):
+            next_hand_clicked = self.check_and_click_next_hand(screen)
+        if next_hand_clicked:
+            print("Moving to next hand...")
+            self.logger.log_text("Moving to next hand...")
+            self.current_hand = None  # Reset hand history
+            self.last_tick['next_hand'] = True
+            self.pace(screen)
+            return None  # Reset previous state and skip to next iteration
+
+        with self.tick_timer.stage('hero_turn'):
+            is_hero_turn = self.table_detector.detect_hero_turn(screen)
+        self.last_tick['hero_turn'] = is_hero_turn
                 
-                if is_hero_turn:
-                    current_state = self.table_detector.detect_table_state(screen)
+        if is_hero_turn:
+            with self.tick_timer.stage('table_state'):
+                current_state = self.table_detector.detect_table_state(screen, is_hero_turn=True)
+            self.last_tick['state'] = current_state
                     
-                    # Check if this is a new hand
-                    if self.is_new_hand(current_state, previous_state):
-                        self.start_new_hand(current_state['hero_cards'])
-                        previous_state = None  # Reset previous state for a new hand
+            # Check if this is a new hand
+            if self.is_new_hand(current_state, previous_state):
+                self.start_new_hand(current_state['hero_cards'])
+                previous_state = None  # Reset previous state for a new hand
                     
-                    if self._has_state_changed(previous_state, current_state):
-                        # Update hand history based on changes
-                        if self.current_hand:
-                            self.update_hand_history(current_state, previous_state)
+            if self._has_state_changed(previous_state, current_state):
+                # Update hand history based on changes
+                if self.current_hand:
+                    self.update_hand_history(current_state, previous_state)
                         
-                        print("\n=== Table State ===")
-                        print(f"Street: {current_state['street']}")
-                        print("Hero cards:", [f"{c.rank}{c.suit}" for c in current_state['hero_cards']])
-                        print("Community cards:", [f"{c.rank}{c.suit}" for c in current_state['community_cards']])
-                        print(f"Hero stack: ${current_state['stacks']['hero']:.2f}")
-                        print(f"Villain stack: ${current_state['stacks']['villain']:.2f}")
-                        print(f"Hero bet: ${current_state['bets']['hero']:.2f}")
-                        print(f"Villain bet: ${current_state['bets']['villain']:.2f}")
-                        print(f"Pot size: ${current_state['pot_size']:.2f}")
-                        print(f"Positions: {current_state['positions']}")
-                        print(f"preflop_pot_type: {current_state['preflop_pot_type']}")
+                print("\n=== Table State ===")
+                print(f"Street: {current_state['street']}")
+                print("Hero cards:", [f"{c.rank}{c.suit}" for c in current_state['hero_cards']])
+                print("Community cards:", [f"{c.rank}{c.suit}" for c in current_state['community_cards']])
+                print(f"Hero stack: ${current_state['stacks']['hero']:.2f}")
+                print(f"Villain stack: ${current_state['stacks']['villain']:.2f}")
+                print(f"Hero bet: ${current_state['bets']['hero']:.2f}")
+                print(f"Villain bet: ${current_state['bets']['villain']:.2f}")
+                print(f"Pot size: ${current_state['pot_size']:.2f}")
+                print(f"Positions: {current_state['positions']}")
+                print(f"preflop_pot_type: {current_state['preflop_pot_type']}")
                         
-                        # Log the current table state
-                        self.logger.log_table_state(current_state, self.hand_id_counter)
+                # Log the current table state
+                self.logger.log_table_state(current_state, self.hand_id_counter)
                         
-                        # Print hand history
-                        if self.current_hand:
-                            print("\n=== Hand History ===")
-                            print(self.current_hand.format_history())
+                # Print hand history
+                if self.current_hand:
+                    print("\n=== Hand History ===")
+                    print(self.current_hand.format_history())
                             
-                        print("================")
+                print("================")
                         
-                        # Print available actions
-                        print("\nAvailable Actions with Button Locations:")
-                        for action, data in current_state['available_actions'].items():
-                            if action in ['FOLD', 'CALL', 'CHECK']:
-                                if data.get('available'):
-                                    print(f"{action}: {data}")
-                            else:  # For 'R' and 'B'
-                                if data:  # List not empty
-                                    print(f"{action}: {data}")
-
-                        # Take action
-                        self.take_action(current_state)
+                # Print available actions
+                print("\nAvailable Actions with Button Locations:")
+                for action, data in current_state['available_actions'].items():
+                    if action in ['FOLD', 'CALL', 'CHECK']:
+                        if data.get('available'):
+                            print(f"{action}: {data}")
+                    else:  # For 'R' and 'B'
+                        if data:  # List not empty
+                            print(f"{action}: {data}")
+
+                # Take action
+                with self.tick_timer.stage('action'):
+                    self.last_tick['action'] = self.take_action(current_state)
                         
-                        previous_state = current_state
-                
-                time.sleep(1)
+                previous_state = current_state
+
+                cache_stats = self.table_detector.region_cache.stats()
+                ocr_stats = self.table_detector.text_detector.format_stats()
+                action_stats = self.table_detector.action_detector.stats
+                timing = (f"{self.tick_timer.format()} | region cache hit rate {cache_stats['hit_rate']:.0%}"
+                          f" | OCR {ocr_stats}"
+                          f" | action buttons {action_stats['candidates']} hits -> "
+                          f"{action_stats['detections']} ({action_stats['nms_ms']:.2f} ms NMS)")
+                print(f"Tick timing: {timing}")
+                self.logger.log_text(f"Tick timing: {timing}")
                 
+        self.pace(screen)
+        return previous_state
+
+    def run(self):
+        previous_state = None
+        
+        print("Bot started. Press Ctrl+C to stop.") 
+        self.logger.log_text("Bot started. Press Ctrl+C to stop.")
+        
+        while self.bot_controller.should_continue():
+            try:
+                previous_state = self.tick(previous_state)
+                self.trace_log.record(self.tick_timer)
+                if self.recorder is not None:
+                    self.recorder.record(self.last_tick['snapshot'], self.last_tick)
             except Exception as e:
                 print(f"Error occurred: {e}")
                 self.logger.log_text(f"ERROR: {e}")
@@ -366,6 +535,35 @@ class PokerDetectorApp:
         )
     
     def cleanup(self):
+        # Stop the background frame stream if one is running
+        if hasattr(self.screen_capture, 'stop'):
+            self.screen_capture.stop()
+
+        # Flush recorded frames still queued for the writer
+        if self.recorder is not None:
+            self.recorder.close()
+            self.logger.log_text(f"Frame recorder: {self.recorder.format_stats()}")
+            self.recorder = None
+
+        self.logger.log_text(f"Polling: {self.scheduler.format_stats()}")
+
+        # Persist cached equity results for the next session
+        equity_calculator = getattr(self.post_flop_engine, 'equity_calculator', None)
+        if equity_calculator is not None:
+            saved = equity_calculator.close()
+            self.logger.log_text(f"Equity cache: {equity_calculator.cache.format_stats()}"
+                                 + (f", saved to {equity_calculator.cache.path}" if saved else ""))
+
+        # Where the time went, over the whole session (once, cleanup can run twice)
+        if self.trace_log.ticks and not self.trace_log.closed:
+            summary = self.trace_log.format_summary()
+            print(f"\n{summary}")
+            self.logger.log_text(summary)
+        self.trace_log.close()
+        if self.dashboard is not None:
+            self.dashboard.stop()
+            self.dashboard = None
+
         # Close the logger properly
         self.logger.close()
         self.bot_controller.cleanup()
@@ -1,3 +1,8 @@
+# Pixel boxes measured on the 1080x1920 reference emulator (see readme.txt).
+# Other resolutions are handled by src/detector/table_geometry.py, which scales them.
+REFERENCE_WIDTH = 1080
+REFERENCE_HEIGHT = 1920
+
 HERO_CARD_REGIONS = [
     {'x1': 464, 'y1': 1289, 'x2': 541, 'y2': 1400},
     {'x1': 540, 'y1': 1291, 'x2': 616, 'y2': 1398}
@@ -29,4 +34,15 @@ BUTTON_REGIONS = {
 POT_REGION_PREFLOP = {'x1': 403, 'y1': 804, 'x2': 664, 'y2': 992}
 POT_REGION_POSTFLOP = {'x1': 403, 'y1': 804, 'x2': 652, 'y2': 863}
 
-HERO_TURN_REGION = {'x1':474, 'y1': 1521, 'x2': 618, 'y2': 1549}
\ No newline at end of file
+HERO_TURN_REGION = {'x1':474, 'y1': 1521, 'x2': 618, 'y2': 1549}
+
+ACTION_REGION = {'x1': 35, 'y1': 1567, 'x2': 1046, 'y2': 1904}
+
+PREFLOP_POT_TYPE_REGION = {'x1': 400, 'y1': 1100, 'x2': 700, 'y2': 1200}
+
+# Bottom half of the screen, where the 'Next Hand' button appears
+NEXT_HAND_REGION = {'x1': 0, 'y1': 960, 'x2': 1080, 'y2': 1920}
+
+# Dealer button at the hero seat (object_templates/btn.png top-left on the reference screen),
+# located at startup to calibrate scale and offset on other resolutions
+CALIBRATION_ANCHOR = {'family': 'object_templates', 'name': 'btn', 'x': 644, 'y': 1354}
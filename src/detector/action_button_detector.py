@@ -1,19 +1,64 @@
 # src/detector/action_button_detector.py
 
 import os
+import time
 import cv2
 import numpy as np
+from typing import Dict, Optional
+from src.detector.template_registry import TemplateRegistry
+from src.detector.table_frame import TableFrame
+
+MATCH_THRESHOLD = 0.8
+# Binarized glyph edges lose about 0.1 correlation at half resolution, so smaller screens match lower
+MIN_MATCH_THRESHOLD = 0.7
+
+def match_threshold(scale: float) -> float:
+    """Action template threshold for a screen scale relative to 1080x1920"""
+    return float(np.clip(MATCH_THRESHOLD - 0.2 * (1.0 - scale), MIN_MATCH_THRESHOLD, MATCH_THRESHOLD))
+# Buttons never overlap, so any two hits sharing this much area are the same button
+NMS_IOU_THRESHOLD = 0.3
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = NMS_IOU_THRESHOLD) -> np.ndarray:
+    """
+    Greedy NMS: keep the best box, drop every box overlapping it, repeat
+
+    Args:
+        boxes (np.ndarray): (N, 4) x1, y1, x2, y2
+        scores (np.ndarray): (N,) confidence per box
+
+    Returns:
+        np.ndarray: Indices of the kept boxes, best first
+    """
+    x1, y1, x2, y2 = boxes.T.astype(np.float64)
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        overlap_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+        overlap_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+        intersection = overlap_w * overlap_h
+        iou = intersection / (areas[best] + areas[rest] - intersection)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=int)
 
 class ActionButtonDetector:
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, registry: Optional[TemplateRegistry] = None):
         """
         Initialize the ActionButtonDetector
         
         Args:
             template_path (str): Path to the directory containing action button templates
+            registry (TemplateRegistry): Optional shared registry holding the 'action_templates' family
         """
         self.template_path = template_path
+        self.registry = registry
         self.action_templates = {}
+        # Registry templates the binarized variants above were taken from
+        self._sources = ()
+        # Counts and timings of the last detect_action_buttons call
+        self.stats: Dict[str, float] = {'candidates': 0, 'detections': 0, 'match_ms': 0.0, 'nms_ms': 0.0}
         self.load_action_templates()
     
     def isolate_white_text(self, image):
@@ -32,6 +77,19 @@ class ActionButtonDetector:
     def load_action_templates(self):
         """Load all action button templates and process them to extract white text"""
         action_types = ['FOLD', 'CALL', 'CHECK', 'R', 'B']
+        if self.registry is not None:
+            # Binarized variants are precomputed by the registry with the same white-text threshold
+            templates = self.registry.family('action_templates')
+            self._sources = tuple(templates.values())
+            self.action_templates = {}
+            for action in action_types:
+                template = templates.get(f'action_{action.lower()}')
+                if template is not None:
+                    self.action_templates[action] = template.binary
+                else:
+                    print(f"Template not in registry: action_{action.lower()}")
+            return
+
         for action in action_types:
             template_path = os.path.join(self.template_path, f'action_{action.lower()}.png')
             if os.path.exists(template_path):
@@ -47,32 +105,53 @@ class ActionButtonDetector:
 
     def detect_action_buttons(self, screen: np.ndarray, debug=False) -> list:
         """
-        Detect all action buttons in the screen
+        Detect all action buttons in the screen, exactly one detection per button
         """
-        # Update action region coordinates
-        action_region = screen[1567:1904, 35:1046]
+        # White-text mask of the action strip, computed once per frame
+        frame = TableFrame.wrap(screen)
+        screen_white_text = frame.binary('action_strip')
+        strip_x1, strip_y1, _, _ = frame.region_box('action_strip')
+        threshold = match_threshold(frame.geometry.scale)
         
-        # Extract white text from screen
-        screen_white_text = self.isolate_white_text(action_region)
-        
-        detected_actions = []
+        start = time.perf_counter()
+        types, boxes, scores = [], [], []
         
+        # Pick up templates the registry reloaded or rescaled
+        if self.registry is not None and tuple(self.registry.family('action_templates').values()) != self._sources:
+            self.load_action_templates()
+
         for action_type, template in self.action_templates.items():
-            # Use consistent threshold
-            threshold = 0.8
             result = cv2.matchTemplate(screen_white_text, template, cv2.TM_CCOEFF_NORMED)
-            locations = np.where(result >= threshold)
-            
-            for pt in zip(*locations[::-1]):
-                # Add action region offset to coordinates
-                adjusted_x = pt[0] + 35
-                adjusted_y = pt[1] + 1567
-                
+            # Every pixel around a button's best match is above threshold too; NMS below keeps only the peak
+            ys, xs = np.nonzero(result >= threshold)
+
+            height, width = template.shape[:2]
+            types.extend([action_type] * len(xs))
+            boxes.append(np.stack([xs, ys, xs + width, ys + height], axis=1))
+            scores.append(result[ys, xs])
+        match_done = time.perf_counter()
+        
+        detected_actions = []
+        if types:
+            boxes = np.concatenate(boxes)
+            scores = np.concatenate(scores)
+            # Suppresses overlaps between templates too, e.g. a CHECK hit inside a CALL button
+            for i in non_max_suppression(boxes, scores):
                 detected_actions.append({
-                    'type': action_type,
-                    'position': (adjusted_x, adjusted_y),
-                    'confidence': result[pt[1]][pt[0]]
+                    'type': types[i],
+                    # Add action region offset to coordinates
+                    'position': (int(boxes[i, 0]) + strip_x1, int(boxes[i, 1]) + strip_y1),
+                    'confidence': float(scores[i])
                 })
         
         detected_actions.sort(key=lambda x: x['position'][0])
-        return detected_actions
\ No newline at end of file
+        self.stats = {
+            'candidates': len(types),
+            'detections': len(detected_actions),
+            'match_ms': (match_done - start) * 1000,
+            'nms_ms': (time.perf_counter() - match_done) * 1000
+        }
+        if debug:
+            print(f"Action buttons: {len(types)} hits above {threshold:.2f}, "
+                  f"{len(detected_actions)} after NMS ({self.stats['nms_ms']:.2f} ms)")
+        return detected_actions
@@ -0,0 +1,152 @@
+# src/detector/card_classifier.py
+import cv2
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from src.models.card import Card
+from src.detector.template_registry import Template, TemplateRegistry
+
+RANK_THRESHOLD = 0.6
+SUIT_THRESHOLD = 0.9
+
+class _TemplateBank:
+    """
+    Zero-mean rank and suit templates for one ROI shape, pre-transformed for FFT
+    correlation
+    """
+
+    def __init__(self, ranks: Dict[str, Template], suits: Dict[str, Template], roi_shape: Tuple[int, int]):
+        height, width = roi_shape
+        self.sources = tuple(ranks.values()) + tuple(suits.values())
+        self.rank_names = list(ranks)
+        self.suit_names = list(suits)
+        self.roi_shape = roi_shape
+        self.fft_shape = (cv2.getOptimalDFTSize(height), cv2.getOptimalDFTSize(width))
+
+        # Ranks correlate with the grayscale ROI, suits with each BGR channel
+        kernels, rank_kernels, suit_kernels = [], [], []
+        for template in ranks.values():
+            kernel = template.gray.astype(np.float32)
+            kernel -= kernel.mean()
+            kernels.append(self._pad(kernel))
+            rank_kernels.append(kernel)
+
+        for template in suits.values():
+            kernel = template.color.astype(np.float32)
+            kernel -= kernel.reshape(-1, 3).mean(axis=0)
+            for channel in range(3):
+                kernels.append(self._pad(kernel[:, :, channel]))
+            suit_kernels.append(kernel)
+
+        # Input plane per kernel: 0 = gray, 1..3 = B, G, R
+        self.planes = np.array([0] * len(ranks) + [1, 2, 3] * len(suits))
+        self.kernel_spectra = np.conj(np.fft.rfft2(np.stack(kernels)))
+
+        self.rank_kernels = self._kernel_info(rank_kernels)
+        self.suit_kernels = self._kernel_info(suit_kernels)
+
+    def _pad(self, kernel: np.ndarray) -> np.ndarray:
+        padded = np.zeros(self.fft_shape, np.float32)
+        padded[:kernel.shape[0], :kernel.shape[1]] = kernel
+        return padded
+
+    def _kernel_info(self, kernels: List[np.ndarray]) -> List[Tuple[int, int, float]]:
+        """(height, width, L2 norm) of each zero-mean kernel"""
+        return [(k.shape[0], k.shape[1], float(np.sqrt((k ** 2).sum()))) for k in kernels]
+
+def _best_score(correlation: np.ndarray, integral: np.ndarray, integral_sq: np.ndarray,
+                kernel: Tuple[int, int, float]) -> float:
+    """TM_CCOEFF_NORMED maximum of one kernel, from its correlation map and the ROI integral images"""
+    kh, kw, norm = kernel
+    height, width = integral.shape[0] - 1, integral.shape[1] - 1
+    if kh > height or kw > width or norm == 0:
+        return 0.0  # Template does not fit in the ROI, or is flat
+
+    window_sum = integral[kh:, kw:] - integral[:-kh, kw:] - integral[kh:, :-kw] + integral[:-kh, :-kw]
+    window_sq = integral_sq[kh:, kw:] - integral_sq[:-kh, kw:] - integral_sq[kh:, :-kw] + integral_sq[:-kh, :-kw]
+    variance = window_sq - window_sum * window_sum / (kh * kw)
+    if variance.ndim > 2:
+        variance = variance.sum(axis=2)   # colour: all channels form one vector
+
+    denominator = norm * np.sqrt(np.maximum(variance, 0))
+    numerator = correlation[:denominator.shape[0], :denominator.shape[1]]
+    valid = denominator > 1e-6
+    if not valid.any():
+        return 0.0
+    return float(np.clip((numerator[valid] / denominator[valid]).max(), -1.0, 1.0))
+
+class CardClassifier:
+    """
+    Scores all rank and suit templates of a card slot in one batched FFT pass.
+
+    Produces the same TM_CCOEFF_NORMED maximum as running cv2.matchTemplate per
+    template (grayscale for ranks, BGR for suits), but the ROI is transformed once
+    and all 13 + 4 correlations come out of a single inverse FFT. Template spectra
+    are cached per card region shape.
+    """
+
+    def __init__(self, registry: TemplateRegistry):
+        self.registry = registry
+        self._banks: Dict[Tuple[bool, Tuple[int, int]], _TemplateBank] = {}
+
+    def _bank(self, is_hero: bool, roi_shape: Tuple[int, int]) -> _TemplateBank:
+        ranks = self.registry.family('ranks_hero' if is_hero else 'ranks_community')
+        suits = self.registry.family('suits_hero' if is_hero else 'suits_community')
+        key = (is_hero, roi_shape)
+        bank = self._banks.get(key)
+        # Rebuild if the registry hot-reloaded any template
+        if bank is None or bank.sources != tuple(ranks.values()) + tuple(suits.values()):
+            bank = _TemplateBank(ranks, suits, roi_shape)
+            self._banks[key] = bank
+        return bank
+
+    def score(self, roi: np.ndarray, is_hero: bool = False,
+              gray_roi: Optional[np.ndarray] = None) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Best normalized correlation per rank and per suit
+
+        Returns:
+            Tuple[Dict[str, float], Dict[str, float]]: (rank scores, suit scores)
+        """
+        if gray_roi is None:
+            gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        bank = self._bank(is_hero, gray_roi.shape[:2])
+        height, width = bank.roi_shape
+
+        planes = np.zeros((4,) + bank.fft_shape, np.float32)
+        planes[0, :height, :width] = gray_roi
+        planes[1:, :height, :width] = np.moveaxis(roi, 2, 0)
+        spectra = np.fft.rfft2(planes)
+        correlations = np.fft.irfft2(spectra[bank.planes] * bank.kernel_spectra, s=bank.fft_shape)
+
+        n_ranks = len(bank.rank_names)
+        rank_maps = correlations[:n_ranks]
+        suit_maps = correlations[n_ranks:].reshape((len(bank.suit_names), 3) + bank.fft_shape).sum(axis=1)
+
+        gray_integral, gray_integral_sq = cv2.integral2(gray_roi, sdepth=cv2.CV_64F)
+        color_integral, color_integral_sq = cv2.integral2(roi, sdepth=cv2.CV_64F)
+
+        rank_scores = {
+            name: _best_score(rank_maps[i], gray_integral, gray_integral_sq, bank.rank_kernels[i])
+            for i, name in enumerate(bank.rank_names)
+        }
+        suit_scores = {
+            name: _best_score(suit_maps[i], color_integral, color_integral_sq, bank.suit_kernels[i])
+            for i, name in enumerate(bank.suit_names)
+        }
+        return rank_scores, suit_scores
+
+    def classify(self, roi: np.ndarray, is_hero: bool = False,
+                 gray_roi: Optional[np.ndarray] = None) -> Optional[Card]:
+        """Same contract as PokerTableDetector.detect_card"""
+        rank_scores, suit_scores = self.score(roi, is_hero, gray_roi)
+        if not rank_scores or not suit_scores:
+            return None
+
+        best_rank = max(rank_scores, key=rank_scores.get)
+        best_suit = max(suit_scores, key=suit_scores.get)
+        best_rank_conf = rank_scores[best_rank]
+        best_suit_conf = suit_scores[best_suit]
+
+        if best_rank_conf > RANK_THRESHOLD and best_suit_conf > SUIT_THRESHOLD:
+            return Card(best_rank, best_suit, min(best_rank_conf, best_suit_conf))
+        return None
@@ -0,0 +1,138 @@
+# src/detector/digit_reader.py
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+from src.detector.template_registry import TemplateRegistry
+
+DIGIT_FAMILY = 'digit_templates'
+# Text is white on the dark felt; anti-aliased edges sit around mid grey
+GLYPH_THRESHOLD = 128
+MIN_GLYPH_AREA = 4
+GLYPH_SIZE = (24, 32)   # (width, height) every glyph is normalized to before matching
+MIN_GLYPH_CONFIDENCE = 0.8
+
+# Template file names that are not the character itself; samples may be suffixed, e.g. 7_2.png
+GLYPH_CHARS = {'dot': '.', 'comma': ',', 'B': 'B', 'b': 'B'}
+# A glyph without a template would be misread as a similar one, so reads wait for all of these
+REQUIRED_CHARS = '0123456789.'
+
+def glyph_char(template_name: str) -> str:
+    name = template_name.split('_')[0]
+    return GLYPH_CHARS.get(name, name)
+
+def segment_glyphs(gray: np.ndarray) -> Optional[List[np.ndarray]]:
+    """
+    Split a single line of white text into glyph images, left to right
+
+    Each glyph spans the full text line height, so small glyphs such as the decimal
+    point keep their position relative to the digits.
+
+    Returns:
+        List of binary glyph crops, or None if the ROI does not hold exactly one line of text
+    """
+    _, binary = cv2.threshold(gray, GLYPH_THRESHOLD, 255, cv2.THRESH_BINARY)
+    count, _, boxes, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    boxes = [b for b in boxes[1:] if b[cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA]
+    if not boxes:
+        return None
+
+    tallest = max(boxes, key=lambda b: b[cv2.CC_STAT_HEIGHT])
+    line_top = tallest[cv2.CC_STAT_TOP]
+    line_bottom = line_top + tallest[cv2.CC_STAT_HEIGHT]
+    for box in boxes:
+        top = box[cv2.CC_STAT_TOP]
+        if top < line_top - 2 or top + box[cv2.CC_STAT_HEIGHT] > line_bottom + 2:
+            return None  # Something outside the text line, e.g. a second line or a card
+
+    glyphs = []
+    for box in sorted(boxes, key=lambda b: b[cv2.CC_STAT_LEFT]):
+        x, width = box[cv2.CC_STAT_LEFT], box[cv2.CC_STAT_WIDTH]
+        glyphs.append(binary[line_top:line_bottom, x:x + width])
+    return glyphs
+
+def normalize_glyph(glyph: np.ndarray) -> np.ndarray:
+    """Scale to the fixed glyph height keeping the aspect ratio, centre on a fixed-width canvas"""
+    width, height = GLYPH_SIZE
+    scale = height / glyph.shape[0]
+    scaled_width = max(1, min(width, int(round(glyph.shape[1] * scale))))
+    scaled = cv2.resize(glyph, (scaled_width, height), interpolation=cv2.INTER_AREA)
+    canvas = np.zeros((height, width), np.float32)
+    left = (width - scaled_width) // 2
+    canvas[:, left:left + scaled_width] = scaled
+    return canvas
+
+def _unit_vector(glyph: np.ndarray) -> np.ndarray:
+    vector = normalize_glyph(glyph).ravel()
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+class GlyphDigitReader:
+    """
+    Reads stack, bet and pot amounts by matching glyphs against templates of the table font.
+
+    The amounts are always rendered in the same font, so instead of general OCR each
+    connected component is scored against digit, decimal point and "B" templates
+    (card_templates/digit_templates, harvested with tools/digit_template_capture.py)
+    with one matrix product. Reads below MIN_GLYPH_CONFIDENCE return None so the
+    caller can fall back to Tesseract.
+    """
+
+    def __init__(self, registry: TemplateRegistry, min_confidence: float = MIN_GLYPH_CONFIDENCE):
+        self.registry = registry
+        self.min_confidence = min_confidence
+        self._sources: Tuple = ()
+        self._chars: List[str] = []
+        self._matrix = np.zeros((0, GLYPH_SIZE[0] * GLYPH_SIZE[1]), np.float32)
+        if self.missing_chars:
+            print(f"Warning: No digit templates for {' '.join(self.missing_chars)} in {DIGIT_FAMILY}; amounts are "
+                  f"read with Tesseract until tools/digit_template_capture.py has captured them")
+
+    def _templates(self) -> Tuple[List[str], np.ndarray]:
+        templates = self.registry.family(DIGIT_FAMILY)
+        # Rebuild if the registry hot-reloaded any template
+        if tuple(templates.values()) != self._sources:
+            self._sources = tuple(templates.values())
+            self._chars = [glyph_char(name) for name in templates]
+            vectors = []
+            for template in templates.values():
+                # Templates are saved as line-height glyph crops by the capture tool
+                _, binary = cv2.threshold(template.gray, GLYPH_THRESHOLD, 255, cv2.THRESH_BINARY)
+                vectors.append(_unit_vector(binary))
+            self._matrix = np.array(vectors, np.float32).reshape(len(vectors), -1)
+        return self._chars, self._matrix
+
+    @property
+    def missing_chars(self) -> List[str]:
+        """Characters of REQUIRED_CHARS that have no template yet"""
+        chars, _ = self._templates()
+        return [c for c in REQUIRED_CHARS if c not in chars]
+
+    @property
+    def is_complete(self) -> bool:
+        return not self.missing_chars
+
+    def read_text(self, roi: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Args:
+            roi (np.ndarray): BGR or grayscale region holding one amount
+
+        Returns:
+            Tuple[str, float]: (text, lowest glyph confidence), or None if the read is not trustworthy
+        """
+        if not self.is_complete:
+            return None
+        gray = roi if roi.ndim == 2 else cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        if gray.max(initial=0) < GLYPH_THRESHOLD:
+            return '', 1.0  # Nothing written, e.g. no bet in front of a player
+        glyphs = segment_glyphs(gray)
+        if not glyphs:
+            return None
+
+        chars, matrix = self._templates()
+        scores = np.stack([_unit_vector(glyph) for glyph in glyphs]) @ matrix.T
+        best = scores.argmax(axis=1)
+        confidence = float(scores[np.arange(len(glyphs)), best].min())
+        if confidence < self.min_confidence:
+            return None
+        return ''.join(chars[i] for i in best), confidence
@@ -0,0 +1,78 @@
+# src/detector/region_cache.py
+import cv2
+import numpy as np
+from typing import Callable, Dict, Tuple, Union
+from src.detector.table_frame import TableFrame
+
+Region = Union[str, Dict[str, int]]
+
+class RegionValueCache:
+    """
+    Reuses decoded region values (OCR numbers, recognized cards) across frames.
+
+    Every region gets a cheap fingerprint, its grayscale pixels downsampled 4x.
+    If no fingerprint cell moved by more than `max_diff` grey levels since the
+    value was decoded, the region has not changed and the old value is returned
+    without running OCR or template matching again.
+    """
+
+    def __init__(self, max_diff: int = 8, scale: float = 0.25):
+        self.max_diff = max_diff
+        self.scale = scale
+        self.entries: Dict[str, Tuple[np.ndarray, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, frame: TableFrame, region: Region) -> np.ndarray:
+        """Downsampled grayscale of a region, computed once per frame"""
+        key = f'fingerprint:{frame.region_box(region)}'
+        if key not in frame.cache:
+            gray = frame.gray(region)
+            small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+            frame.cache[key] = small.astype(np.int16)
+        return frame.cache[key]
+
+    def unchanged(self, previous: np.ndarray, current: np.ndarray) -> bool:
+        if previous.shape != current.shape:
+            return False
+        return int(np.abs(previous - current).max(initial=0)) <= self.max_diff
+
+    def get_or_compute(self, frame: TableFrame, region: Region, key: str, compute: Callable[[], object]):
+        """
+        Args:
+            frame (TableFrame): Current frame
+            region: Named region from regions.py or an explicit box
+            key (str): What is decoded from the region, e.g. 'stack:hero'
+            compute: Decodes the value when the region changed
+        """
+        hit, value = self.lookup(frame, region, key)
+        if hit:
+            return value
+        value = compute()
+        self.store(frame, region, key, value)
+        return value
+
+    def lookup(self, frame: TableFrame, region: Region, key: str) -> Tuple[bool, object]:
+        """(True, value) if the region is unchanged since key was stored, else (False, None)"""
+        entry = self.entries.get(key)
+        if entry is not None and self.unchanged(entry[0], self.fingerprint(frame, region)):
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def store(self, frame: TableFrame, region: Region, key: str, value: object):
+        self.entries[key] = (self.fingerprint(frame, region), value)
+
+    def invalidate(self, prefix: str = ''):
+        """Forget cached values whose key starts with prefix (all of them by default)"""
+        for key in [k for k in self.entries if k.startswith(prefix)]:
+            del self.entries[key]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
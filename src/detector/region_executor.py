@@ -0,0 +1,126 @@
+# src/detector/region_executor.py
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from src.detector.table_frame import TableFrame
+from src.utils.tick_timer import span
+
+EXECUTOR_MODES = ['serial', 'thread', 'process']
+
+# Detector owned by each worker process, built once by _init_worker
+_worker_detector = None
+
+def _resolve(target, method: str) -> Callable:
+    """getattr over a dotted path, e.g. 'action_detector.detect_action_buttons'"""
+    for name in method.split('.'):
+        target = getattr(target, name)
+    return target
+
+def _owner(target, method: str):
+    """Object a dotted job method is bound to, e.g. the action_detector"""
+    return _resolve(target, method.rsplit('.', 1)[0]) if '.' in method else target
+
+def _job_stats(owner) -> Optional[Dict]:
+    stats = getattr(owner, 'stats', None)
+    return dict(stats) if isinstance(stats, dict) else None
+
+def _init_worker(detector_factory: Callable):
+    global _worker_detector
+    _worker_detector = detector_factory()
+
+def _traced(method: str, function: Callable) -> Callable:
+    """function wrapped in a tick span named after the job, e.g. 'detect_button_position'"""
+    name = method.rsplit('.', 1)[-1]
+    def run(*args):
+        with span(name):
+            return function(*args)
+    return run
+
+def _run_in_worker(method: str, frame: TableFrame, args: tuple):
+    # Follow the main process' calibration; rescales the worker's templates only when it changed.
+    # Presence jobs get a downscaled tier, whose geometry is relative to that tier
+    _worker_detector.template_matcher.set_scale(frame.geometry.scale * frame.downscale)
+    result = _resolve(_worker_detector, method)(frame, *args)
+    # The counters the job left on the worker's detector, for the main process' copy
+    return result, _job_stats(_owner(_worker_detector, method))
+
+class RegionJobExecutor:
+    """
+    Fans independent per-region detector calls of one frame out to a worker pool.
+
+    A job is a detector method that takes the TableFrame as its first argument and
+    only reads the regions it declares. Threads share the frame directly (OpenCV
+    and Tesseract release the GIL). Processes get a copy holding only the declared
+    region crops, and run the job on their own detector; the `stats` dict the job
+    updated there is copied back onto the main process' detector with the result.
+    """
+
+    def __init__(self, detector, mode: str = 'serial', workers: Optional[int] = None,
+                 detector_factory: Optional[Callable] = None):
+        """
+        Args:
+            detector: Object the job methods are resolved on in serial and thread mode
+            mode (str): 'serial' (inline, no pool), 'thread' or 'process'
+            workers (int): Pool size, defaults to the CPU count
+            detector_factory: Picklable callable building an equivalent detector in
+                              each worker process (process mode only)
+        """
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+        self.detector = detector
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+
+        if mode == 'thread':
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='region')
+        elif mode == 'process':
+            if detector_factory is None:
+                raise ValueError("Process executor needs a detector_factory")
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(detector_factory,))
+
+    def submit(self, method: str, frame: TableFrame, regions: List, *args) -> Future:
+        """
+        Args:
+            method (str): Detector method, dotted for sub-detectors
+            frame (TableFrame): Frame of this tick
+            regions (List): Named regions or boxes the method reads
+            *args: Extra arguments after the frame
+        """
+        if self.mode == 'process':
+            return self._submit_to_process(method, frame.subset(regions), args)
+
+        function = _traced(method, _resolve(self.detector, method))
+        if self.mode == 'thread':
+            return self.pool.submit(function, frame, *args)
+
+        future = Future()
+        try:
+            future.set_result(function(frame, *args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _submit_to_process(self, method: str, frame: TableFrame, args: tuple) -> Future:
+        """Run a job in a worker; its future resolves to the result once the stats are merged"""
+        owner = _owner(self.detector, method)
+        future = Future()
+
+        def merge(worker_future: Future):
+            try:
+                result, stats = worker_future.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            if stats is not None:
+                owner.stats = stats
+            future.set_result(result)
+
+        self.pool.submit(_run_in_worker, method, frame, args).add_done_callback(merge)
+        return future
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
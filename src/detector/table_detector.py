@@ -1,45 +1,104 @@
 import cv2
 import os
+import functools
 import numpy as np
 from typing import List, Optional
 from src.models.card import Card
 from src.detector.template_matcher import TemplateMatcher
 from src.detector.text_detector import TextDetector
+from src.detector.digit_reader import GlyphDigitReader
 from src.config.regions import *
 from src.detector.action_button_detector import ActionButtonDetector
+from src.detector.table_frame import TableFrame
+from src.detector.table_geometry import TableGeometry
+from src.detector.card_classifier import CardClassifier
+from src.detector.region_cache import RegionValueCache
+from src.detector.region_executor import RegionJobExecutor
+from src.utils.tick_timer import span
 from typing import List, Dict, Optional, Tuple
 
+# Empty slots are flat felt (grayscale std ~0); any card face is far above this
+EMPTY_SLOT_MAX_STDDEV = 10.0
+
+def _build_worker_detector(template_path: str, card_engine: str, presence_downscale: int) -> 'PokerTableDetector':
+    """Detector for a region worker process; it never runs OCR, so it skips the OCR engine"""
+    return PokerTableDetector(TemplateMatcher(template_path, presence_downscale=presence_downscale),
+                              card_engine, ocr_engine='pytesseract')
+
 class PokerTableDetector:
-    def __init__(self, template_matcher: TemplateMatcher):
+    def __init__(self, template_matcher: TemplateMatcher, card_engine: str = 'batched', ocr_engine: str = 'auto',
+                 executor: str = 'serial', workers: Optional[int] = None, glyph_digits: bool = False):
+        """
+        Args:
+            template_matcher (TemplateMatcher): Shared matcher holding the template registry
+            card_engine (str): 'batched' (one FFT pass per card) or 'per_template' (matchTemplate loop)
+            ocr_engine (str): 'auto', 'tesserocr', 'batch' or 'pytesseract', see ocr_engine.py
+            executor (str): How detect_table_state runs its region jobs: 'serial', 'thread' or 'process'
+            workers (int): Worker count of the thread/process pool, defaults to the CPU count
+            glyph_digits (bool): Read amounts with digit glyph templates before Tesseract. Opt-in:
+                                 the reader stays idle until digit_templates holds all ten digits
+        """
         self.template_matcher = template_matcher
-        self.text_detector = TextDetector()
-        self.action_detector = ActionButtonDetector('card_templates/action_templates')
+        self.card_engine = card_engine
+        self.card_classifier = CardClassifier(template_matcher.registry)
+        # Decoded values of regions whose pixels did not change since the last frame
+        self.region_cache = RegionValueCache()
+        # Cards recognized during the current hand, keyed by slot; they cannot change until the next hand
+        self.hand_cards: Dict[str, Card] = {}
+        self.hand_fingerprint: Optional[List[np.ndarray]] = None
+        # Fixed-font amounts can be read from digit glyph templates, Tesseract is the fallback
+        digit_reader = GlyphDigitReader(template_matcher.registry) if glyph_digits else None
+        self.text_detector = TextDetector(ocr_engine, digit_reader=digit_reader)
+        self.action_detector = ActionButtonDetector(
+            os.path.join(template_matcher.template_path, 'action_templates'),
+            registry=template_matcher.registry
+        )
+        self.executor = RegionJobExecutor(
+            self, executor, workers,
+            detector_factory=functools.partial(_build_worker_detector, template_matcher.template_path, card_engine,
+                                               template_matcher.presence_downscale)
+        )
 
+    def detect_card(self, roi: np.ndarray, is_hero: bool = False,
+                    gray_roi: Optional[np.ndarray] = None) -> Optional[Card]:
+        """
+        Identify the card in a card-sized ROI
+        
+        Args:
+            roi (np.ndarray): BGR card region
+            is_hero (bool): Use hero card templates instead of community ones
+            gray_roi (np.ndarray): Grayscale version of roi if already computed (e.g. by TableFrame)
+        """
+        if gray_roi is None:
+            gray_roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
 
-    def detect_card(self, roi: np.ndarray, is_hero: bool = False) -> Optional[Card]:
+        if self.card_engine == 'batched':
+            return self.card_classifier.classify(roi, is_hero, gray_roi)
+        return self.detect_card_per_template(roi, is_hero, gray_roi)
+
+    def detect_card_per_template(self, roi: np.ndarray, is_hero: bool, gray_roi: np.ndarray) -> Optional[Card]:
+        """Reference implementation: one cv2.matchTemplate call per rank and suit template"""
         best_rank = None
         best_rank_conf = 0
         best_suit = None
         best_suit_conf = 0
 
-        rank_templates = (self.template_matcher.hero_rank_templates 
-                        if is_hero 
-                        else self.template_matcher.community_rank_templates)
+        rank_templates = self.template_matcher.registry.family(
+            'ranks_hero' if is_hero else 'ranks_community')
         
-        suit_templates = (self.template_matcher.hero_suit_templates 
-                         if is_hero 
-                         else self.template_matcher.community_suit_templates)
+        suit_templates = self.template_matcher.registry.family(
+            'suits_hero' if is_hero else 'suits_community')
 
         # Match rank
         for rank, template in rank_templates.items():
-            conf, _ = self.template_matcher.match_template(roi, template)
+            conf, _ = self.template_matcher.match_template(gray_roi, template.gray)
             if conf > best_rank_conf:
                 best_rank_conf = conf
                 best_rank = rank
 
         # Match suit
         for suit, template in suit_templates.items():
-            conf, _ = self.template_matcher.match_template(roi, template,use_preprocessing=False)
+            conf, _ = self.template_matcher.match_template(roi, template.color, use_preprocessing=False)
             if conf > best_suit_conf:
                 best_suit_conf = conf
                 best_suit = suit
@@ -47,15 +106,130 @@ class PokerTableDetector:
         if best_rank_conf > 0.6 and best_suit_conf > 0.9:
             return Card(best_rank, best_suit, min(best_rank_conf, best_suit_conf))
         return None
+
+    def is_slot_occupied(self, frame: TableFrame, region_name: str) -> bool:
+        """Cheap occupancy test for a card slot, computed once per frame"""
+        key = f'occupied:{region_name}'
+        if key not in frame.cache:
+            _, stddev = cv2.meanStdDev(frame.gray(region_name))
+            frame.cache[key] = float(stddev[0][0]) > EMPTY_SLOT_MAX_STDDEV
+        return frame.cache[key]
+
+    def community_slot_occupancy(self, screen) -> List[bool]:
+        frame = TableFrame.wrap(screen)
+        return [self.is_slot_occupied(frame, f'community_card_{i}') for i in range(len(COMMUNITY_CARD_REGIONS))]
+
+    def detect_card_in_region(self, frame: TableFrame, region_name: str, is_hero: bool = False) -> Optional[Card]:
+        """
+        Run detect_card on a named card region, reusing the frame's cached crop and grayscale.
+        Empty slots skip recognition, and the result is cached on the frame for later callers.
+        """
+        known, card = self.known_card(frame, region_name)
+        if not known:
+            card = self.recognize_card(frame, region_name, is_hero)
+            self.store_card(frame, region_name, card)
+        return card
+
+    def known_card(self, frame: TableFrame, region_name: str) -> Tuple[bool, Optional[Card]]:
+        """
+        Resolve a card slot without template matching, if possible
+
+        Returns:
+            Tuple[bool, Optional[Card]]: (True, card) when the slot is empty, memoized for the
+                                         hand or unchanged since the last frame, else (False, None)
+        """
+        key = f'card:{region_name}'
+        if key in frame.cache:
+            return True, frame.cache[key]
+
+        if not self.is_slot_occupied(frame, region_name):
+            if region_name in self.hand_cards:
+                # A known card disappeared, so the table was cleared for a new hand
+                self.reset_hand_cache()
+            frame.cache[key] = None
+            return True, None
+
+        if region_name in self.hand_cards:
+            frame.cache[key] = self.hand_cards[region_name]
+            return True, frame.cache[key]
+
+        hit, card = self.region_cache.lookup(frame, region_name, key)
+        if hit:
+            if card is not None:
+                self.hand_cards[region_name] = card
+            frame.cache[key] = card
+            return True, card
+        return False, None
+
+    def recognize_card(self, frame: TableFrame, region_name: str, is_hero: bool) -> Optional[Card]:
+        """Template-match one card slot; reads only that region, so it can run in a worker"""
+        return self.detect_card(frame.crop(region_name), is_hero, gray_roi=frame.gray(region_name))
+
+    def store_card(self, frame: TableFrame, region_name: str, card: Optional[Card]):
+        """Record a freshly recognized card in the frame, region and per-hand caches"""
+        key = f'card:{region_name}'
+        self.region_cache.store(frame, region_name, key, card)
+        if card is not None:
+            self.hand_cards[region_name] = card
+        frame.cache[key] = card
+
+    def reset_hand_cache(self):
+        """Forget the cards memoized for the current hand"""
+        self.hand_cards = {}
+        self.hand_fingerprint = None
+
+    def check_hand_fingerprint(self, frame: TableFrame):
+        """Reset the per-hand card cache if the hero card slots look different from when it was filled"""
+        fingerprint = [self.region_cache.fingerprint(frame, f'hero_card_{i}') for i in range(len(HERO_CARD_REGIONS))]
+        if self.hand_fingerprint is not None and not all(
+                self.region_cache.unchanged(old, new) for old, new in zip(self.hand_fingerprint, fingerprint)):
+            self.reset_hand_cache()
+        self.hand_fingerprint = fingerprint
+
+    def read_value(self, frame: TableFrame, region, key: str) -> float:
+        """OCR a numeric region, reusing the last value if its pixels have not changed"""
+        cache_key = f'value:{key}'
+        if cache_key not in frame.cache:
+            frame.cache[cache_key] = self.region_cache.get_or_compute(
+                frame, region, cache_key, lambda: self.text_detector.detect_value(frame.crop(region))
+            )
+        return frame.cache[cache_key]
+
+    def read_values(self, frame: TableFrame, regions: Dict[str, object]):
+        """
+        OCR every changed region in one batch, so later read_value calls on this frame are lookups
+
+        Args:
+            frame (TableFrame): Current frame
+            regions (Dict[str, object]): read_value key -> named region or explicit box
+        """
+        pending = {}
+        for key, region in regions.items():
+            cache_key = f'value:{key}'
+            if cache_key in frame.cache:
+                continue
+            hit, value = self.region_cache.lookup(frame, region, cache_key)
+            if hit:
+                frame.cache[cache_key] = value
+            else:
+                pending[cache_key] = region
+
+        if not pending:
+            return
+        values = self.text_detector.detect_values([frame.crop(region) for region in pending.values()])
+        for (cache_key, region), value in zip(pending.items(), values):
+            self.region_cache.store(frame, region, cache_key, value)
+            frame.cache[cache_key] = value
     
     def detect_button_position(self, screen: np.ndarray) -> dict:
         button_positions = {'hero': False, 'villain': False}
+        frame = self.template_matcher.tier_frame(screen, 'button')
         
-        # Load button template
-        btn_template = cv2.imread(os.path.join(self.template_matcher.template_path, 'object_templates/btn.png'))
+        # Preloaded button template
+        btn_template = self.template_matcher.tier_template('button', 'object_templates', 'btn').gray
         
-        for player, region in BUTTON_REGIONS.items():
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
+        for player in BUTTON_REGIONS:
+            roi = frame.gray(f'button_{player}')
             confidence, _ = self.template_matcher.match_template(roi, btn_template)
             button_positions[player] = confidence > 0.8
         
@@ -75,20 +249,21 @@ class PokerTableDetector:
         return positions    
     
     def detect_hero_turn(self, screen: np.ndarray) -> bool:
-        # Load hero turn template
-        turn_template = cv2.imread(os.path.join(self.template_matcher.template_path,'object_templates/hero_turn.png'))
+        # Preloaded hero turn template
+        turn_template = self.template_matcher.tier_template('hero_turn', 'object_templates', 'hero_turn').gray
         
-        roi = screen[HERO_TURN_REGION['y1']:HERO_TURN_REGION['y2'], 
-                    HERO_TURN_REGION['x1']:HERO_TURN_REGION['x2']]
+        roi = self.template_matcher.tier_frame(screen, 'hero_turn').gray('hero_turn')
         
         confidence, _ = self.template_matcher.match_template(roi, turn_template)
         return confidence > 0.8
     
     def is_preflop(self, screen: np.ndarray) -> bool:
         """Determine if we're in preflop by checking for community cards"""
-        for region in COMMUNITY_CARD_REGIONS[:3]:  # Check first 3 cards (flop)
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
-            card = self.detect_card(roi, is_hero=False)
+        frame = TableFrame.wrap(screen)
+        if not any(self.community_slot_occupancy(frame)[:3]):
+            return True
+        for i in range(3):  # Check first 3 cards (flop)
+            card = self.detect_card_in_region(frame, f'community_card_{i}', is_hero=False)
             if card:
                 return False
         return True
@@ -110,20 +285,17 @@ class PokerTableDetector:
 
     def detect_pot_size(self, screen: np.ndarray) -> float:
         """Detect pot size using appropriate region based on street"""
-        is_preflop_street = self.is_preflop(screen)
+        frame = TableFrame.wrap(screen)
+        is_preflop_street = self.is_preflop(frame)
         
         # Try preflop region first if we're preflop
         if is_preflop_street:
-            preflop_roi = screen[POT_REGION_PREFLOP['y1']:POT_REGION_PREFLOP['y2'], 
-                               POT_REGION_PREFLOP['x1']:POT_REGION_PREFLOP['x2']]
-            pot_size = self.text_detector.detect_value(preflop_roi)
+            pot_size = self.read_value(frame, 'pot_preflop', 'pot_preflop')
             if pot_size > 0:
                 return pot_size
 
         # Try postflop region
-        postflop_roi = screen[POT_REGION_POSTFLOP['y1']:POT_REGION_POSTFLOP['y2'], 
-                            POT_REGION_POSTFLOP['x1']:POT_REGION_POSTFLOP['x2']]
-        return self.text_detector.detect_value(postflop_roi)
+        return self.read_value(frame, 'pot_postflop', 'pot_postflop')
     
     def process_action_detections(self, screen: np.ndarray, detections: List[Dict]) -> Dict:
         """
@@ -141,103 +313,168 @@ class PokerTableDetector:
             'B': []
         }
 
-        # Group similar detections by position (within 5 pixels)
-        processed_positions = set()
-        
-        for detection in detections:
-            action_type = detection['type']
-            pos = detection['position']
-            
-            # Skip if we already processed a similar position
-            skip = False
-            for processed_pos in processed_positions:
-                if (abs(pos[0] - processed_pos[0]) < 5 and 
-                    abs(pos[1] - processed_pos[1]) < 5):
-                    skip = True
-                    break
-            if skip:
-                continue
-                
-            processed_positions.add(pos)
-            
+        unique_detections = self.unique_action_detections(detections)
+
+        # OCR all B/R button amounts in one batch (a no-op if detect_table_state already did)
+        frame = TableFrame.wrap(screen)
+        self.read_values(frame, self.action_value_regions(frame, unique_detections))
+
+        for action_type, pos in unique_detections:
             if action_type in ['FOLD', 'CALL', 'CHECK']:
                 available_actions[action_type]['available'] = True
                 available_actions[action_type]['position'] = pos
             elif action_type in ['R', 'B']:
                 # Extract value from the button region
-                value = self.extract_action_value(screen, pos)
+                value = self.extract_action_value(frame, pos)
                 if value > 0:
                     available_actions[action_type].append({'value': value, 'position': pos})
 
         return available_actions
 
+    @staticmethod
+    def unique_action_detections(detections: List[Dict]) -> List[Tuple[str, Tuple[int, int]]]:
+        """(type, position) of each detection; ActionButtonDetector already returns one per button"""
+        return [(detection['type'], detection['position']) for detection in detections]
+
+    def action_value_regions(self, frame: TableFrame,
+                             unique_detections: List[Tuple[str, Tuple[int, int]]]) -> Dict[str, Dict[str, int]]:
+        """read_value key -> amount box for every B/R button"""
+        return {
+            f'action:{x},{y}': self.action_value_region((x, y), frame.geometry)
+            for action_type, (x, y) in unique_detections if action_type in ['R', 'B']
+        }
+
+    @staticmethod
+    def action_value_region(position: Tuple[int, int], geometry: TableGeometry) -> Dict[str, int]:
+        """Box holding the amount printed on a B/R button detected at position"""
+        x, y = position
+        
+        # Update to the optimized offset values (reference pixels, scaled to the screen)
+        value_roi_x1 = x + geometry.length(45)   # x_offset
+        value_roi_y1 = y - geometry.length(5)    # y_offset
+        value_roi_x2 = x + geometry.length(160)  # x_offset + width
+        value_roi_y2 = y + geometry.length(50)   # y_offset + height
+        return {'x1': value_roi_x1, 'y1': value_roi_y1, 'x2': value_roi_x2, 'y2': value_roi_y2}
+
     def extract_action_value(self, screen: np.ndarray, position: Tuple[int, int], debug: bool = False) -> float:
         """
         Extract numerical value from B/R buttons with optimized offsets
         """
         x, y = position
-        
-        # Update to the optimized offset values
-        value_roi_x1 = x + 45   # x_offset
-        value_roi_y1 = y - 5    # y_offset
-        value_roi_x2 = x + 160  # x_offset + width
-        value_roi_y2 = y + 50   # y_offset + height
-        
-        value_roi = screen[value_roi_y1:value_roi_y2, value_roi_x1:value_roi_x2]
+        frame = TableFrame.wrap(screen)
+        value_region = self.action_value_region(position, frame.geometry)
         
         if debug:
-            cv2.imwrite(f'debug_value_roi_{x}_{y}.png', value_roi)
+            cv2.imwrite(f'debug_value_roi_{x}_{y}.png', frame.crop(value_region))
         
-        return self.text_detector.detect_value(value_roi)
+        return self.read_value(frame, value_region, f'action:{x},{y}')
+
+    def submit_region_jobs(self, frame: TableFrame, is_hero_turn: Optional[bool] = None) -> Dict:
+        """
+        Start every detector of detect_table_state that only reads its own regions
+
+        Cards already known for this frame or hand are not submitted, and hero turn
+        only if the caller did not detect it yet.
+
+        Returns:
+            Dict: Futures under 'cards' (slot -> future), 'buttons', 'actions',
+                  'pot_type' and 'hero_turn'
+        """
+        submit = self.executor.submit
+        jobs = {'cards': {}}
+        slots = [(f'hero_card_{i}', True) for i in range(len(HERO_CARD_REGIONS))]
+        slots += [(f'community_card_{i}', False) for i in range(len(COMMUNITY_CARD_REGIONS))]
+        for region_name, is_hero in slots:
+            known, _ = self.known_card(frame, region_name)
+            if not known:
+                jobs['cards'][region_name] = submit('recognize_card', frame, [region_name], region_name, is_hero)
+
+        # Presence checks get their downscaled tier, so worker processes only receive its crops
+        tier = self.template_matcher.tier_frame
+        jobs['buttons'] = submit('detect_button_position', tier(frame, 'button'),
+                                 [f'button_{p}' for p in BUTTON_REGIONS])
+        jobs['actions'] = submit('action_detector.detect_action_buttons', frame, ['action_strip'])
+        jobs['pot_type'] = submit('template_matcher.detect_preflop_pot_type', tier(frame, 'pot_type'),
+                                  ['pot_type_banner'])
+        if is_hero_turn is None:
+            jobs['hero_turn'] = submit('detect_hero_turn', tier(frame, 'hero_turn'), ['hero_turn'])
+        return jobs
+
+    def shutdown(self):
+        """Stop the region worker pool and release the OCR engine"""
+        self.executor.shutdown()
+        self.text_detector.close()
+
+    def detect_table_state(self, screen: np.ndarray, is_hero_turn: Optional[bool] = None):
+        """
+        Extract the full table state from one frame
+        
+        Args:
+            screen (np.ndarray): The full screenshot or the tick's TableFrame
+            is_hero_turn (bool): Result of detect_hero_turn already computed on this frame, if any
+        """
+        # All detectors below share this frame's cached region crops
+        screen = TableFrame.wrap(screen)
+        self.check_hand_fingerprint(screen)
+
+        # Fan the independent region jobs out; the sequential code below then finds their results
+        jobs = self.submit_region_jobs(screen, is_hero_turn)
+        for region_name, job in jobs['cards'].items():
+            self.store_card(screen, region_name, job.result())
+        if 'hero_turn' in jobs:
+            is_hero_turn = jobs['hero_turn'].result()
 
-    def detect_table_state(self, screen: np.ndarray):
         # Detect hero cards
         hero_cards = []
-        for region in HERO_CARD_REGIONS:
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
-            card = self.detect_card(roi, is_hero=True)
+        for i in range(len(HERO_CARD_REGIONS)):
+            card = self.detect_card_in_region(screen, f'hero_card_{i}', is_hero=True)
             if card:
                 hero_cards.append(card)
 
         # Detect community cards
         community_cards = []
-        for region in COMMUNITY_CARD_REGIONS:
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
-            card = self.detect_card(roi, is_hero=False)
+        for i in range(len(COMMUNITY_CARD_REGIONS)):
+            card = self.detect_card_in_region(screen, f'community_card_{i}', is_hero=False)
             if card:
                 community_cards.append(card)
 
+        # Action buttons are located first so their amounts join the frame's single OCR batch
+        action_detections = jobs['actions'].result()
+
+        # OCR stacks, bets, the pot of this street and the B/R amounts in one batch
+        pot_region = 'pot_preflop' if self.is_preflop(screen) else 'pot_postflop'
+        numeric_regions = {pot_region: pot_region}
+        numeric_regions.update({f'stack:{player}': f'stack_{player}' for player in STACK_REGIONS})
+        numeric_regions.update({f'bet:{player}': f'bet_{player}' for player in BET_REGIONS})
+        numeric_regions.update(self.action_value_regions(screen, self.unique_action_detections(action_detections)))
+        with span('ocr'):
+            self.read_values(screen, numeric_regions)
+
         # Detect stacks
         stacks = {}
-        for player, region in STACK_REGIONS.items():
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
-            stacks[player] = self.text_detector.detect_value(roi)
+        for player in STACK_REGIONS:
+            stacks[player] = self.read_value(screen, f'stack_{player}', f'stack:{player}')
 
         # Detect bets
         bets = {}
-        for player, region in BET_REGIONS.items():
-            roi = screen[region['y1']:region['y2'], region['x1']:region['x2']]
-            bets[player] = self.text_detector.detect_value(roi)
+        for player in BET_REGIONS:
+            bets[player] = self.read_value(screen, f'bet_{player}', f'bet:{player}')
 
         # Detect pot
         pot_size = self.detect_pot_size(screen)
 
         # Detect button positions and determine player positions
-        button_positions = self.detect_button_position(screen)
+        button_positions = jobs['buttons'].result()
         positions = self.detect_positions(button_positions)
         
         # Determine street
         street = self.detect_street(community_cards)
         
-        # Add hero turn detection
-        is_hero_turn = self.detect_hero_turn(screen)  
-
          # Add action button detection
-        action_detections = self.action_detector.detect_action_buttons(screen)
         available_actions = self.process_action_detections(screen, action_detections)  # Pass screen here
 
         # Add preflop pot type detection
-        preflop_pot_type = self.template_matcher.detect_preflop_pot_type(screen)
+        preflop_pot_type = jobs['pot_type'].result()
         
         # Create mapping between pot types and their meanings
         pot_type_descriptions = {
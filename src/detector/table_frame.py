@@ -0,0 +1,144 @@
+# src/detector/table_frame.py
+import cv2
+import numpy as np
+from typing import Dict, Optional, Tuple, Union
+from src.detector.template_registry import WHITE_TEXT_THRESHOLD
+from src.detector.table_geometry import Box, TableGeometry
+
+class DownscaledScreen:
+    """
+    Every factor-th pixel of a screenshot (or RawFrame), read lazily.
+
+    Slicing maps to a strided slice of the source, so only the subsampled
+    pixels of a region are ever touched or colour-converted.
+    """
+
+    def __init__(self, screen, factor: int):
+        self.screen = screen
+        self.factor = factor
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        height, width = self.screen.shape[:2]
+        return height // self.factor, width // self.factor, 3
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, cols = key
+        f = self.factor
+        return self.screen[rows.start * f:rows.stop * f:f, cols.start * f:cols.stop * f:f]
+
+class TableFrame:
+    """
+    One captured screenshot plus lazily computed per-region views.
+
+    Each region is cropped, converted to grayscale and binarized (white text)
+    at most once per frame, and only when a detector asks for it, so every
+    detector shares the same derived buffers and the full frame is never
+    colour-converted.
+    """
+
+    def __init__(self, screen, geometry: Optional[TableGeometry] = None):
+        """
+        Args:
+            screen: BGR screenshot (np.ndarray) or a RawFrame from the raw/stream capture backends
+            geometry (TableGeometry): Region layout for this screen, by default scaled from its width
+        """
+        self.screen = screen
+        self.full_shape = None   # Shape of the source screen for frames built by subset()
+        self.downscale = 1       # Subsampling factor of this tier relative to the captured screen
+        if geometry is None and screen is not None:
+            geometry = TableGeometry.for_shape(screen.shape)
+        self.geometry = geometry
+        self._crops: Dict[Box, np.ndarray] = {}
+        self._grays: Dict[Box, np.ndarray] = {}
+        self._binaries: Dict[Box, np.ndarray] = {}
+        self._tiers: Dict[int, 'TableFrame'] = {}
+        # Pixels cropped out of the screen so far, for throughput accounting
+        self.pixels_read = 0
+        # Per-frame results detectors share with each other (slot occupancy, recognized cards, ...)
+        self.cache: Dict[str, object] = {}
+
+    @classmethod
+    def wrap(cls, screen) -> 'TableFrame':
+        """Reuse an existing TableFrame, or build one around a raw screenshot"""
+        return screen if isinstance(screen, TableFrame) else cls(screen)
+
+    def subset(self, regions) -> 'TableFrame':
+        """
+        Picklable frame holding copies of only the given regions, for worker processes.
+        Any other region cannot be read from it.
+        """
+        frame = TableFrame(None, self.geometry)
+        frame.full_shape = self.shape
+        frame.downscale = self.downscale
+        for region in regions:
+            frame._crops[self.region_box(region)] = np.ascontiguousarray(self.crop(region))
+        return frame
+
+    def downscaled(self, factor: int) -> 'TableFrame':
+        """
+        Low-resolution tier of this frame for coarse presence checks, built once.
+        Its regions are read from every factor-th pixel of the screen.
+        """
+        if factor <= self.downscale:
+            return self
+        if factor not in self._tiers:
+            step = factor // self.downscale
+            tier = TableFrame(DownscaledScreen(self.screen, step), self.geometry.downscaled(step))
+            tier.downscale = factor
+            self._tiers[factor] = tier
+        return self._tiers[factor]
+
+    def to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """Pixel of this tier -> pixel of the captured screen"""
+        return x * self.downscale, y * self.downscale
+
+    def pixel_reads(self) -> Dict[int, int]:
+        """Pixels cropped per tier (downscale factor) of this frame"""
+        reads = {self.downscale: self.pixels_read}
+        for tier in self._tiers.values():
+            for factor, pixels in tier.pixel_reads().items():
+                reads[factor] = reads.get(factor, 0) + pixels
+        return reads
+
+    @property
+    def shape(self):
+        if self.screen is None:
+            return self.full_shape
+        return self.screen.shape
+
+    def __getitem__(self, key):
+        # Plain slicing for code that still works on raw coordinates
+        return self.screen[key]
+
+    def region_box(self, region: Union[str, Dict[str, int]]) -> Box:
+        """Screen pixel box of a named region, or of an explicit box, clipped to the screen"""
+        x1, y1, x2, y2 = self.geometry.box(region)
+        height, width = self.shape[:2]
+        return max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+
+    def crop(self, region: Union[str, Dict[str, int]]) -> np.ndarray:
+        """BGR pixels of a named region from regions.py, or of an explicit {'x1','y1','x2','y2'} box"""
+        box = self.region_box(region)
+        if box not in self._crops:
+            x1, y1, x2, y2 = box
+            self._crops[box] = self.screen[y1:y2, x1:x2]
+            self.pixels_read += (y2 - y1) * (x2 - x1)
+        return self._crops[box]
+
+    def cached_crop(self, region: Union[str, Dict[str, int]]) -> Optional[np.ndarray]:
+        """BGR pixels of a region if a detector already cropped it from this frame, else None"""
+        return self._crops.get(self.region_box(region))
+
+    def gray(self, region: Union[str, Dict[str, int]]) -> np.ndarray:
+        box = self.region_box(region)
+        if box not in self._grays:
+            self._grays[box] = cv2.cvtColor(self.crop(region), cv2.COLOR_BGR2GRAY)
+        return self._grays[box]
+
+    def binary(self, region: Union[str, Dict[str, int]]) -> np.ndarray:
+        """White-text mask, same threshold as the binarized template variants"""
+        box = self.region_box(region)
+        if box not in self._binaries:
+            _, self._binaries[box] = cv2.threshold(self.gray(region), WHITE_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY)
+        return self._binaries[box]
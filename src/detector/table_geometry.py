@@ -0,0 +1,145 @@
+# src/detector/table_geometry.py
+import cv2
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Dict, Tuple, Union
+from src.config.regions import *
+
+Box = Tuple[int, int, int, int]
+
+def _named_regions() -> Dict[str, Dict[str, int]]:
+    """Flatten src/config/regions.py into one name -> box mapping"""
+    regions = {}
+    for i, region in enumerate(HERO_CARD_REGIONS):
+        regions[f'hero_card_{i}'] = region
+    for i, region in enumerate(COMMUNITY_CARD_REGIONS):
+        regions[f'community_card_{i}'] = region
+    for player, region in STACK_REGIONS.items():
+        regions[f'stack_{player}'] = region
+    for player, region in BET_REGIONS.items():
+        regions[f'bet_{player}'] = region
+    for player, region in BUTTON_REGIONS.items():
+        regions[f'button_{player}'] = region
+    regions['pot_preflop'] = POT_REGION_PREFLOP
+    regions['pot_postflop'] = POT_REGION_POSTFLOP
+    regions['hero_turn'] = HERO_TURN_REGION
+    regions['action_strip'] = ACTION_REGION
+    regions['pot_type_banner'] = PREFLOP_POT_TYPE_REGION
+    regions['next_hand'] = NEXT_HAND_REGION
+    return regions
+
+# Pixel boxes on the reference 1080x1920 screen the regions were measured on
+TABLE_REGIONS = _named_regions()
+
+# The same regions as fractions of the reference screen width and height
+NORMALIZED_REGIONS = {
+    name: (r['x1'] / REFERENCE_WIDTH, r['y1'] / REFERENCE_HEIGHT, r['x2'] / REFERENCE_WIDTH, r['y2'] / REFERENCE_HEIGHT)
+    for name, r in TABLE_REGIONS.items()
+}
+
+@dataclass(frozen=True)
+class TableGeometry:
+    """
+    Maps the normalized table regions onto one screen resolution.
+
+    screen pixel = offset + scale * reference pixel, where scale is relative to
+    the 1080x1920 reference. The default for a screen size assumes the same
+    layout scaled by width; calibrate() refines scale and offset by locating an
+    anchor template, e.g. on letterboxed or differently sized emulators.
+    """
+
+    scale: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+    calibrated: bool = False
+    _boxes: Dict[str, Box] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def for_shape(cls, shape) -> 'TableGeometry':
+        """Uncalibrated geometry for a (height, width, ...) screen"""
+        return _default_geometry(int(shape[1]))
+
+    def point(self, x: float, y: float) -> Tuple[int, int]:
+        """Reference pixel -> screen pixel"""
+        return int(round(self.offset_x + self.scale * x)), int(round(self.offset_y + self.scale * y))
+
+    def length(self, reference_pixels: float) -> int:
+        """A distance measured on the reference screen, in screen pixels"""
+        return int(round(self.scale * reference_pixels))
+
+    def box(self, region: Union[str, Dict[str, int]]) -> Box:
+        """Screen pixel box of a named region; explicit {'x1','y1','x2','y2'} boxes are already in screen pixels"""
+        if not isinstance(region, str):
+            return region['x1'], region['y1'], region['x2'], region['y2']
+        if region not in self._boxes:
+            nx1, ny1, nx2, ny2 = NORMALIZED_REGIONS[region]
+            x1, y1 = self.point(nx1 * REFERENCE_WIDTH, ny1 * REFERENCE_HEIGHT)
+            x2, y2 = self.point(nx2 * REFERENCE_WIDTH, ny2 * REFERENCE_HEIGHT)
+            self._boxes[region] = (x1, y1, x2, y2)
+        return self._boxes[region]
+
+    def downscaled(self, factor: int) -> 'TableGeometry':
+        """The same layout on a screen subsampled by an integer factor"""
+        return TableGeometry(
+            scale=self.scale / factor,
+            offset_x=self.offset_x / factor,
+            offset_y=self.offset_y / factor,
+            calibrated=self.calibrated
+        )
+
+    def calibrate(self, frame, anchor: np.ndarray, anchor_position: Tuple[int, int],
+                  min_confidence: float = 0.9, search_margin: float = 0.1) -> 'TableGeometry':
+        """
+        Locate the anchor template around its expected position over a range of scales
+
+        Args:
+            frame (TableFrame): Current frame
+            anchor (np.ndarray): Grayscale anchor template at reference (1080x1920) size
+            anchor_position (Tuple[int, int]): Top-left of the anchor on the reference screen
+            min_confidence (float): Match score needed to accept the calibration
+            search_margin (float): Search window around the expected position, as a fraction of the screen
+
+        Returns:
+            TableGeometry: Calibrated geometry, or self if the anchor was not found
+        """
+        height, width = frame.shape[:2]
+        expected_x, expected_y = self.point(*anchor_position)
+        margin_x, margin_y = int(width * search_margin), int(height * search_margin)
+        window = {
+            'x1': max(0, expected_x - margin_x),
+            'y1': max(0, expected_y - margin_y),
+            'x2': min(width, expected_x + margin_x + self.length(anchor.shape[1] * 1.3)),
+            'y2': min(height, expected_y + margin_y + self.length(anchor.shape[0] * 1.3))
+        }
+        search = frame.gray(window)
+
+        matches = []
+        for scale in self.scale * np.linspace(0.8, 1.2, 17):
+            scaled = cv2.resize(anchor, None, fx=scale, fy=scale,
+                                interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+            if scaled.shape[0] > search.shape[0] or scaled.shape[1] > search.shape[1] or min(scaled.shape) < 4:
+                continue
+            _, confidence, _, location = cv2.minMaxLoc(cv2.matchTemplate(search, scaled, cv2.TM_CCOEFF_NORMED))
+            matches.append((confidence, float(scale), location))
+
+        if not matches or max(matches)[0] < min_confidence:
+            return self
+        # A small anchor scores nearly the same over a few percent of scale; its position is
+        # precise, its size is not, so prefer the scale closest to the current one among the best
+        best_confidence = max(matches)[0]
+        _, scale, location = min((m for m in matches if m[0] >= best_confidence - 0.01),
+                                 key=lambda m: abs(m[1] - self.scale))
+        found_x, found_y = window['x1'] + location[0], window['y1'] + location[1]
+        return TableGeometry(
+            scale=scale,
+            offset_x=found_x - scale * anchor_position[0],
+            offset_y=found_y - scale * anchor_position[1],
+            calibrated=True
+        )
+
+_default_geometries: Dict[int, TableGeometry] = {}
+
+def _default_geometry(width: int) -> TableGeometry:
+    if width not in _default_geometries:
+        _default_geometries[width] = TableGeometry(scale=width / REFERENCE_WIDTH)
+    return _default_geometries[width]
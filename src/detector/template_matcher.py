@@ -1,39 +1,124 @@
 import cv2
 import numpy as np
-import os
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
+from src.detector.template_registry import Template, TemplateRegistry
+from src.detector.table_frame import TableFrame
+from src.detector.table_geometry import TableGeometry
+from src.config.regions import CALIBRATION_ANCHOR
+
+TEMPLATE_FAMILIES = [
+    'ranks_hero', 'suits_hero', 'ranks_community', 'suits_community',
+    'object_templates', 'preflop_templates', 'action_templates', 'digit_templates'
+]
+
+# Frame tier each check reads. 'presence' checks only need to know whether a large,
+# high-contrast element is there and run on the downscaled frame; 'detail' checks
+# read cards, amounts and the action buttons whose positions locate the amounts,
+# and keep the full-resolution crops.
+CHECK_TIERS = {
+    'hero_turn': 'presence',
+    'next_hand': 'presence',
+    'button': 'presence',
+    'pot_type': 'presence',
+    'cards': 'detail',
+    'amounts': 'detail',
+    'action_buttons': 'detail',
+}
+
+# Template families matched on the presence tier
+PRESENCE_FAMILIES = ['object_templates', 'preflop_templates']
 
 class TemplateMatcher:
-    def __init__(self, template_path: str):
+    def __init__(self, template_path: str, reload_interval: float = 2.0, presence_downscale: int = 2):
+        """
+        Args:
+            template_path (str): Root directory of the template folders
+            reload_interval (float): Minimum seconds between template mtime checks
+            presence_downscale (int): Subsampling factor of the presence tier, 1 reads every check at full resolution
+        """
         self.template_path = template_path
-        self.hero_rank_templates = {}
-        self.hero_suit_templates = {}
-        self.community_rank_templates = {}
-        self.community_suit_templates = {}
-        self.load_templates()
+        self.presence_downscale = max(1, int(presence_downscale))
+        self.registry = TemplateRegistry(template_path, TEMPLATE_FAMILIES, reload_interval)
+        self.registry.print_stats()
+        # Presence templates pre-shrunk to the presence tier
+        self.presence_registry = self.registry
+        if self.presence_downscale > 1:
+            self.presence_registry = TemplateRegistry(template_path, PRESENCE_FAMILIES, reload_interval,
+                                                      scale=1.0 / self.presence_downscale)
 
     def load_templates(self):
-        """Load all template images from the template directory"""
-        # Load hero rank templates
-        self._load_templates('ranks_hero', self.hero_rank_templates)
-        self._load_templates('suits_hero', self.hero_suit_templates)
-        self._load_templates('ranks_community', self.community_rank_templates)
-        self._load_templates('suits_community', self.community_suit_templates)
-
-    def _load_templates(self, subfolder: str, template_dict: Dict):
-        path = os.path.join(self.template_path, subfolder)
-        for filename in os.listdir(path):
-            if filename.endswith('.png'):
-                key = filename.split('.')[0]
-                template = cv2.imread(os.path.join(path, filename))
-                if template is not None:
-                    template_dict[key] = template
+        """Reload all template images from the template directory"""
+        for family in TEMPLATE_FAMILIES:
+            self.registry.load_family(family)
+
+    def _color_templates(self, family: str) -> Dict[str, np.ndarray]:
+        return {name: t.color for name, t in self.registry.family(family).items()}
+
+    @property
+    def hero_rank_templates(self) -> Dict[str, np.ndarray]:
+        return self._color_templates('ranks_hero')
+
+    @property
+    def hero_suit_templates(self) -> Dict[str, np.ndarray]:
+        return self._color_templates('suits_hero')
+
+    @property
+    def community_rank_templates(self) -> Dict[str, np.ndarray]:
+        return self._color_templates('ranks_community')
+
+    @property
+    def community_suit_templates(self) -> Dict[str, np.ndarray]:
+        return self._color_templates('suits_community')
+
+    def get_template(self, family: str, name: str) -> Optional[Template]:
+        """Return a preloaded template with its grayscale and binarized variants"""
+        return self.registry.get(family, name)
+
+    def tier_frame(self, screen, check: str) -> TableFrame:
+        """The tier of the frame a check from CHECK_TIERS reads"""
+        frame = TableFrame.wrap(screen)
+        if CHECK_TIERS[check] == 'presence':
+            return frame.downscaled(self.presence_downscale)
+        return frame
+
+    def tier_template(self, check: str, family: str, name: str) -> Optional[Template]:
+        """A template sized for the tier a check reads"""
+        if CHECK_TIERS[check] == 'presence':
+            return self.presence_registry.get(family, name)
+        return self.registry.get(family, name)
+
+    def set_scale(self, scale: float):
+        """Resize the templates of every tier for a screen scale (no-op if unchanged)"""
+        self.registry.set_scale(scale)
+        if self.presence_registry is not self.registry:
+            self.presence_registry.set_scale(scale / self.presence_downscale)
+
+    def calibrate(self, screen) -> TableGeometry:
+        """
+        Fit the table geometry to this screen by locating the calibration anchor,
+        and rescale the templates to match
+
+        Args:
+            screen: Current screenshot or TableFrame
+
+        Returns:
+            TableGeometry: Calibrated geometry, or the width-based default if the anchor is not visible
+        """
+        frame = TableFrame.wrap(screen)
+        # The matching copy may already be rescaled, the anchor is searched from reference size
+        anchor = self.registry.reference_gray(CALIBRATION_ANCHOR['family'], CALIBRATION_ANCHOR['name'])
+        geometry = frame.geometry
+        if anchor is not None:
+            geometry = geometry.calibrate(frame, anchor, (CALIBRATION_ANCHOR['x'], CALIBRATION_ANCHOR['y']))
+        self.set_scale(geometry.scale)
+        return geometry
 
     def match_template(self, image: np.ndarray, template: np.ndarray, 
                       use_preprocessing: bool = True) -> Tuple[float, Tuple[int, int]]:
         if use_preprocessing:
-            processed_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            processed_template = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
+            # Single-channel inputs are already grayscale (e.g. registry variants)
+            processed_image = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            processed_template = template if template.ndim == 2 else cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
         else:
             processed_image = image
             processed_template = template
@@ -48,20 +133,22 @@ class TemplateMatcher:
         Detect the 'Next Hand' button on the screen.
         
         Args:
-            screen (np.ndarray): The current screen image
+            screen (np.ndarray): The current screen image or TableFrame
             
         Returns:
             Tuple[bool, Tuple[int, int]]: (is_detected, (x, y) position)
         """
-        next_hand_template = cv2.imread(os.path.join(self.template_path, 'object_templates/next_hand.png'))
+        template = self.tier_template('next_hand', 'object_templates', 'next_hand')
         
-        if next_hand_template is None:
+        if template is None:
             print("Warning: Next Hand template could not be loaded")
             return False, (0, 0)
+        next_hand_template = template.color
         
         # Look for the button in the bottom half of the screen where it's likely to appear
-        height, width = screen.shape[:2]
-        search_area = screen[height//2:, :]
+        frame = self.tier_frame(screen, 'next_hand')
+        search_x1, search_y1, _, _ = frame.region_box('next_hand')
+        search_area = frame.crop('next_hand')
         
         # Match the template
         result = cv2.matchTemplate(search_area, next_hand_template, cv2.TM_CCOEFF_NORMED)
@@ -69,9 +156,9 @@ class TemplateMatcher:
         
         # Adjust position back to full screen coordinates
         if max_val > 0.7:  # Threshold can be adjusted
-            x = max_loc[0] + next_hand_template.shape[1]//2  # Center of button X
-            y = max_loc[1] + height//2 + next_hand_template.shape[0]//2  # Center of button Y
-            return True, (x, y)
+            x = max_loc[0] + search_x1 + next_hand_template.shape[1]//2  # Center of button X
+            y = max_loc[1] + search_y1 + next_hand_template.shape[0]//2  # Center of button Y
+            return True, frame.to_screen(x, y)
         
         return False, (0, 0)
     
@@ -81,13 +168,13 @@ class TemplateMatcher:
         Detect preflop scenario based on templates in the specified region.
         
         Args:
-            screen (np.ndarray): The full screenshot
+            screen (np.ndarray): The full screenshot or TableFrame
             
         Returns:
             str: Detected scenario ('2_bet_pot', '3_bet_pot', '4_bet_pot', or 'unknown')
         """
-        # Define the region where preflop scenario indicators appear
-        preflop_region = screen[1100:1200, 400:700]
+        # Grayscale view of the region where preflop scenario indicators appear
+        preflop_region = self.tier_frame(screen, 'pot_type').gray('pot_type_banner')
         
         # Define possible scenarios and their corresponding template files
         scenarios = ['2_bet_pot', '3_bet_pot', '4_bet_pot']
@@ -96,17 +183,12 @@ class TemplateMatcher:
         best_confidence = 0.0
         
         for scenario in scenarios:
-            template_path = os.path.join(self.template_path, f'preflop_templates/{scenario}.png')
-            if not os.path.exists(template_path):
-                print(f"Warning: Template {template_path} does not exist")
-                continue
-                
-            template = cv2.imread(template_path)
+            template = self.tier_template('pot_type', 'preflop_templates', scenario)
             if template is None:
-                print(f"Warning: Failed to load template {template_path}")
+                print(f"Warning: Template preflop_templates/{scenario}.png is not loaded")
                 continue
             
-            confidence, _ = self.match_template(preflop_region, template)
+            confidence, _ = self.match_template(preflop_region, template.gray)
             
             if confidence > best_confidence and confidence > 0.7:  # Threshold can be adjusted
                 best_confidence = confidence
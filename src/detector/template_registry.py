@@ -0,0 +1,184 @@
+# src/detector/template_registry.py
+import os
+import time
+import threading
+import cv2
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+WHITE_TEXT_THRESHOLD = 200
+
+# Compared by identity: a reload always builds new Template objects, and comparing
+# the pixel arrays field by field would be ambiguous (and slow)
+@dataclass(frozen=True, eq=False)
+class Template:
+    name: str
+    path: str
+    mtime: float
+    color: np.ndarray
+    gray: np.ndarray
+    binary: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.color.nbytes + self.gray.nbytes + self.binary.nbytes
+
+def _freeze(array: np.ndarray) -> np.ndarray:
+    """Mark an array read-only so callers cannot mutate a shared template"""
+    array.setflags(write=False)
+    return array
+
+class TemplateRegistry:
+    def __init__(self, template_path: str, families: List[str], reload_interval: float = 2.0, scale: float = 1.0):
+        """
+        Load, decode and preprocess every template once, grouped by family
+
+        Args:
+            template_path (str): Root directory of the template folders
+            families (List[str]): Subfolders to load, e.g. 'ranks_hero', 'object_templates'
+            reload_interval (float): Minimum seconds between mtime checks, 0 disables hot reload
+            scale (float): Screen scale relative to the 1080x1920 screens the templates were cut from
+        """
+        self.template_path = template_path
+        self.reload_interval = reload_interval
+        self.scale = scale
+        self._families: Dict[str, Dict[str, Template]] = {}
+        self._load_times: Dict[str, float] = {}
+        # Grayscale of every template at the size it was cut, whatever the current scale
+        self._reference_gray: Dict[str, np.ndarray] = {}
+        self._last_check = time.monotonic()
+        # Region worker threads may all ask for templates at once; only one of them reloads
+        self._reload_lock = threading.Lock()
+
+        for family in families:
+            self.load_family(family)
+
+    def load_family(self, family: str):
+        """(Re)load every PNG in a family folder"""
+        start = time.perf_counter()
+        templates = {}
+        path = os.path.join(self.template_path, family)
+        if os.path.isdir(path):
+            for filename in sorted(os.listdir(path)):
+                if filename.endswith('.png'):
+                    template = self._load_template(os.path.join(path, filename))
+                    if template is not None:
+                        templates[template.name] = template
+        else:
+            print(f"Warning: Template folder {path} does not exist")
+
+        self._families[family] = templates
+        self._load_times[family] = time.perf_counter() - start
+
+    def _load_template(self, file_path: str) -> Optional[Template]:
+        color = cv2.imread(file_path)
+        if color is None:
+            print(f"Warning: Failed to load template {file_path}")
+            return None
+
+        reference_gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+        self._reference_gray[file_path] = _freeze(reference_gray)
+        if self.scale != 1.0:
+            # Resized once here, so matching never rescales a template
+            interpolation = cv2.INTER_AREA if self.scale < 1.0 else cv2.INTER_LINEAR
+            color = cv2.resize(color, None, fx=self.scale, fy=self.scale, interpolation=interpolation)
+
+        gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY) if self.scale != 1.0 else reference_gray
+        _, binary = cv2.threshold(gray, WHITE_TEXT_THRESHOLD, 255, cv2.THRESH_BINARY)
+
+        return Template(
+            name=os.path.basename(file_path).split('.')[0],
+            path=file_path,
+            mtime=os.path.getmtime(file_path),
+            color=_freeze(color),
+            gray=_freeze(gray),
+            binary=_freeze(binary)
+        )
+
+    def set_scale(self, scale: float):
+        """Reload every family resized for a new screen scale (no-op if unchanged)"""
+        if abs(scale - self.scale) < 1e-3:
+            return
+        self.scale = scale
+        for family in list(self._families):
+            self.load_family(family)
+        print(f"Templates rescaled to {scale:.3f}x")
+
+    def _maybe_reload(self):
+        """Reload any template whose file changed on disk, at most once per reload_interval"""
+        if self.reload_interval <= 0:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.reload_interval:
+            return
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_check = now
+            self.reload_changed()
+        finally:
+            self._reload_lock.release()
+
+    def reload_changed(self) -> List[str]:
+        """
+        Re-read templates whose mtime changed and pick up added/removed files
+
+        Returns:
+            List[str]: 'family/name' of every template that was reloaded
+        """
+        reloaded = []
+        for family, templates in self._families.items():
+            path = os.path.join(self.template_path, family)
+            if not os.path.isdir(path):
+                continue
+            on_disk = {f.split('.')[0] for f in os.listdir(path) if f.endswith('.png')}
+            if on_disk != set(templates):
+                self.load_family(family)
+                reloaded.append(f"{family}/*")
+                continue
+            for name, template in templates.items():
+                try:
+                    mtime = os.path.getmtime(template.path)
+                except OSError:
+                    continue
+                if mtime != template.mtime:
+                    updated = self._load_template(template.path)
+                    if updated is not None:
+                        templates[name] = updated
+                        reloaded.append(f"{family}/{name}")
+
+        for item in reloaded:
+            print(f"Reloaded template {item}")
+        return reloaded
+
+    def family(self, family: str) -> Dict[str, Template]:
+        """Return all templates of a family keyed by name"""
+        self._maybe_reload()
+        return self._families.get(family, {})
+
+    def get(self, family: str, name: str) -> Optional[Template]:
+        """Return a single template, or None if it is missing"""
+        return self.family(family).get(name)
+
+    def reference_gray(self, family: str, name: str) -> Optional[np.ndarray]:
+        """Grayscale template at reference (1080x1920) size, even after set_scale()"""
+        template = self.get(family, name)
+        return self._reference_gray.get(template.path) if template is not None else None
+
+    def stats(self) -> Dict[str, Dict]:
+        """Load time and memory footprint per template family"""
+        return {
+            family: {
+                'count': len(templates),
+                'load_time_ms': self._load_times.get(family, 0.0) * 1000,
+                'bytes': sum(t.nbytes for t in templates.values())
+            }
+            for family, templates in self._families.items()
+        }
+
+    def print_stats(self):
+        print("\nTemplate registry:")
+        for family, info in self.stats().items():
+            print(f"- {family}: {info['count']} templates, "
+                  f"{info['load_time_ms']:.1f} ms, {info['bytes'] / 1024:.1f} KiB")
@@ -1,9 +1,25 @@
 import cv2
-import pytesseract
+import time
 from src.utils.image_preprocessing import ImagePreprocessor
+from src.detector.ocr_engine import OcrLatencyStats, create_ocr_engine
+from src.detector.digit_reader import GlyphDigitReader
+from src.utils.tick_timer import span
 import numpy as np
+from typing import List, Optional
 #testing
 class TextDetector:
+    def __init__(self, engine: str = 'auto', digit_reader: Optional[GlyphDigitReader] = None):
+        """
+        Args:
+            engine (str): OCR engine name, see ocr_engine.create_ocr_engine
+            digit_reader (GlyphDigitReader): Tried first for every ROI; Tesseract only
+                                             sees the ROIs it cannot read confidently
+        """
+        self.engine = create_ocr_engine(engine)
+        self.digit_reader = digit_reader
+        self.stats = OcrLatencyStats()
+        self.glyph_stats = OcrLatencyStats()
+
     @staticmethod
     def extract_number(text: str) -> float:
         # Remove 'BB' or 'bb' from the text
@@ -15,14 +31,49 @@ class TextDetector:
         except ValueError:
             return 0.0
 
-    def detect_text(self, roi: np.ndarray) -> str:
+    def detect_texts(self, rois: List[np.ndarray]) -> List[str]:
+        """OCR several ROIs in one engine call"""
+        if not rois:
+            return []
+
+        texts: List[Optional[str]] = [None] * len(rois)
+        if self.digit_reader is not None:
+            start = time.perf_counter()
+            with span('glyphs'):
+                for i, roi in enumerate(rois):
+                    result = self.digit_reader.read_text(roi)
+                    if result is not None:
+                        texts[i] = result[0]
+            self.glyph_stats.record(len(rois), (time.perf_counter() - start) * 1000)
+
+        # Low-confidence glyph reads fall back to Tesseract
+        pending = [i for i, text in enumerate(texts) if text is None]
+        if pending:
+            #processed = [ImagePreprocessor.preprocess_for_ocr(rois[i]) for i in pending]
+            processed = [rois[i] for i in pending]
 
-        #processed = ImagePreprocessor.preprocess_for_ocr(roi)
-        processed = roi
+            start = time.perf_counter()
+            with span('tesseract'):
+                recognized = self.engine.recognize(processed)
+            for i, text in zip(pending, recognized):
+                texts[i] = text
+            self.stats.record(len(pending), (time.perf_counter() - start) * 1000)
+        return texts
 
-        
-        return pytesseract.image_to_string(processed, config='--psm 7 digits')
+    def format_stats(self) -> str:
+        if self.digit_reader is None:
+            return self.stats.format()
+        return f"glyphs {self.glyph_stats.format()}, tesseract {self.stats.format()}"
+
+    def detect_values(self, rois: List[np.ndarray]) -> List[float]:
+        return [self.extract_number(text) for text in self.detect_texts(rois)]
+
+    def detect_text(self, roi: np.ndarray) -> str:
+        return self.detect_texts([roi])[0]
 
     def detect_value(self, roi: np.ndarray) -> float:
         text = self.detect_text(roi)
-        return self.extract_number(text)
\ No newline at end of file
+        return self.extract_number(text)
+
+    def close(self):
+        self.engine.close()
@@ -5,6 +5,7 @@ import json
 import os
 from src.utils.hand_analyzer import HandAnalyzer  # Import the new HandAnalyzer
 from src.utils.equity_calculator import EquityCalculator
+from src.utils.equity_cache import EQUITY_CACHE_PATH
 
 class ClaudePostFlopEngine:
     def __init__(self):
@@ -13,7 +14,9 @@ class ClaudePostFlopEngine:
             raise ValueError("ANTHROPIC_API_KEY environment variable not set")
         self.client = Anthropic(api_key=api_key)
         self.hand_analyzer = HandAnalyzer()  # Initialize the hand analyzer
-        self.equity_calculator = EquityCalculator()
+        # Equity results persist across sessions, EQUITY_CACHE_PATH= (empty) keeps them in memory
+        self.equity_calculator = EquityCalculator(
+            cache_path=os.environ.get("EQUITY_CACHE_PATH", EQUITY_CACHE_PATH) or None)
 
     def interpret_preflop_scenario(self, scenario: str) -> str:
         """Convert preflop scenario code to a detailed explanation"""
@@ -106,7 +109,14 @@ class ClaudePostFlopEngine:
                     equity_info = "\n## Equity Analysis (Mathematically Verified):\n"
                     equity_info += f"- Hero equity vs villain range: {equity_percentage:.2f}%\n"
                     equity_info += f"- Villain range: {equity_result['range_description']}\n"
-                    equity_info += f"- Based on {equity_result['iterations']} Monte Carlo simulations\n"
+                    if equity_result.get('method') == "exact":
+                        equity_info += f"- Exact: every runout against every villain combo (no sampling error)\n"
+                    elif equity_result.get('method') == "table":
+                        equity_info += (f"- Precomputed against the full weighted range "
+                                        f"(standard error {equity_result['std_error'] * 100:.2f}%)\n")
+                    else:
+                        equity_info += (f"- Based on {equity_result['iterations']} Monte Carlo simulations "
+                                        f"(standard error {equity_result['std_error'] * 100:.2f}%)\n")
                     
                     # Add decision guidance based on equity
                     equity_info += "\nEquity-based decision guidance:\n"
@@ -0,0 +1,23 @@
+# src/engine/stub_post_flop_engine.py
+from typing import Dict
+
+class StubPostFlopEngine:
+    """
+    Deterministic post-flop engine without an LLM, for replays and offline benchmarks.
+
+    Takes the cheapest available action: CHECK, else CALL, else FOLD.
+    """
+
+    PREFERENCE = ['CHECK', 'CALL', 'FOLD']
+
+    def get_decision(self, table_state: Dict, hand_history) -> Dict:
+        available_actions = table_state["available_actions"]
+        for action_type in self.PREFERENCE:
+            if available_actions.get(action_type, {}).get("available", False):
+                return {
+                    "action": action_type,
+                    "amount": None,
+                    "position": available_actions[action_type]["position"],
+                    "reasoning": f"Stub engine: cheapest available action ({action_type})"
+                }
+        return {"action": "WAIT", "reasoning": "No valid action available"}
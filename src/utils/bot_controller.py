@@ -1,10 +1,12 @@
 import signal
 import sys
 from threading import Event
+from typing import Callable, List
 
 class BotController:
     def __init__(self):
         self.stop_event = Event()
+        self.cleanup_callbacks: List[Callable[[], None]] = []
         self._setup_signal_handler()
     
     def _setup_signal_handler(self):
@@ -22,5 +24,16 @@ class BotController:
     def should_continue(self):
         return not self.stop_event.is_set()
     
+    def register_cleanup(self, callback: Callable[[], None]):
+        """Run callback on cleanup, e.g. to shut down worker pools"""
+        self.cleanup_callbacks.append(callback)
+    
     def cleanup(self):
+        # Each callback runs once even if cleanup is reached twice
+        while self.cleanup_callbacks:
+            callback = self.cleanup_callbacks.pop()
+            try:
+                callback()
+            except Exception as e:
+                print(f"Cleanup error: {e}")
         sys.exit(0)
\ No newline at end of file
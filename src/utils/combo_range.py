@@ -0,0 +1,104 @@
+# src/utils/combo_range.py
+import json
+import hashlib
+import itertools
+import eval7
+import numpy as np
+from typing import Dict, List
+from src.utils.hand_evaluator import card_index
+
+def card_mask(cards: List[eval7.Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= card.mask
+    return mask
+
+class ComboRange:
+    """
+    A preflop range parsed once into its combos and their weights.
+
+    Combos are kept as NumPy arrays (card bitmasks, card indices for
+    src/utils/hand_evaluator.py, weights, weight group) so card removal against
+    any set of dead cards is one vectorized mask test. eval7
+    ignores range weights, so the combos are also grouped by weight into one
+    eval7.HandRange per group: each group is evaluated uniformly and the group
+    results are combined by the live weight of each group.
+    """
+
+    def __init__(self, name: str, range_weights: Dict[str, float]):
+        """
+        Args:
+            name (str): Range key, e.g. 'bb_call'
+            range_weights (Dict[str, float]): Hand -> weight, e.g. {'AA': 1.0, 'QQ': 0.75}
+        """
+        self.name = name
+        # Identifies the exact weights, e.g. to key cached results across sessions
+        self.digest = hashlib.blake2b(json.dumps(sorted(range_weights.items())).encode(), digest_size=6).hexdigest()
+        by_weight: Dict[float, List[str]] = {}
+        for hand, weight in range_weights.items():
+            if weight > 0:
+                by_weight.setdefault(weight, []).append(hand)
+
+        self.group_weights: List[float] = []
+        self.groups: List[eval7.HandRange] = []
+        masks, cards, weights, group_ids = [], [], [], []
+        for weight, hands in sorted(by_weight.items()):
+            try:
+                hand_range = eval7.HandRange(",".join(hands))
+            except Exception as e:
+                print(f"Error parsing hands {hands} of range '{name}': {e}")
+                continue
+            group_id = len(self.groups)
+            self.groups.append(hand_range)
+            self.group_weights.append(weight)
+            for (c1, c2), _ in hand_range.hands:
+                masks.append(c1.mask | c2.mask)
+                cards.append((card_index(str(c1)), card_index(str(c2))))
+                weights.append(weight)
+                group_ids.append(group_id)
+
+        self.masks = np.array(masks, dtype=np.uint64)
+        self.cards = np.array(cards, dtype=np.int32).reshape(-1, 2)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.group_ids = np.array(group_ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __str__(self) -> str:
+        return f"{self.name} ({len(self)} combos)"
+
+    def live(self, dead: List[eval7.Card]) -> np.ndarray:
+        """Which combos are not blocked by the dead cards"""
+        return (self.masks & np.uint64(card_mask(dead))) == 0
+
+    def live_group_weights(self, dead: List[eval7.Card]) -> np.ndarray:
+        """Total weight of the unblocked combos of each weight group"""
+        live = self.live(dead)
+        return np.bincount(self.group_ids[live], weights=self.weights[live], minlength=len(self.groups))
+
+    def exact_equity(self, hero: List[eval7.Card], board: List[eval7.Card]) -> float:
+        """Weighted equity over every runout of the board and every unblocked combo"""
+        dead = set(hero + board)
+        deck = [card for card in eval7.Deck().cards if card not in dead]
+        weighted_equity, total_weight = 0.0, 0.0
+        for runout in itertools.combinations(deck, 5 - len(board)):
+            full_board = board + list(runout)
+            for group, weight in zip(self.groups, self.live_group_weights(hero + full_board)):
+                if weight > 0:
+                    weighted_equity += eval7.py_hand_vs_range_exact(hero, group, full_board) * weight
+                    total_weight += weight
+        return float(weighted_equity / total_weight) if total_weight else 0.0
+
+    def monte_carlo_equity(self, hero: List[eval7.Card], board: List[eval7.Card], iterations: int) -> float:
+        """Weighted equity sampled with eval7, the iterations split by each group's live weight"""
+        weights = self.live_group_weights(hero + board)
+        total = weights.sum()
+        if total <= 0:
+            return 0.0
+        equity = 0.0
+        for group, weight in zip(self.groups, weights):
+            if weight > 0:
+                samples = max(1, int(round(iterations * weight / total)))
+                equity += eval7.py_hand_vs_range_monte_carlo(hero, group, board, samples) * weight
+        return float(equity / total)
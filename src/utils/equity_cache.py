@@ -0,0 +1,140 @@
+# src/utils/equity_cache.py
+import os
+import json
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from src.utils.hand_evaluator import card_index, card_name
+from src.utils.flop_equity_table import SUIT_PERMUTATIONS
+
+EQUITY_CACHE_SIZE = 20000
+EQUITY_CACHE_PATH = os.path.join('equity_tables', 'equity_cache.json')
+
+def canonical_situation(hero: List[str], board: List[str]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Suit-isomorphic representative of hero's hand on a board
+
+    Suits only matter relative to each other, so AhKh on Qh7h2c and AsKs on Qs7s2d
+    map to the same situation. Hole cards and board cards are unordered.
+    """
+    hero_idx, board_idx = [card_index(c) for c in hero], [card_index(c) for c in board]
+    best = None
+    for permutation in SUIT_PERMUTATIONS:
+        mapped = (tuple(sorted((c - c % 4 + permutation[c % 4] for c in hero_idx), reverse=True)),
+                  tuple(sorted((c - c % 4 + permutation[c % 4] for c in board_idx), reverse=True)))
+        if best is None or mapped < best:
+            best = mapped
+    return tuple(card_name(c) for c in best[0]), tuple(card_name(c) for c in best[1])
+
+class EquityCache:
+    """
+    LRU cache of equity results keyed by the canonical situation.
+
+    Keys combine the villain range (name and a digest of its weights, so edited
+    range files never hit stale entries) with the suit-canonical hero hand and
+    board. With a path, entries are loaded at startup and merged back into the
+    file on save(), so sessions share what earlier ones computed.
+    """
+
+    def __init__(self, capacity: int = EQUITY_CACHE_SIZE, path: Optional[str] = None):
+        """
+        Args:
+            capacity (int): Entries kept, least recently used ones are evicted beyond it
+            path (str): JSON file persisting the cache across sessions, None keeps it in memory
+        """
+        self.capacity = capacity
+        self.path = path
+        self.entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loaded = 0
+        self._dirty = False
+        if path and os.path.isfile(path):
+            for key, value in self._read(path):
+                self._insert(key, value)
+            self.loaded = len(self.entries)
+            self.evictions = 0
+
+    @staticmethod
+    def key(range_name: str, range_digest: str, hero: List[str], board: List[str]) -> str:
+        canonical_hero, canonical_board = canonical_situation(hero, board)
+        return f"{range_name}:{range_digest}|{''.join(canonical_hero)}|{''.join(canonical_board)}"
+
+    def get(self, key: str, iterations: int = 0) -> Optional[Dict]:
+        """
+        Cached result, if it is at least as precise as asked for
+
+        Args:
+            key (str): From EquityCache.key()
+            iterations (int): Monte Carlo results sampled with fewer iterations are misses
+        """
+        value = self.entries.get(key)
+        if value is None or (value.get('method') == 'monte_carlo' and value.get('iterations', 0) < iterations):
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return dict(value)
+
+    def put(self, key: str, value: Dict):
+        self._insert(key, dict(value))
+        self._dirty = True
+
+    def _insert(self, key: str, value: Dict):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    @staticmethod
+    def _read(path: str) -> List[Tuple[str, Dict]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return [(key, value) for key, value in json.load(f)['entries']]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not read equity cache {path}: {e}")
+            return []
+
+    def save(self) -> bool:
+        """
+        Merge the entries into the cache file, ours taking precedence and counting as
+        most recent; written to a temporary file first so readers never see half a file
+
+        Returns:
+            bool: False if there was nothing new to write
+        """
+        if not self.path or not self._dirty:
+            return False
+        merged: 'OrderedDict[str, Dict]' = OrderedDict()
+        if os.path.isfile(self.path):
+            merged.update(self._read(self.path))
+        for key, value in self.entries.items():
+            merged.pop(key, None)
+            merged[key] = value
+        entries = list(merged.items())[-self.capacity:]
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({'entries': entries}, f)
+        os.replace(temporary, self.path)
+        self._dirty = False
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'capacity': self.capacity,
+            'loaded': self.loaded,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (f"{s['hits']} hits / {s['misses']} misses ({s['hit_rate']:.0%}), {s['evictions']} evictions, "
+                f"{s['size']}/{s['capacity']} entries ({s['loaded']} loaded from disk)")
@@ -1,14 +1,43 @@
 # src/utils/equity_calculator.py
 import eval7
 import os
-import random
+import math
 from typing import List, Dict, Optional, Tuple
 from src.models.card import Card as PokerCard
+from src.utils import hand_evaluator
+from src.utils.combo_range import ComboRange
+from src.utils.equity_cache import EquityCache, EQUITY_CACHE_SIZE
+from src.utils.hand_evaluator import card_index, card_name
+from src.utils.flop_equity_table import FlopEquityTable, TABLES_DIR
+
+# Villain combos x runouts up to which equity is enumerated exactly instead of sampled.
+# A turn against a full range is ~30k (7 ms), a flop ~700k, so only turns and rivers qualify
+EXACT_BUDGET = 50000
+
+# Runouts the vectorized hand-vs-range / range-vs-range APIs enumerate before sampling
+# instead: every flop runout, a sample preflop; range vs range compares all combo pairs per runout
+MAX_RUNOUTS = 2000
+RANGE_VS_RANGE_RUNOUTS = 200
+
+# Villain range when the preflop action matches no range file
+DEFAULT_RANGE = {"AA": 1.0, "KK": 1.0, "QQ": 1.0, "JJ": 1.0, "TT": 1.0,
+                 "AK": 1.0, "AQ": 1.0, "AJ": 1.0, "KQ": 1.0}
 
 class EquityCalculator:
-    def __init__(self, ranges_dir="ranges"):
-        """Initialize the equity calculator with preflop ranges"""
+    def __init__(self, ranges_dir="ranges", exact_budget: int = EXACT_BUDGET, tables_dir: str = TABLES_DIR,
+                 cache_size: int = EQUITY_CACHE_SIZE, cache_path: Optional[str] = None):
+        """
+        Initialize the equity calculator with preflop ranges
+
+        Args:
+            ranges_dir: Directory of the preflop range files
+            exact_budget: Largest combo x runout count enumerated exactly, 0 always samples
+            tables_dir: Flop equity tables built by tools/build_flop_tables.py, if any
+            cache_size: Equity results kept for recurring situations
+            cache_path: JSON file sharing cached results across sessions, None keeps them in memory
+        """
         self.ranges_dir = ranges_dir
+        self.exact_budget = exact_budget
         print(f"Initializing EquityCalculator with ranges directory: {ranges_dir}")
         
         # Check if ranges directory exists
@@ -16,6 +45,28 @@ class EquityCalculator:
             print(f"WARNING: Ranges directory {ranges_dir} does not exist")
         
         self.raw_ranges = self._load_all_raw_ranges()
+        # Parsed once into weighted combos; equity is computed against these, never re-parsed
+        self.ranges = {name: ComboRange(name, weights) for name, weights in self.raw_ranges.items()}
+        self.default_range = ComboRange("default", DEFAULT_RANGE)
+
+        # Flop equities are read from precomputed tables when they have been built
+        self.flop_table = FlopEquityTable(tables_dir, {key: r.digest for key, r in self.ranges.items()})
+        if self.flop_table.tables:
+            print(f"Loaded flop equity tables for {sorted(self.flop_table.tables)}")
+
+        # Results of recurring situations, keyed up to suit isomorphism
+        self.cache = EquityCache(cache_size, cache_path)
+        if self.cache.loaded:
+            print(f"Loaded {self.cache.loaded} cached equity results from {cache_path}")
+
+    def close(self) -> bool:
+        """
+        Persist the equity cache for later sessions
+
+        Returns:
+            bool: True if new results were written
+        """
+        return self.cache.save()
         
     def _load_all_raw_ranges(self) -> Dict[str, Dict[str, float]]:
         """Load all preflop ranges from files as dictionaries with weights"""
@@ -66,35 +117,6 @@ class EquityCalculator:
                 
         return result
     
-    def _create_weighted_range(self, range_dict: Dict[str, float]) -> eval7.HandRange:
-        """
-        Create an eval7.HandRange by randomly selecting hands based on their weights
-        
-        For each hand in the range dictionary:
-        - Generate random number between 0-1
-        - If random number < weight, include the hand in the range
-        - Otherwise, exclude it
-        """
-        selected_hands = []
-        
-        for hand, weight in range_dict.items():
-            # Generate a random number and compare to weight
-            if random.random() < weight:
-                selected_hands.append(hand)
-        
-        # If no hands were selected (unlikely but possible), add a default hand
-        if not selected_hands:
-            selected_hands = ["AA", "KK", "QQ"]
-            
-        # Create range string and convert to eval7.HandRange
-        range_str = ",".join(selected_hands)
-        try:
-            return eval7.HandRange(range_str)
-        except Exception as e:
-            print(f"Error creating HandRange from string '{range_str}': {e}")
-            # Fallback to a minimal range
-            return eval7.HandRange("AA")
-    
     def convert_card(self, card: PokerCard) -> Optional[eval7.Card]:
         """
         Convert app's Card object to eval7.Card
@@ -177,42 +199,20 @@ class EquityCalculator:
     
     def estimate_villain_range(self, preflop_pot_type: str, 
                                hero_position: str,
-                               board_cards: List[PokerCard]) -> Tuple[eval7.HandRange, str]:
+                               board_cards: List[PokerCard]) -> Tuple[ComboRange, str]:
         """
         Estimate villain's range based on preflop pot type, positions, and actions
         
         Returns:
-            Tuple of (HandRange object, description string)
+            Tuple of (ComboRange with every combo and its weight, description string)
         """
-        # Convert board cards to eval7 format
-        board = [self.convert_card(card) for card in board_cards]
-        board = [card for card in board if card is not None]
-        
         # Get the appropriate range key
         range_key = self._determine_range_key(preflop_pot_type, hero_position)
         
-        # Try creating a very simple range first as a test
-        try:
-            test_range = eval7.HandRange("AA,KK")
-        except Exception as e:
-            print(f"ERROR creating test range: {e}")
-            # If basic range creation fails, use simplest possible range
-            return eval7.HandRange("AA"), "Default range (test failed)"
-        
-        # Get the base range dictionary with weights
-        if range_key in self.raw_ranges:
-            base_range_dict = self.raw_ranges[range_key]
-            description = f"Based on preflop action ({range_key.replace('_', ' ')})"
-        else:
-            # Fallback to a reasonable default range
-            base_range_dict = {"AA": 1.0, "KK": 1.0, "QQ": 1.0, "JJ": 1.0, "TT": 1.0, 
-                              "AK": 1.0, "AQ": 1.0, "AJ": 1.0, "KQ": 1.0}
-            description = "Default range (preflop pattern not recognized)"
-        
-        # Create a weighted range using our RNG method
-        weighted_range = self._create_weighted_range(base_range_dict)
-        
-        return weighted_range, description
+        if range_key in self.ranges:
+            return self.ranges[range_key], f"Based on preflop action ({range_key.replace('_', ' ')})"
+        # Fallback to a reasonable default range
+        return self.default_range, "Default range (preflop pattern not recognized)"
     
     def calculate_equity(self, 
                           hero_cards: List[PokerCard], 
@@ -228,10 +228,13 @@ class EquityCalculator:
             board_cards: List of Card objects
             preflop_pot_type: String like "2_bet_pot", "3_bet_pot", "4_bet_pot"
             hand_history: Optional hand history object
-            iterations: Number of Monte Carlo simulations to run
+            iterations: Number of Monte Carlo simulations to run when the situation is
+                too large to enumerate exactly
             
         Returns:
-            Dictionary with equity calculation results
+            Dictionary with equity calculation results: 'method' is 'exact' or
+            'monte_carlo' or 'table' (flop lookup), 'std_error' the standard error of
+            the equity (0 when exact)
         """
         print(f"\n=== CALCULATING EQUITY ===")
         print(f"Hero cards: {[f'{c.rank}{c.suit}' for c in hero_cards]}")
@@ -260,27 +263,59 @@ class EquityCalculator:
         if len(hero_hand) != 2:
             print(f"ERROR: Invalid hero hand - need exactly 2 cards, got {len(hero_hand)}")
             return {"error": "Invalid hero hand"}
+
+        # Estimate villain's range
+        villain_range, range_description = self.estimate_villain_range(
+            preflop_pot_type, 
+            hero_position, 
+            board_cards
+        )
+        print(f"Villain range description: {range_description}")
+
+        # The same situation up to suit isomorphism was already computed, e.g. earlier this street
+        cache_key = EquityCache.key(villain_range.name, villain_range.digest,
+                                    [str(c) for c in hero_hand], [str(c) for c in board])
+        cached = self.cache.get(cache_key, iterations)
+        if cached is not None:
+            print(f"Equity result: {cached['equity'] * 100:.2f}% (cached, {cached['method']})")
+            return cached
+
+        # Flops: one lookup in the precomputed tables, sampling only for what they lack
+        if len(board) == 3:
+            equity = self.flop_table.lookup(villain_range.name, [str(c) for c in hero_hand], [str(c) for c in board])
+            if equity is not None:
+                std_error = math.sqrt(equity * (1 - equity) / self.flop_table.iterations)
+                print(f"Equity result: {equity * 100:.2f}% (flop table vs full {villain_range.name} range)")
+                result = {
+                    "equity": equity,
+                    "villain_range": str(villain_range),
+                    "range_description": range_description,
+                    "iterations": self.flop_table.iterations,
+                    "method": "table",
+                    "std_error": std_error
+                }
+                self.cache.put(cache_key, result)
+                return result
             
         try:
-            # Estimate villain's range
-            villain_range, range_description = self.estimate_villain_range(
-                preflop_pot_type, 
-                hero_position, 
-                board_cards
-            )
-            
-            print(f"Villain range description: {range_description}")
-            print(f"Calculating equity with {iterations} iterations...")
-            
-            # Calculate equity
-            equity = eval7.py_hand_vs_range_monte_carlo(
-                hero_hand,
-                villain_range,
-                board,
-                iterations
-            )
+            # Enumerate every runout when that is cheap enough (turn, river), sample otherwise
+            live_combos = int(villain_range.live(hero_hand + board).sum())
+            runouts = math.comb(52 - len(hero_hand) - len(board), 5 - len(board))
+            evaluations = live_combos * runouts
+            if len(board) >= 3 and live_combos and evaluations <= self.exact_budget:
+                method = "exact"
+                print(f"Calculating exact equity over {live_combos} combos x {runouts} runouts...")
+                equity = villain_range.exact_equity(hero_hand, board)
+                iterations = evaluations
+                std_error = 0.0
+            else:
+                method = "monte_carlo"
+                print(f"Calculating equity with {iterations} iterations...")
+                equity = villain_range.monte_carlo_equity(hero_hand, board, iterations)
+                # Each iteration scores 1, 1/2 or 0; ties only lower the variance, so this is an upper bound
+                std_error = math.sqrt(equity * (1 - equity) / iterations)
             
-            print(f"Equity result: {equity * 100:.2f}%")
+            print(f"Equity result: {equity * 100:.2f}% (+/- {std_error * 100:.2f}%)")
             
             # Format equity info for display
             equity_info = f"\n=== EQUITY CALCULATION RESULT ===\n"
@@ -288,19 +323,77 @@ class EquityCalculator:
             equity_info += f"Board: {[str(card) for card in board]}\n"
             equity_info += f"Equity vs. range: {equity * 100:.2f}%\n"
             equity_info += f"Villain range: {range_description}\n"
-            equity_info += f"Based on {iterations} Monte Carlo simulations\n"
+            if method == "exact":
+                equity_info += f"Exact over {iterations} combo x runout evaluations\n"
+            else:
+                equity_info += f"Based on {iterations} Monte Carlo simulations (std. error {std_error * 100:.2f}%)\n"
             
             print(equity_info)
             
-            return {
+            result = {
                 "equity": equity,
                 "villain_range": str(villain_range),
                 "range_description": range_description,
-                "iterations": iterations
+                "iterations": iterations,
+                "method": method,
+                "std_error": std_error
             }
+            self.cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             import traceback
             print(f"Error calculating equity: {e}")
             print(traceback.format_exc())
-            return {"error": str(e)}
\ No newline at end of file
+            return {"error": str(e)}
+
+    def _combo_range(self, villain_range) -> ComboRange:
+        if isinstance(villain_range, ComboRange):
+            return villain_range
+        if villain_range not in self.ranges:
+            raise ValueError(f"Unknown range '{villain_range}', expected one of {sorted(self.ranges)}")
+        return self.ranges[villain_range]
+
+    def _card_indices(self, cards: List[PokerCard]) -> List[int]:
+        converted = [self.convert_card(card) for card in cards]
+        return [card_index(str(card)) for card in converted if card is not None]
+
+    def hand_vs_range_equity(self, hero_cards: List[PokerCard], board_cards: List[PokerCard], villain_range,
+                             max_runouts: int = MAX_RUNOUTS, seed: int = 0) -> float:
+        """
+        Equity of hero's hand against a whole weighted range, scored in batches
+        by the vectorized evaluator instead of one eval7 call per hand
+
+        Args:
+            hero_cards: Hero's two cards
+            board_cards: 0 to 5 board cards
+            villain_range: Range key such as "bb_call", or a ComboRange
+            max_runouts: Runouts sampled (with `seed`) when there are more, e.g. preflop
+
+        Returns:
+            Hero's equity
+        """
+        combo_range = self._combo_range(villain_range)
+        return hand_evaluator.hand_vs_range(self._card_indices(hero_cards), self._card_indices(board_cards),
+                                            combo_range.cards, combo_range.weights, max_runouts, seed)
+
+    def range_vs_range_equity(self, hero_range, villain_range, board_cards: List[PokerCard],
+                              max_runouts: int = RANGE_VS_RANGE_RUNOUTS, seed: int = 0) -> Tuple[float, Dict[str, float]]:
+        """
+        Equity of one weighted range against another on a board
+
+        Args:
+            hero_range: Range key or ComboRange of the player whose equity is returned
+            villain_range: Range key or ComboRange of the opponent
+            board_cards: 0 to 5 board cards
+            max_runouts: Runouts sampled (with `seed`) when there are more
+
+        Returns:
+            Tuple of (hero range's equity, equity of each hero combo such as "AsKs")
+        """
+        hero, villain = self._combo_range(hero_range), self._combo_range(villain_range)
+        equity, per_combo = hand_evaluator.range_vs_range(hero.cards, hero.weights, villain.cards, villain.weights,
+                                                          self._card_indices(board_cards), max_runouts, seed)
+        combo_equities = {card_name(c1) + card_name(c2): float(e)
+                          for (c1, c2), e in zip(hero.cards, per_combo) if not math.isnan(e)}
+        return equity, combo_equities
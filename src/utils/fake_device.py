@@ -0,0 +1,50 @@
+# src/utils/fake_device.py
+import cv2
+from typing import List, Optional, Tuple
+from src.utils.frame_stream import ReplayStream, open_replay_stream
+
+class FakeDevice:
+    """
+    Stand-in for a ppadb device that replays screenshots from disk.
+
+    screencap() returns the next frame PNG-encoded like the real device, shell()
+    records commands (e.g. 'input tap x y') instead of sending them, and
+    open_frame_stream() feeds the 'stream' capture backend. Frames come from a
+    directory of PNGs or a video file.
+    """
+
+    def __init__(self, frames_dir: str, fps: float = 10.0, loop: bool = True):
+        self.frames_dir = frames_dir
+        self.fps = fps
+        self.loop = loop
+        self.serial = f"fake:{frames_dir}"
+        self.commands: List[str] = []
+        self._frames = open_replay_stream(frames_dir, fps=None, loop=loop)
+
+    def screencap(self) -> bytes:
+        image = self._frames.next_image()
+        if image is None:
+            raise EOFError(f"Replay of {self.frames_dir} finished")
+        return cv2.imencode('.png', image)[1].tobytes()
+
+    @property
+    def current_frame(self) -> Optional[str]:
+        """Name of the frame the last screencap() returned"""
+        return self._frames.current_name
+
+    def shell(self, cmd: str, handler=None, timeout=None) -> str:
+        self.commands.append(cmd)
+        return ""
+
+    @property
+    def taps(self) -> List[Tuple[int, int]]:
+        """Coordinates of every 'input tap' sent so far"""
+        taps = []
+        for cmd in self.commands:
+            parts = cmd.split()
+            if parts[:2] == ['input', 'tap'] and len(parts) == 4:
+                taps.append((int(parts[2]), int(parts[3])))
+        return taps
+
+    def open_frame_stream(self) -> ReplayStream:
+        return open_replay_stream(self.frames_dir, fps=self.fps, loop=self.loop)
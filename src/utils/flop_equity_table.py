@@ -0,0 +1,109 @@
+# src/utils/flop_equity_table.py
+import os
+import json
+import itertools
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from src.utils.hand_evaluator import card_index
+
+TABLES_DIR = 'equity_tables'
+FLOPS_FILE = 'flops.npy'
+META_FILE = 'meta.json'
+
+# Hero combos per flop row, in itertools.combinations(range(52), 2) order
+NUM_COMBOS = 1326
+
+SUIT_PERMUTATIONS = list(itertools.permutations(range(4)))
+
+def _combo_indices() -> np.ndarray:
+    indices = np.full((52, 52), -1, dtype=np.int16)
+    for i, (a, b) in enumerate(itertools.combinations(range(52), 2)):
+        indices[a, b] = indices[b, a] = i
+    return indices
+
+COMBO_INDEX = _combo_indices()
+
+def canonical_flop(flop: List[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Suit-isomorphic representative of a flop
+
+    Returns:
+        (canonical flop cards sorted high to low, suit permutation mapping the flop onto it)
+    """
+    best, best_permutation = None, None
+    for permutation in SUIT_PERMUTATIONS:
+        mapped = tuple(sorted((c - c % 4 + permutation[c % 4] for c in flop), reverse=True))
+        if best is None or mapped < best:
+            best, best_permutation = mapped, permutation
+    return best, best_permutation
+
+def canonical_flops() -> List[Tuple[int, ...]]:
+    """The 1,755 strategically distinct flops, in table row order"""
+    return sorted({canonical_flop(list(flop))[0] for flop in itertools.combinations(range(52), 3)})
+
+def table_path(tables_dir: str, range_key: str) -> str:
+    return os.path.join(tables_dir, f'flop_equity_{range_key}.npy')
+
+class FlopEquityTable:
+    """
+    Precomputed flop equity of every hero combo against each preflop range.
+
+    One memory-mapped float16 array per range (canonical flop x hero combo), built
+    offline by tools/build_flop_tables.py. Hero cards are mapped with the same suit
+    permutation as the flop, so a lookup is a canonicalization plus one read.
+    Entries the builder has not filled in (NaN) are misses.
+    """
+
+    def __init__(self, tables_dir: str = TABLES_DIR, range_digests: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            tables_dir (str): Output directory of tools/build_flop_tables.py
+            range_digests (Dict[str, str]): Range key -> ComboRange.digest of the ranges in use;
+                tables built from other weights are not loaded. None loads every table
+        """
+        self.tables_dir = tables_dir
+        self.tables: Dict[str, np.ndarray] = {}
+        self.iterations = 0
+        flops_path = os.path.join(tables_dir, FLOPS_FILE)
+        if not os.path.isfile(flops_path):
+            return
+        self.flop_rows = {tuple(int(c) for c in flop): row for row, flop in enumerate(np.load(flops_path))}
+        with open(os.path.join(tables_dir, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.iterations = meta['iterations']
+        built_digests = meta.get('digests', {})
+        for name in os.listdir(tables_dir):
+            if name.startswith('flop_equity_') and name.endswith('.npy'):
+                range_key = name[len('flop_equity_'):-len('.npy')]
+                if range_digests is not None and built_digests.get(range_key) != range_digests.get(range_key):
+                    print(f"Warning: Flop equity table {name} was built from other '{range_key}' weights, "
+                          f"ignoring it (rebuild with tools/build_flop_tables.py)")
+                    continue
+                self.tables[range_key] = np.load(os.path.join(tables_dir, name), mmap_mode='r')
+
+    def __contains__(self, range_key: str) -> bool:
+        return range_key in self.tables
+
+    def lookup(self, range_key: str, hero: List[str], flop: List[str]) -> Optional[float]:
+        """
+        Args:
+            range_key (str): Villain range, e.g. 'bb_call'
+            hero (List[str]): Hero's two cards, e.g. ['Jh', '6h']
+            flop (List[str]): The three flop cards
+
+        Returns:
+            float: Hero's equity, None if the table does not have it
+        """
+        table = self.tables.get(range_key)
+        if table is None:
+            return None
+        canonical, permutation = canonical_flop([card_index(c) for c in flop])
+        row = self.flop_rows.get(canonical)
+        if row is None:
+            return None
+        a, b = (c - c % 4 + permutation[c % 4] for c in (card_index(c) for c in hero))
+        combo = COMBO_INDEX[a, b]
+        if combo < 0:
+            return None
+        equity = float(table[row, combo])
+        return None if np.isnan(equity) else equity
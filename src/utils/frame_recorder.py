@@ -0,0 +1,248 @@
+# src/utils/frame_recorder.py
+import os
+import json
+import time
+import queue
+import hashlib
+import threading
+import cv2
+import numpy as np
+from typing import Dict, Iterator, Optional, Tuple
+from src.models.card import Card
+from src.detector.table_frame import TableFrame
+from src.detector.table_geometry import TABLE_REGIONS
+from src.utils.screen_capture import RawFrame
+from src.utils.frame_stream import ReplayStream
+
+ARCHIVE_INDEX = 'index.jsonl'
+REGION_DIR = 'regions'
+
+# Every region the detectors read, action strip included. The next-hand search area
+# (the bottom half of the screen) would make every frame nearly full size; it is only
+# stored, as a transient region, on the ticks that found the button
+RECORDED_REGIONS = [name for name in TABLE_REGIONS if name != 'next_hand']
+TRANSIENT_REGIONS = ['next_hand']
+
+def to_json(value):
+    """Table state -> JSON-safe values: cards as 'Jh', tuples as lists, NumPy scalars as Python numbers"""
+    if isinstance(value, Card):
+        return f"{value.rank}{value.suit}"
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _snapshot(frame: TableFrame, box) -> Tuple[np.ndarray, bool]:
+    """
+    (pixels, is_rgba) of a box. Every capture backend hands the tick a frame it owns
+    (the stream copies its ring slot), so a view is enough; RawFrame boxes stay raw
+    RGBA and are converted by the writer thread
+    """
+    x1, y1, x2, y2 = box
+    if isinstance(frame.screen, RawFrame):
+        return frame.screen.rgba[y1:y2, x1:x2], True
+    return frame.screen[y1:y2, x1:x2], False
+
+class FrameRecorder:
+    """
+    Records live ticks into a compact replay archive on a background writer thread.
+
+    Only the table regions are stored. Each distinct region crop is written once as
+    regions/<hash>.png, and index.jsonl holds one line per tick with the decoded
+    state, the action and the regions whose hash changed since the previous tick.
+    record() only slices the frame and enqueues it; when the writer falls behind,
+    ticks are dropped rather than slowing the bot down.
+
+    The crops are pinned with snapshot() right after capture, so each index line
+    pairs the tick's state and action with exactly the pixels it was decided on.
+    """
+
+    def __init__(self, archive_dir: str, max_pending: int = 32):
+        """
+        Args:
+            archive_dir (str): Output directory, e.g. logs/session_*/frames
+            max_pending (int): Ticks queued for the writer before new ones are dropped
+        """
+        self.archive_dir = archive_dir
+        os.makedirs(os.path.join(archive_dir, REGION_DIR), exist_ok=True)
+        self.queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self.stats = {'recorded': 0, 'dropped': 0, 'regions_written': 0, 'bytes_written': 0}
+        self._tick = 0
+        self._known_hashes = set(h[:-4] for h in os.listdir(os.path.join(archive_dir, REGION_DIR)))
+        self._last_regions: Dict[str, Tuple] = {}
+        self._index = open(os.path.join(archive_dir, ARCHIVE_INDEX), 'a', encoding='utf-8')
+        self.thread = threading.Thread(target=self._run, name="frame-recorder", daemon=True)
+        self.thread.start()
+
+    def snapshot(self, frame: TableFrame) -> Dict:
+        """
+        Region crops of a frame, taken as soon as it is captured
+
+        Args:
+            frame (TableFrame): Frame the tick runs on
+
+        Returns:
+            Dict: Capture time, frame size and (box, pixels, is_rgba) per region, for record()
+        """
+        boxes = {name: frame.region_box(name) for name in RECORDED_REGIONS + TRANSIENT_REGIONS}
+        return {
+            'timestamp': time.time(),
+            'shape': list(frame.shape[:2]),
+            'crops': {name: (box, *_snapshot(frame, box)) for name, box in boxes.items()},
+        }
+
+    def record(self, snapshot: Dict, tick: Dict):
+        """
+        Queue one tick for the writer
+
+        Args:
+            snapshot (Dict): From snapshot() on the frame the tick ran on
+            tick (Dict): PokerDetectorApp.last_tick (next_hand, hero_turn, state, action)
+        """
+        index = self._tick
+        self._tick += 1
+        crops = {name: crop for name, crop in snapshot['crops'].items()
+                 if name not in TRANSIENT_REGIONS or tick.get('next_hand')}
+        item = {
+            'tick': index,
+            'timestamp': snapshot['timestamp'],
+            'shape': snapshot['shape'],
+            'crops': crops,
+            'next_hand': tick.get('next_hand', False),
+            'hero_turn': tick.get('hero_turn', False),
+            'state': tick.get('state'),
+            'action': tick.get('action'),
+        }
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.stats['dropped'] += 1
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._write(item)
+            except Exception as e:
+                print(f"Frame recorder error: {e}")
+
+    def _write(self, item: Dict):
+        changed, transient = {}, {}
+        for name, (box, pixels, is_rgba) in item['crops'].items():
+            if pixels.size == 0:
+                continue
+            if is_rgba:
+                pixels = cv2.cvtColor(np.ascontiguousarray(pixels), cv2.COLOR_RGBA2BGR)
+            digest = hashlib.blake2b(np.ascontiguousarray(pixels).data, digest_size=12).hexdigest()
+            entry = (digest, *box)
+            if name in TRANSIENT_REGIONS:
+                transient[name] = list(entry)
+            elif self._last_regions.get(name) == entry:
+                continue
+            else:
+                self._last_regions[name] = entry
+                changed[name] = list(entry)
+            if digest not in self._known_hashes:
+                encoded = cv2.imencode('.png', pixels)[1]
+                with open(os.path.join(self.archive_dir, REGION_DIR, f'{digest}.png'), 'wb') as f:
+                    f.write(encoded.tobytes())
+                self._known_hashes.add(digest)
+                self.stats['regions_written'] += 1
+                self.stats['bytes_written'] += encoded.nbytes
+
+        action = item['action']
+        record = {
+            'tick': item['tick'],
+            'timestamp': item['timestamp'],
+            'shape': item['shape'],
+            'regions': changed,
+            'transient': transient,
+            'next_hand': item['next_hand'],
+            'hero_turn': bool(item['hero_turn']),
+            'state': to_json(item['state']),
+            'action': to_json({k: v for k, v in action.items() if k != 'reasoning'}) if action else None,
+        }
+        self._index.write(json.dumps(record) + '\n')
+        self._index.flush()
+        self.stats['recorded'] += 1
+
+    def format_stats(self) -> str:
+        return (f"{self.stats['recorded']} ticks recorded, {self.stats['dropped']} dropped, "
+                f"{self.stats['regions_written']} unique regions ({self.stats['bytes_written'] / 1024:.0f} KiB)")
+
+    def close(self):
+        """Write everything still queued, then stop the writer"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self._index.close()
+
+class FrameArchive:
+    """Reads a FrameRecorder archive back as full-size frames"""
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(archive_dir, ARCHIVE_INDEX)
+        if not os.path.isfile(self.index_path):
+            raise FileNotFoundError(f"No {ARCHIVE_INDEX} in {archive_dir}")
+
+    @staticmethod
+    def is_archive(path: str) -> bool:
+        return os.path.isfile(os.path.join(path, ARCHIVE_INDEX))
+
+    def records(self) -> Iterator[Dict]:
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def frames(self) -> Iterator[Tuple[Dict, np.ndarray]]:
+        """
+        (record, BGR frame) per tick. Regions carried over from earlier ticks, then the
+        tick's transient regions, are pasted onto a black screen; everything outside the
+        recorded regions stays black
+        """
+        regions: Dict[str, list] = {}
+        crops: Dict[str, np.ndarray] = {}
+        for record in self.records():
+            regions.update(record['regions'])
+            image = np.zeros((*record['shape'], 3), dtype=np.uint8)
+            pasted = list(regions.values()) + list(record.get('transient', {}).values())
+            for digest, x1, y1, x2, y2 in pasted:
+                if digest not in crops:
+                    crops[digest] = cv2.imread(os.path.join(self.archive_dir, REGION_DIR, f'{digest}.png'))
+                image[y1:y2, x1:x2] = crops[digest]
+            yield record, image
+
+class ArchiveReplayStream(ReplayStream):
+    """Replays a FrameRecorder archive, e.g. through FakeDevice and tools/replay.py"""
+
+    def __init__(self, archive_dir: str, fps: float = 10.0, loop: bool = True):
+        super().__init__(fps, loop)
+        self.archive = FrameArchive(archive_dir)
+        self._frames = self.archive.frames()
+        self.position = 0
+        first = next(self.archive.frames(), None)
+        if first is None:
+            raise FileNotFoundError(f"No frames recorded in {archive_dir}")
+        self.shape = (first[1].shape[0], first[1].shape[1], 4)
+
+    @property
+    def current_name(self) -> Optional[str]:
+        return f"tick {self._record['tick']}" if self.position else None
+
+    def next_image(self) -> Optional[np.ndarray]:
+        frame = next(self._frames, None)
+        if frame is None and self.loop:
+            self._frames = self.archive.frames()
+            frame = next(self._frames, None)
+        if frame is None:
+            return None
+        self._record, image = frame
+        self.position += 1
+        return image
@@ -0,0 +1,313 @@
+# src/utils/frame_stream.py
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+from src.utils.screen_capture import RawFrame, RawScreenCapture
+
+class FrameRingBuffer:
+    """
+    Fixed number of preallocated RGBA frames written round-robin by one producer.
+
+    A frame returned by `latest()` is a view into the buffer: it stays valid until
+    `capacity - 1` newer frames have been written. Consumers that keep a frame for
+    longer than that (a whole tick) take it with `copy_latest()` instead.
+    """
+
+    def __init__(self, capacity: int, shape: Tuple[int, int, int]):
+        if capacity < 2:
+            raise ValueError("Ring buffer needs at least 2 slots")
+        self.capacity = capacity
+        self.frames = [np.empty(shape, dtype=np.uint8) for _ in range(capacity)]
+        self.timestamps = [0.0] * capacity
+        self._lock = threading.Lock()
+        self._latest_seq = -1
+        self._new_frame = threading.Condition(self._lock)
+
+    def next_slot(self) -> np.ndarray:
+        """Slot the producer should fill next; never the one consumers currently see"""
+        return self.frames[(self._latest_seq + 1) % self.capacity]
+
+    def publish(self):
+        """Mark the slot returned by next_slot() as the newest frame"""
+        with self._lock:
+            self._latest_seq += 1
+            self.timestamps[self._latest_seq % self.capacity] = time.time()
+            self._new_frame.notify_all()
+
+    @property
+    def latest_seq(self) -> int:
+        return self._latest_seq
+
+    def latest(self) -> Tuple[int, float, Optional[np.ndarray]]:
+        """Non-blocking: (sequence number, capture time, frame) of the newest frame, or (-1, 0, None)"""
+        with self._lock:
+            seq = self._latest_seq
+        if seq < 0:
+            return -1, 0.0, None
+        index = seq % self.capacity
+        return seq, self.timestamps[index], self.frames[index]
+
+    def copy_latest(self, out: np.ndarray) -> Tuple[int, float]:
+        """
+        Copy the newest frame into a buffer the caller owns
+
+        The producer only ever writes the slot after the newest one, so the copied
+        slot is intact unless `capacity - 1` frames were published meanwhile; the
+        copy is retried with the then newest frame if that happened.
+
+        Returns:
+            Tuple[int, float]: (sequence number, capture time) of the copied frame, or (-1, 0)
+        """
+        while True:
+            seq, timestamp, frame = self.latest()
+            if frame is None:
+                return -1, 0.0
+            np.copyto(out, frame)
+            if self._latest_seq - seq < self.capacity - 1:
+                return seq, timestamp
+
+    def wait_for(self, seq: int, timeout: float) -> bool:
+        """Block until a frame newer than `seq` is published"""
+        with self._new_frame:
+            return self._new_frame.wait_for(lambda: self._latest_seq > seq, timeout)
+
+class AdbFramebufferStream:
+    """
+    One persistent ADB connection streaming raw framebuffers back to back.
+
+    Runs `screencap` in a device-side loop over a single exec: stream, so there is
+    no per-frame shell setup and no PNG encode/decode.
+    """
+
+    STREAM_COMMAND = "exec:sh -c 'while true; do screencap; done'"
+
+    def __init__(self, device):
+        self.device = device
+        sdk = int(device.shell("getprop ro.build.version.sdk").strip() or 0)
+        # Android 9+ appends a colour space word to the width/height/format header
+        self.header_size = 16 if sdk >= 28 else 12
+        self.conn = device.create_connection()
+        self.conn.send(self.STREAM_COMMAND)
+        self._header = bytearray(self.header_size)
+        self._read_header()
+        self._header_pending = False
+
+    def _recv_exact_into(self, view: memoryview):
+        while len(view):
+            received = self.conn.socket.recv_into(view)
+            if received == 0:
+                raise EOFError("Frame stream closed by device")
+            view = view[received:]
+
+    def _read_header(self):
+        self._recv_exact_into(memoryview(self._header))
+        width, height, pixel_format = np.frombuffer(self._header, '<u4', count=3)
+        if pixel_format != RawScreenCapture.RGBA_8888:
+            raise ValueError(f"Unsupported framebuffer pixel format: {pixel_format}")
+        self.shape = (int(height), int(width), 4)
+
+    def frame_shape(self) -> Tuple[int, int, int]:
+        return self.shape
+
+    def read_frame_into(self, out: np.ndarray) -> bool:
+        # Header first: reading the next one after the pixels would hold every frame
+        # back until the following screencap starts writing
+        if self._header_pending:
+            self._read_header()
+        self._recv_exact_into(memoryview(out).cast('B'))
+        self._header_pending = True
+        return True
+
+    def close(self):
+        self.conn.close()
+
+class ReplayStream(ABC):
+    """
+    Base of the fake-device stand-ins that replay recorded screenshots as a frame stream.
+
+    Lets the streaming capture, and anything reading from it, run without an emulator.
+    Subclasses provide next_image() and set self.shape.
+    """
+
+    def __init__(self, fps: float = 10.0, loop: bool = True):
+        self.fps = fps
+        self.loop = loop
+        self.shape: Tuple[int, int, int] = (0, 0, 4)
+        self._last_frame_time = 0.0
+
+    def frame_shape(self) -> Tuple[int, int, int]:
+        return self.shape
+
+    @abstractmethod
+    def next_image(self) -> Optional[np.ndarray]:
+        """Next BGR frame in replay order, or None once the sequence ends"""
+
+    def read_frame_into(self, out: np.ndarray) -> bool:
+        if self.fps:
+            wait = self._last_frame_time + 1.0 / self.fps - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_frame_time = time.monotonic()
+
+        image = self.next_image()
+        if image is None:
+            return False
+
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGBA, dst=out)
+        return True
+
+    def close(self):
+        pass
+
+class PngReplayStream(ReplayStream):
+    """Replays the PNG screenshots of a directory in file name order"""
+
+    def __init__(self, directory: str, fps: float = 10.0, loop: bool = True):
+        super().__init__(fps, loop)
+        self.paths = self.list_frames(directory)
+        if not self.paths:
+            raise FileNotFoundError(f"No PNG frames found in {directory}")
+        self.position = 0
+
+        first = cv2.imread(self.paths[0])
+        self.shape = (first.shape[0], first.shape[1], 4)
+
+    @staticmethod
+    def list_frames(directory: str) -> List[str]:
+        return sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith('.png')
+        )
+
+    @property
+    def current_name(self) -> Optional[str]:
+        """File name of the frame returned last"""
+        return os.path.basename(self.paths[self.position - 1]) if self.position else None
+
+    def next_image(self) -> Optional[np.ndarray]:
+        """Next readable BGR frame in replay order, or None once the sequence ends"""
+        while self.paths:
+            if self.position >= len(self.paths):
+                if not self.loop:
+                    return None
+                self.position = 0
+
+            path = self.paths[self.position]
+            image = cv2.imread(path)
+            if image is not None and image.shape[:2] == self.shape[:2]:
+                self.position += 1
+                return image
+
+            # Drop it so looping replays do not warn about the same file again
+            print(f"Warning: Skipping frame {path} (unreadable or wrong size)")
+            del self.paths[self.position]
+        return None
+
+class VideoReplayStream(ReplayStream):
+    """Replays the frames of a screen recording (any container OpenCV can decode)"""
+
+    def __init__(self, path: str, fps: float = 10.0, loop: bool = True):
+        super().__init__(fps, loop)
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        ok, first = self.capture.read()
+        if not ok:
+            raise FileNotFoundError(f"No frames could be decoded from {path}")
+        self.shape = (first.shape[0], first.shape[1], 4)
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.position = 0
+
+    @property
+    def current_name(self) -> Optional[str]:
+        return f"{os.path.basename(self.path)}#{self.position - 1}" if self.position else None
+
+    def next_image(self) -> Optional[np.ndarray]:
+        ok, image = self.capture.read()
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.position = 0
+            ok, image = self.capture.read()
+        if not ok:
+            return None
+        self.position += 1
+        return image
+
+    def close(self):
+        self.capture.release()
+
+def open_replay_stream(path: str, fps: float = 10.0, loop: bool = True) -> ReplayStream:
+    """
+    ArchiveReplayStream for a FrameRecorder archive, PngReplayStream for a directory
+    of screenshots, VideoReplayStream for a video file
+    """
+    from src.utils.frame_recorder import ArchiveReplayStream, FrameArchive
+    if FrameArchive.is_archive(path):
+        return ArchiveReplayStream(path, fps=fps, loop=loop)
+    if os.path.isdir(path):
+        return PngReplayStream(path, fps=fps, loop=loop)
+    return VideoReplayStream(path, fps=fps, loop=loop)
+
+class StreamingScreenCapture:
+    """Background thread pulling frames from a stream source into a ring buffer"""
+
+    def __init__(self, source, capacity: int = 4):
+        """
+        Args:
+            source: AdbFramebufferStream, a ReplayStream or anything with
+                    frame_shape(), read_frame_into(out) and close()
+            capacity (int): Number of preallocated frames in the ring buffer
+        """
+        self.source = source
+        self.buffer = FrameRingBuffer(capacity, source.frame_shape())
+        self.stop_event = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="frame-stream", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            while not self.stop_event.is_set():
+                if not self.source.read_frame_into(self.buffer.next_slot()):
+                    break
+                self.buffer.publish()
+        except Exception as e:
+            if not self.stop_event.is_set():
+                self.error = e
+                print(f"Frame stream stopped: {e}")
+        finally:
+            self.stop_event.set()
+
+    def latest_frame(self) -> Optional[RawFrame]:
+        """
+        Copy of the newest frame without blocking, or None if nothing has arrived yet
+
+        The copy belongs to the caller: the producer keeps overwriting ring slots
+        while a tick runs, and RawFrame converts its pixels lazily region by region.
+        """
+        frame = np.empty(self.buffer.frames[0].shape, dtype=np.uint8)
+        seq, _ = self.buffer.copy_latest(frame)
+        return RawFrame(frame) if seq >= 0 else None
+
+    def latest_frame_info(self) -> Tuple[int, float]:
+        """(sequence number, capture timestamp) of the newest frame"""
+        seq, timestamp, _ = self.buffer.latest()
+        return seq, timestamp
+
+    def capture(self, timeout: float = 5.0) -> RawFrame:
+        """Same interface as the other backends; only waits until the first frame exists"""
+        if self.error is not None:
+            raise RuntimeError(f"Frame stream failed: {self.error}")
+        if self.buffer.latest_seq < 0 and not self.buffer.wait_for(-1, timeout):
+            raise RuntimeError(f"No frame received from stream: {self.error}")
+        return self.latest_frame()
+
+    def stop(self):
+        self.stop_event.set()
+        try:
+            self.source.close()
+        finally:
+            self.thread.join(timeout=2.0)
@@ -0,0 +1,245 @@
+# src/utils/hand_evaluator.py
+import itertools
+import math
+import numpy as np
+from typing import List, Tuple
+
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+# Hand categories, the top bits of a score; higher scores win
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORY_NAMES = ['High Card', 'Pair', 'Two Pair', 'Three of a Kind', 'Straight', 'Flush',
+                  'Full House', 'Four of a Kind', 'Straight Flush']
+CATEGORY_SHIFT = 24
+
+def card_index(card: str) -> int:
+    """'As' -> 0..51, rank-major so that card // 4 is the rank and card % 4 the suit"""
+    return RANKS.index(card[0].upper()) * 4 + SUITS.index(card[1].lower())
+
+def card_name(index: int) -> str:
+    return RANKS[index // 4] + SUITS[index % 4]
+
+def _rank_tables():
+    """Lookup tables over 13-bit rank masks"""
+    masks = np.arange(1 << 13)
+    bits = (masks[:, None] >> np.arange(13)) & 1
+    popcount = bits.sum(axis=1)
+    highest = np.where(masks > 0, np.floor(np.log2(np.maximum(masks, 1))), 0).astype(np.int32)
+
+    # Mask keeping only the k highest ranks, and those ranks packed 4 bits each, highest first
+    top = {k: np.zeros(1 << 13, dtype=np.int32) for k in (1, 2, 3, 5)}
+    packed = np.zeros(1 << 13, dtype=np.int32)
+    for mask in range(1 << 13):
+        ranks = [r for r in range(12, -1, -1) if mask >> r & 1]
+        for k in top:
+            top[k][mask] = sum(1 << r for r in ranks[:k])
+        packed[mask] = sum(r << (16 - 4 * i) for i, r in enumerate(ranks[:5]))
+
+    # Highest straight in a rank mask plus one, 0 without a straight; the wheel is 5-high
+    straight = np.zeros(1 << 13, dtype=np.int32)
+    runs = [(high, sum(1 << r for r in range(high - 4, high + 1))) for high in range(4, 13)]
+    runs.insert(0, (3, 0b1000000001111))
+    for high, run in runs:
+        straight[(masks & run) == run] = high + 1
+    return popcount.astype(np.int32), highest, top, packed, straight
+
+POPCOUNT, HIGHEST, TOP, PACKED, STRAIGHT_HIGH = _rank_tables()
+
+def evaluate(cards: np.ndarray) -> np.ndarray:
+    """
+    Score many 7-card hands in one call
+
+    Rank counts, per-suit rank masks and 13-bit lookup tables replace per-hand
+    branching, so an (N, 7) array of card indices is scored with a fixed number
+    of NumPy operations.
+
+    Args:
+        cards (np.ndarray): (..., 7) card indices from card_index()
+
+    Returns:
+        np.ndarray: int32 scores of the same leading shape, higher is better,
+            category in the bits from CATEGORY_SHIFT up
+    """
+    cards = np.asarray(cards)
+    shape = cards.shape[:-1]
+    cards = cards.reshape(-1, cards.shape[-1])
+    ranks, suits = cards >> 2, cards & 3
+    rank_bits = (1 << ranks).astype(np.int32)
+
+    # Ranks held in each suit; a card is unique, so summing the bits is the same as OR-ing them.
+    # Hands holding a card twice (a combo colliding with a runout) score arbitrarily, callers mask them
+    rows = np.arange(len(cards))[:, None] * 4 + suits
+    suit_masks = np.bincount(rows.ravel(), weights=rank_bits.ravel(), minlength=len(cards) * 4)
+    suit_masks = suit_masks.astype(np.int32).reshape(-1, 4) & 0x1FFF
+    flush_mask = np.where(POPCOUNT[suit_masks] >= 5, suit_masks, 0).max(axis=1)
+
+    # How often each rank is held, as bit planes: a 4-way bitwise adder over the suit masks
+    c, d, h, s = suit_masks.T
+    low_sum, low_carry = c ^ d, c & d
+    high_sum, high_carry = h ^ s, h & s
+    bit0 = low_sum ^ high_sum
+    bit1 = low_carry ^ high_carry ^ (low_sum & high_sum)
+    quads = c & d & h & s
+    rank_mask = c | d | h | s
+    singles = bit0 & ~bit1
+    pairs = bit1 & ~bit0 & ~quads
+    trips = bit0 & bit1
+
+    top_trips = np.where(trips > 0, 1 << HIGHEST[trips], 0)
+    top_two_pairs = TOP[2][pairs]
+    straight_flush = STRAIGHT_HIGH[flush_mask]
+    straight = STRAIGHT_HIGH[rank_mask]
+
+    conditions = [
+        straight_flush > 0,
+        quads > 0,
+        (trips > 0) & ((POPCOUNT[trips] >= 2) | (pairs > 0)),
+        flush_mask > 0,
+        straight > 0,
+        trips > 0,
+        POPCOUNT[pairs] >= 2,
+        pairs > 0,
+    ]
+    values = [
+        (STRAIGHT_FLUSH << CATEGORY_SHIFT) | (straight_flush - 1),
+        (QUADS << CATEGORY_SHIFT) | (HIGHEST[quads] << 20) | (HIGHEST[rank_mask & ~quads] << 16),
+        (FULL_HOUSE << CATEGORY_SHIFT) | (HIGHEST[trips] << 20) | (HIGHEST[(trips & ~top_trips) | pairs] << 16),
+        (FLUSH << CATEGORY_SHIFT) | PACKED[TOP[5][flush_mask]],
+        (STRAIGHT << CATEGORY_SHIFT) | (straight - 1),
+        (TRIPS << CATEGORY_SHIFT) | (HIGHEST[trips] << 20) | PACKED[TOP[2][singles]],
+        (TWO_PAIR << CATEGORY_SHIFT) | PACKED[top_two_pairs] | (HIGHEST[rank_mask & ~top_two_pairs] << 8),
+        (PAIR << CATEGORY_SHIFT) | (HIGHEST[pairs] << 20) | PACKED[TOP[3][singles]],
+    ]
+    scores = np.select(conditions, values, default=(HIGH_CARD << CATEGORY_SHIFT) | PACKED[TOP[5][singles]])
+    return scores.astype(np.int32).reshape(shape)
+
+def category(scores: np.ndarray) -> np.ndarray:
+    """Hand category (HIGH_CARD .. STRAIGHT_FLUSH) of evaluate() scores"""
+    return np.asarray(scores) >> CATEGORY_SHIFT
+
+def runouts(dead: List[int], board_size: int, max_runouts: int = 0, seed: int = 0) -> np.ndarray:
+    """
+    Every completion of a board to five cards, or a seeded sample of them
+
+    Args:
+        dead (List[int]): Cards already known (board and any hole cards to exclude)
+        board_size (int): Cards on the board now
+        max_runouts (int): Sample this many when there are more, 0 enumerates all
+
+    Returns:
+        np.ndarray: (runouts, 5 - board_size) card indices
+    """
+    deck = np.array([c for c in range(52) if c not in set(dead)], dtype=np.int32)
+    missing = 5 - board_size
+    if missing == 0:
+        return np.zeros((1, 0), dtype=np.int32)
+    total = math.comb(len(deck), missing)
+    if max_runouts and total > max_runouts:
+        rng = np.random.default_rng(seed)
+        return np.stack([rng.choice(deck, missing, replace=False) for _ in range(max_runouts)])
+    return np.array(list(itertools.combinations(deck, missing)), dtype=np.int32)
+
+def _combo_runout_valid(combos: np.ndarray, runout_cards: np.ndarray) -> np.ndarray:
+    """(combos, runouts) True where neither hole card of the combo is dealt in the runout"""
+    valid = np.ones((len(combos), len(runout_cards)), dtype=bool)
+    for hole in range(2):
+        for dealt in range(runout_cards.shape[1]):
+            valid &= combos[:, hole, None] != runout_cards[None, :, dealt]
+    return valid
+
+def hand_vs_range(hero: List[int], board: List[int], combos: np.ndarray, weights: np.ndarray,
+                  max_runouts: int = 0, seed: int = 0, chunk: int = 200000) -> float:
+    """
+    Weighted equity of one hand against a range over every (or a sample of) runouts
+
+    Args:
+        hero (List[int]): Hero's two cards
+        board (List[int]): 0 to 5 board cards
+        combos (np.ndarray): (M, 2) villain combos
+        weights (np.ndarray): (M,) combo weights
+        max_runouts (int): Sample this many runouts when there are more, 0 enumerates all
+        chunk (int): Hands scored per evaluate() call, bounds memory
+
+    Returns:
+        float: Hero's equity, ties counted as half
+    """
+    dead = set(hero) | set(board)
+    live = ~np.isin(combos, list(dead)).any(axis=1)
+    combos, weights = combos[live], weights[live]
+    if not len(combos):
+        return 0.0
+    deals = runouts(list(dead), len(board), max_runouts, seed)
+    full_boards = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int32), (len(deals), len(board))),
+                                  deals], axis=1)
+    hero_scores = evaluate(np.concatenate([np.broadcast_to(np.array(hero, dtype=np.int32), (len(deals), 2)),
+                                           full_boards], axis=1))
+
+    won, total = 0.0, 0.0
+    step = max(1, chunk // len(deals))
+    for start in range(0, len(combos), step):
+        part, part_weights = combos[start:start + step], weights[start:start + step]
+        hands = np.concatenate([np.broadcast_to(part[:, None, :], (len(part), len(deals), 2)),
+                                np.broadcast_to(full_boards[None], (len(part), len(deals), 5))], axis=2)
+        villain_scores = evaluate(hands)
+        valid = _combo_runout_valid(part, deals)
+        result = (hero_scores[None] > villain_scores) + 0.5 * (hero_scores[None] == villain_scores)
+        won += float((result * valid * part_weights[:, None]).sum())
+        total += float((valid * part_weights[:, None]).sum())
+    return won / total if total else 0.0
+
+def range_vs_range(hero_combos: np.ndarray, hero_weights: np.ndarray, villain_combos: np.ndarray,
+                   villain_weights: np.ndarray, board: List[int], max_runouts: int = 0,
+                   seed: int = 0) -> Tuple[float, np.ndarray]:
+    """
+    Weighted equity of one range against another
+
+    Each combo of both ranges is scored once per runout, then every compatible
+    (hero combo, villain combo, runout) triple is compared at once.
+
+    Args:
+        hero_combos, villain_combos (np.ndarray): (M, 2) combos of each range
+        hero_weights, villain_weights (np.ndarray): (M,) combo weights
+        board (List[int]): 0 to 5 board cards
+        max_runouts (int): Sample this many runouts when there are more, 0 enumerates all
+
+    Returns:
+        (float, np.ndarray): Hero range's equity, and the equity of each hero combo (NaN if blocked)
+    """
+    board_cards = list(board)
+    hero_live = ~np.isin(hero_combos, board_cards).any(axis=1)
+    villain_live = ~np.isin(villain_combos, board_cards).any(axis=1)
+    hero_idx = np.flatnonzero(hero_live)
+    hc, hw = hero_combos[hero_live], hero_weights[hero_live]
+    vc, vw = villain_combos[villain_live], villain_weights[villain_live]
+    per_combo = np.full(len(hero_combos), np.nan)
+    if not len(hc) or not len(vc):
+        return 0.0, per_combo
+
+    deals = runouts(board_cards, len(board_cards), max_runouts, seed)
+    full_boards = np.concatenate([np.broadcast_to(np.array(board_cards, dtype=np.int32),
+                                                  (len(deals), len(board_cards))), deals], axis=1)
+
+    def scores(combos):
+        hands = np.concatenate([np.broadcast_to(combos[:, None, :], (len(combos), len(deals), 2)),
+                                np.broadcast_to(full_boards[None], (len(combos), len(deals), 5))], axis=2)
+        return evaluate(hands), _combo_runout_valid(combos, deals)
+
+    hero_scores, hero_valid = scores(hc)
+    villain_scores, villain_valid = scores(vc)
+    # Hero and villain combos sharing a card can never be dealt together
+    disjoint = ((hc[:, None, :, None] != vc[None, :, None, :]).all(axis=(2, 3)))
+
+    won = np.zeros(len(hc))
+    weight = np.zeros(len(hc))
+    for runout in range(len(deals)):
+        pair_valid = disjoint & hero_valid[:, runout, None] & villain_valid[None, :, runout]
+        h, v = hero_scores[:, runout, None], villain_scores[None, :, runout]
+        result = (h > v) + 0.5 * (h == v)
+        won += (result * pair_valid * vw[None]).sum(axis=1)
+        weight += (pair_valid * vw[None]).sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        per_combo[hero_idx] = won / weight
+    total = (hw * weight).sum()
+    return (float((hw * won).sum() / total) if total else 0.0), per_combo
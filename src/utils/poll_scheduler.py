@@ -0,0 +1,123 @@
+# src/utils/poll_scheduler.py
+import time
+import cv2
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from src.detector.table_frame import TableFrame
+from src.utils.tick_timer import span
+
+# Subsampling of the frames compared for changes; a button appearing or vanishing
+# still moves the mean of its region by tens of gray levels at this resolution
+SIGNATURE_DOWNSCALE = 4
+
+# Regions that change whenever something happens at the table: the hero's turn bar and
+# action buttons, both bets, the pot and the board
+ACTIVITY_REGIONS = [
+    'hero_turn', 'action_strip', 'bet_hero', 'bet_villain', 'pot_preflop', 'pot_postflop',
+    'community_card_0', 'community_card_3', 'community_card_4',
+]
+
+# Mean absolute gray-level difference of a region that counts as a change
+CHANGE_THRESHOLD = 6.0
+
+Signature = Dict[str, np.ndarray]
+
+def frame_signature(frame: TableFrame, regions: List[str]) -> Signature:
+    """Downscaled grayscale copies of the regions, valid after the frame's buffer is reused"""
+    tier = frame.downscaled(SIGNATURE_DOWNSCALE)
+    return {name: np.array(tier.gray(name)) for name in regions}
+
+def changed_regions(before: Signature, after: Signature, threshold: float = CHANGE_THRESHOLD) -> List[str]:
+    """Regions of two signatures whose mean absolute difference exceeds the threshold"""
+    changed = []
+    for name, pixels in before.items():
+        other = after.get(name)
+        if other is None or other.shape != pixels.shape or float(np.mean(cv2.absdiff(pixels, other))) > threshold:
+            changed.append(name)
+    return changed
+
+class PollScheduler:
+    """
+    Decides how long the bot loop waits, instead of fixed sleeps.
+
+    Between ticks the interval starts at `min_interval` and backs off towards
+    `max_interval` while the table stays still, dropping back as soon as an
+    activity region changes or the bot acted. After a tap, wait_for_change()
+    polls the screen until the tapped part of the table actually reacts, with
+    the old fixed sleep as the timeout.
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 1.0, backoff: float = 2.0,
+                 settle_timeout: float = 3.0):
+        """
+        Args:
+            min_interval (float): Seconds between polls while the table is active
+            max_interval (float): Longest wait between polls of an idle table
+            backoff (float): Factor the interval grows by per idle tick
+            settle_timeout (float): Longest wait for the screen to react to a tap
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.settle_timeout = settle_timeout
+        self.interval = min_interval
+        self._last_signature: Optional[Signature] = None
+        self.stats = {'idle_ticks': 0, 'active_ticks': 0, 'settles': 0, 'settle_timeouts': 0, 'settle_seconds': 0.0}
+
+    def after_tick(self, frame: Optional[TableFrame], acted: bool) -> float:
+        """
+        Interval before the next tick, from whether the table moved since the last one
+
+        Args:
+            frame (TableFrame): Frame the tick ran on
+            acted (bool): The tick tapped something, so the next state is expected soon
+
+        Returns:
+            float: Seconds to wait
+        """
+        active = acted
+        if frame is not None:
+            signature = frame_signature(frame, ACTIVITY_REGIONS)
+            if self._last_signature is not None and changed_regions(self._last_signature, signature):
+                active = True
+            self._last_signature = None if acted else signature
+        if active:
+            self.interval = self.min_interval
+            self.stats['active_ticks'] += 1
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+            self.stats['idle_ticks'] += 1
+        return self.interval
+
+    def wait_for_change(self, capture: Callable[[], TableFrame], before: Signature,
+                        timeout: Optional[float] = None) -> Optional[TableFrame]:
+        """
+        Poll until one of the regions in `before` differs from it
+
+        Args:
+            capture: Returns a fresh frame
+            before (Signature): frame_signature() of the regions the tap should change
+            timeout (float): Give up after this many seconds, settle_timeout by default
+
+        Returns:
+            TableFrame: First frame that changed, None on timeout
+        """
+        timeout = self.settle_timeout if timeout is None else timeout
+        regions = list(before)
+        start = time.perf_counter()
+        with span('settle'):
+            while True:
+                time.sleep(self.min_interval)
+                frame = capture()
+                changed = bool(changed_regions(before, frame_signature(frame, regions)))
+                elapsed = time.perf_counter() - start
+                if changed or elapsed >= timeout:
+                    self.stats['settles' if changed else 'settle_timeouts'] += 1
+                    self.stats['settle_seconds'] += elapsed
+                    return frame if changed else None
+
+    def format_stats(self) -> str:
+        settles = self.stats['settles'] + self.stats['settle_timeouts']
+        mean_settle = self.stats['settle_seconds'] / settles * 1000 if settles else 0.0
+        return (f"{self.stats['active_ticks']} active / {self.stats['idle_ticks']} idle ticks, "
+                f"{settles} settles ({self.stats['settle_timeouts']} timed out, {mean_settle:.0f} ms mean)")
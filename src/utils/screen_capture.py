@@ -0,0 +1,126 @@
+# src/utils/screen_capture.py
+import struct
+import cv2
+import numpy as np
+from typing import Tuple
+from src.utils.tick_timer import span
+
+class RawFrame:
+    """
+    Zero-copy view over a raw RGBA framebuffer.
+
+    Behaves like a BGR screenshot for the operations the detectors use
+    (`shape` and 2D slicing): the RGBA -> BGR conversion only runs over the
+    slice that is actually read, never the full 1080x1920 frame.
+    """
+
+    def __init__(self, rgba: np.ndarray):
+        self.rgba = rgba
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.rgba.shape[0], self.rgba.shape[1], 3
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    def __getitem__(self, key) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+        key = key + (slice(None),) * (2 - len(key[:2]))
+
+        # Widen integer indices to 1-pixel slices so the region stays 2D for cvtColor
+        spatial = tuple(slice(k, k + 1 if k != -1 else None) if isinstance(k, (int, np.integer)) else k
+                        for k in key[:2])
+        region = self.rgba[spatial]
+        bgr = cv2.cvtColor(np.ascontiguousarray(region), cv2.COLOR_RGBA2BGR)
+
+        squeeze = tuple(0 if isinstance(k, (int, np.integer)) else slice(None) for k in key[:2])
+        return bgr[squeeze + key[2:]]
+
+    def to_bgr(self) -> np.ndarray:
+        """Convert the whole frame, for saving or display only"""
+        return cv2.cvtColor(self.rgba, cv2.COLOR_RGBA2BGR)
+
+    def __array__(self, dtype=None, copy=None):
+        bgr = self.to_bgr()
+        return bgr if dtype is None else bgr.astype(dtype)
+
+class PngScreenCapture:
+    """Default backend: `screencap -p`, PNG-compressed on the device and decoded here"""
+
+    def __init__(self, device):
+        self.device = device
+
+    def capture(self) -> np.ndarray:
+        with span('screencap'):
+            screenshot_data = self.device.screencap()
+        with span('decode'):
+            nparr = np.frombuffer(screenshot_data, np.uint8)
+            return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+class RawScreenCapture:
+    """Backend that pulls the uncompressed RGBA framebuffer (`screencap` without `-p`)"""
+
+    # Header is width, height, pixel format (+ colour space on Android 9+)
+    HEADER_FORMAT = '<III'
+    RGBA_8888 = 1
+
+    def __init__(self, device):
+        self.device = device
+
+    def read_framebuffer(self) -> bytes:
+        conn = self.device.create_connection()
+        with conn:
+            # exec: gives a binary-safe stream, unlike shell: which may translate line endings
+            conn.send("exec:screencap")
+            return conn.read_all()
+
+    @classmethod
+    def parse_framebuffer(cls, data: bytes) -> np.ndarray:
+        """Wrap raw screencap output as an (h, w, 4) RGBA view without copying the pixels"""
+        width, height, pixel_format = struct.unpack_from(cls.HEADER_FORMAT, data)
+        if pixel_format != cls.RGBA_8888:
+            raise ValueError(f"Unsupported framebuffer pixel format: {pixel_format}")
+
+        pixel_bytes = width * height * 4
+        header_size = len(data) - pixel_bytes
+        if header_size not in (12, 16):
+            raise ValueError(f"Unexpected framebuffer size {len(data)} for {width}x{height}")
+
+        return np.frombuffer(data, np.uint8, count=pixel_bytes, offset=header_size).reshape(height, width, 4)
+
+    def capture(self) -> RawFrame:
+        with span('screencap'):
+            data = self.read_framebuffer()
+        # Only the header is parsed here, pixels are converted per region when read
+        with span('decode'):
+            return RawFrame(self.parse_framebuffer(data))
+
+CAPTURE_BACKENDS = {
+    'png': PngScreenCapture,
+    'raw': RawScreenCapture,
+    'stream': None   # built lazily, see create_screen_capture
+}
+
+def create_screen_capture(device, backend: str = 'png'):
+    """
+    Build the capture backend selected by config
+
+    Args:
+        device: ppadb device returned by DeviceConnector.connect_device, or a FakeDevice
+        backend (str): 'png', 'raw' or 'stream' (persistent background stream)
+    """
+    if backend not in CAPTURE_BACKENDS:
+        raise ValueError(f"Unknown capture backend '{backend}', expected one of {list(CAPTURE_BACKENDS)}")
+
+    if backend == 'stream':
+        from src.utils.frame_stream import AdbFramebufferStream, StreamingScreenCapture
+        if hasattr(device, 'open_frame_stream'):
+            source = device.open_frame_stream()
+        else:
+            source = AdbFramebufferStream(device)
+        return StreamingScreenCapture(source)
+
+    return CAPTURE_BACKENDS[backend](device)
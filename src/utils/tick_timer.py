@@ -0,0 +1,88 @@
+# src/utils/tick_timer.py
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# TickTimer that span() reports to, set by TickTimer.activate()
+_active_timer: Optional['TickTimer'] = None
+
+@contextmanager
+def span(name: str):
+    """Time a block as a nested span of the active tick; a no-op when no timer is active"""
+    timer = _active_timer
+    if timer is None:
+        yield
+        return
+    with timer.stage(name):
+        yield
+
+class TickTimer:
+    """
+    Collects wall-clock time per pipeline stage for a single loop iteration.
+
+    Stages nest: a stage opened inside another is recorded as 'outer/inner', and
+    stages opened on worker threads during a stage of the loop thread are nested
+    under it. `stages` keeps the totals of the top-level stages of the loop thread.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        # (path, start offset in s, duration in s, thread name) of every finished span
+        self.spans: List[Tuple[str, float, float, str]] = []
+        # Named instants of the tick, in s after its start (e.g. 'tap')
+        self.marks: Dict[str, float] = {}
+        self._local = threading.local()
+        self._owner = threading.get_ident()
+        self._owner_stack: List[str] = []
+        self._start = time.perf_counter()
+
+    def activate(self):
+        """Make span() calls anywhere in the process report to this timer"""
+        global _active_timer
+        _active_timer = self
+
+    def reset(self):
+        self.stages = {}
+        self.spans = []
+        self.marks = {}
+        self._owner = threading.get_ident()
+        self._owner_stack = self._stack()
+        self._start = time.perf_counter()
+
+    def _stack(self) -> List[str]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str):
+        stack = self._stack()
+        is_owner = threading.get_ident() == self._owner
+        # Worker threads nest under whatever the loop thread is doing
+        parents = stack if is_owner else list(self._owner_stack) + stack
+        path = '/'.join(parents + [name])
+        top_level = is_owner and not stack
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            self.spans.append((path, start - self._start, elapsed, threading.current_thread().name))
+            if top_level:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def mark(self, name: str):
+        """Record when something happened in this tick, e.g. the tap"""
+        self.marks[name] = time.perf_counter() - self._start
+
+    def total(self) -> float:
+        return time.perf_counter() - self._start
+
+    def format(self) -> str:
+        """e.g. 'capture 84.1ms | hero_turn 0.4ms | total 85.0ms'"""
+        parts = [f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.stages.items()]
+        parts.append(f"total {self.total() * 1000:.1f}ms")
+        return " | ".join(parts)
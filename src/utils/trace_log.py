@@ -0,0 +1,157 @@
+# src/utils/trace_log.py
+import json
+import time
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import numpy as np
+from src.utils.tick_timer import TickTimer
+
+# Pseudo-stage for the time from the start of the tick (capture) to its tap
+CAPTURE_TO_TAP = 'capture_to_tap'
+
+class TraceLog:
+    """
+    Per-tick spans of the bot loop, written as JSONL next to the session logs.
+
+    Keeps every stage's durations for the shutdown summary and the last
+    `window` ticks for the rolling view of the dashboard.
+    """
+
+    def __init__(self, path: str, window: int = 200):
+        """
+        Args:
+            path (str): trace.jsonl in the session log directory
+            window (int): Ticks the rolling percentiles are computed over
+        """
+        self.path = path
+        self.ticks = 0
+        self._file = open(path, 'a', encoding='utf-8')
+        self._session: Dict[str, List[float]] = {}
+        self._recent: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, timer: TickTimer):
+        """Append the tick that just finished"""
+        durations: Dict[str, float] = {}
+        for path, _, seconds, _ in timer.spans:
+            durations[path] = durations.get(path, 0.0) + seconds * 1000
+        durations['total'] = timer.total() * 1000
+        if 'tap' in timer.marks:
+            durations[CAPTURE_TO_TAP] = timer.marks['tap'] * 1000
+
+        line = {
+            'tick': self.ticks,
+            'timestamp': time.time(),
+            'total_ms': round(durations['total'], 3),
+            'spans': [
+                {'name': path, 'start_ms': round(start * 1000, 3), 'ms': round(seconds * 1000, 3), 'thread': thread}
+                for path, start, seconds, thread in timer.spans
+            ],
+            'marks': {name: round(offset * 1000, 3) for name, offset in timer.marks.items()},
+        }
+        self._file.write(json.dumps(line) + '\n')
+        self._file.flush()
+
+        with self._lock:
+            self.ticks += 1
+            self._recent.append(durations)
+            for path, ms in durations.items():
+                self._session.setdefault(path, []).append(ms)
+
+    @staticmethod
+    def _percentiles(values: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+        return {
+            path: {
+                'count': len(ms),
+                'p50': float(np.percentile(ms, 50)),
+                'p95': float(np.percentile(ms, 95)),
+                'p99': float(np.percentile(ms, 99)),
+                'max': float(np.max(ms)),
+            }
+            for path, ms in sorted(values.items()) if ms
+        }
+
+    def rolling_stats(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles per stage over the last `window` ticks"""
+        with self._lock:
+            values: Dict[str, List[float]] = {}
+            for durations in self._recent:
+                for path, ms in durations.items():
+                    values.setdefault(path, []).append(ms)
+        return self._percentiles(values)
+
+    def session_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            values = {path: list(ms) for path, ms in self._session.items()}
+        return self._percentiles(values)
+
+    @staticmethod
+    def format_stats(stats: Dict[str, Dict[str, float]], title: str) -> str:
+        lines = [title, f"{'stage':<40} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for path, s in stats.items():
+            indent = '  ' * path.count('/')
+            name = indent + path.rsplit('/', 1)[-1]
+            lines.append(f"{name:<40} {s['count']:>6} {s['p50']:>9.2f} {s['p95']:>9.2f} {s['p99']:>9.2f} {s['max']:>9.2f}")
+        return '\n'.join(lines)
+
+    def format_summary(self) -> str:
+        return self.format_stats(self.session_stats(), f"Latency per stage over {self.ticks} ticks:")
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self):
+        self._file.close()
+
+class TraceDashboard:
+    """
+    Local HTTP view of a TraceLog's rolling percentiles.
+
+    / serves a self-refreshing text table, /stats.json the same numbers as JSON.
+    """
+
+    def __init__(self, trace_log: TraceLog, port: int, host: str = '127.0.0.1', refresh: float = 2.0):
+        self.trace_log = trace_log
+        self.refresh = refresh
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _handler(self):
+        dashboard = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stats = dashboard.trace_log.rolling_stats()
+                if self.path.startswith('/stats.json'):
+                    body, content_type = json.dumps(stats).encode(), 'application/json'
+                else:
+                    table = TraceLog.format_stats(stats, f"Rolling latency, tick {dashboard.trace_log.ticks}")
+                    body = (f"<html><head><meta http-equiv='refresh' content='{dashboard.refresh}'></head>"
+                            f"<body><pre>{table}</pre></body></html>").encode()
+                    content_type = 'text/html'
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the bot's console readable
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="trace-dashboard", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
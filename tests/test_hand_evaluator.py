@@ -0,0 +1,109 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eval7
+import numpy as np
+from src.utils import hand_evaluator
+from src.utils.hand_evaluator import (
+    FLUSH, FULL_HOUSE, HIGH_CARD, PAIR, QUADS, STRAIGHT, STRAIGHT_FLUSH, TRIPS, TWO_PAIR, card_index
+)
+
+# Checks the vectorized evaluator against eval7, the reference it replaced in the hot path
+SEED = 0
+RANDOM_PAIRS = 200000
+
+EVAL7_CATEGORIES = {
+    'High Card': HIGH_CARD, 'Pair': PAIR, 'Two Pair': TWO_PAIR, 'Trips': TRIPS, 'Straight': STRAIGHT,
+    'Flush': FLUSH, 'Full House': FULL_HOUSE, 'Quads': QUADS, 'Straight Flush': STRAIGHT_FLUSH,
+}
+
+# (stronger, weaker) 7-card hands around the lookup-table corner cases
+EDGE_CASES = [
+    # Wheel: the ace plays low, and any higher straight beats it
+    ('As 2d 3h 4c 5s Kd Qh', 'Ks Kd Kh 9c 2s 3d 4h'),
+    ('2s 3d 4h 5c 6s Ad Kh', 'As 2d 3h 4c 5s Kd Qh'),
+    ('Ts Jd Qh Kc As 2d 3h', '9s Td Jh Qc Ks 2d 3h'),
+    # No wrap-around: Q-K-A-2-3 is ace high
+    ('2s 2d 7h 9c Js Qd 3h', 'Qs Kd Ah 2c 3s 8d 6h'),
+    # Steel wheel vs the next straight flush and vs quads
+    ('2h 3h 4h 5h 6h Ad Ac', 'Ah 2h 3h 4h 5h Kd Kc'),
+    ('Ah 2h 3h 4h 5h Kd Kc', 'Ks Kd Kh Kc 2s 3d 4d'),
+    # Royal flush vs king-high straight flush
+    ('Th Jh Qh Kh Ah 2c 3d', '9h Th Jh Qh Kh 2c 3d'),
+    # Six and seven cards of a suit: the best five count
+    ('2h 4h 6h 8h Th Qh Ah', '2h 4h 6h 8h Th Qh Kh'),
+    ('Kh 4h 6h 8h Th Qh Ac', 'Jh 4h 6h 8h Th Qh Ac'),
+    # A flush beats a straight, and the flush with the higher fifth card wins
+    ('2c 5c 7c 9c Jc 8d Th', '7s 8d 9h Tc Js 2d 3h'),
+    ('Ac Kc Qc Jc 9c', 'Ac Kc Qc Jc 8c'),
+    # A straight flush beats a flush plus a higher straight
+    ('5h 6h 7h 8h 9h Tc Jd', 'Ah Kh 2h 4h 9h Tc Jd'),
+    # Three pairs: the best two and the best kicker
+    ('As Ad Ks Kd Qs Qd 2c', 'As Ad Ks Kd Js Jd 9c'),
+    # Two sets make the best full house
+    ('As Ad Ah Ks Kd Kh 2c', 'As Ad Ah Qs Qd Qh Kc'),
+    # Quads kicker
+    ('9s 9d 9h 9c As 2d 3h', '9s 9d 9h 9c Ks Qd Jh'),
+]
+
+def evaluate_one(cards: str) -> int:
+    indices = [card_index(c) for c in cards.split()]
+    if len(indices) < 7:
+        # Pad five-card hands with two dead low cards of other suits that cannot improve them
+        indices += [card_index(c) for c in ['2s', '3d'] if card_index(c) not in indices][:7 - len(indices)]
+    return int(hand_evaluator.evaluate(np.array([indices], dtype=np.int32))[0])
+
+def eval7_score(cards: str) -> int:
+    return eval7.evaluate([eval7.Card(c) for c in cards.split()])
+
+def random_hands(rng: np.random.Generator, count: int) -> np.ndarray:
+    return np.argsort(rng.random((count, 52)), axis=1)[:, :7].astype(np.int32)
+
+def test_random_pairs_rank_like_eval7():
+    rng = np.random.default_rng(SEED)
+    hands = random_hands(rng, 2 * RANDOM_PAIRS)
+    cards = [eval7.Card(hand_evaluator.card_name(i)) for i in range(52)]
+    reference = np.array([eval7.evaluate([cards[c] for c in hand]) for hand in hands])
+    scores = hand_evaluator.evaluate(hands)
+
+    ours = np.sign(scores[0::2].astype(np.int64) - scores[1::2])
+    theirs = np.sign(reference[0::2] - reference[1::2])
+    mismatches = np.flatnonzero(ours != theirs)
+    assert len(mismatches) == 0, f"{len(mismatches)} pairs ordered differently, e.g. {hands[2 * mismatches[:3]]}"
+
+def test_random_categories_match_eval7():
+    rng = np.random.default_rng(SEED + 1)
+    hands = random_hands(rng, 20000)
+    cards = [eval7.Card(hand_evaluator.card_name(i)) for i in range(52)]
+    expected = [EVAL7_CATEGORIES[eval7.handtype(eval7.evaluate([cards[c] for c in hand]))] for hand in hands]
+    assert hand_evaluator.category(hand_evaluator.evaluate(hands)).tolist() == expected
+
+def test_edge_cases():
+    for stronger, weaker in EDGE_CASES:
+        assert evaluate_one(stronger) > evaluate_one(weaker), f"{stronger} should beat {weaker}"
+        if len(stronger.split()) == len(weaker.split()) == 7:
+            assert eval7_score(stronger) > eval7_score(weaker), f"eval7 disagrees on {stronger} vs {weaker}"
+
+def test_edge_case_categories():
+    assert hand_evaluator.category(evaluate_one('As 2d 3h 4c 5s Kd Qh')) == STRAIGHT
+    assert hand_evaluator.category(evaluate_one('Ah 2h 3h 4h 5h Kd Kc')) == STRAIGHT_FLUSH
+    assert hand_evaluator.category(evaluate_one('Qs Kd Ah 2c 3s 8d 6h')) == HIGH_CARD
+    assert hand_evaluator.category(evaluate_one('2h 4h 6h 8h Th Qh Ah')) == FLUSH
+
+def test_ties_score_equal():
+    # Same best five cards, different unused cards
+    assert evaluate_one('As Ks Qs Js Ts 2d 3h') == evaluate_one('As Ks Qs Js Ts 4d 5h')
+    assert evaluate_one('As Ad Ks Kd Qs 2c 3h') == evaluate_one('Ac Ah Kc Kh Qd 2s 4h')
+    # A pair inside a straight neither changes it nor adds a kicker
+    assert evaluate_one('As 2d 3h 4c 5s 5d 9h') == evaluate_one('As 2d 3h 4c 5s 5d 8h')
+    # Of three pairs, the third one's rank is only a kicker
+    assert evaluate_one('As Ad Ks Kd Qs Qd 2c') == evaluate_one('As Ad Ks Kd Js Jd Qc')
+    # The sixth card of a suit does not play
+    assert evaluate_one('3h 4h 6h 8h Th Qh Ac') == evaluate_one('2h 4h 6h 8h Th Qh Ac')
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,86 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import struct
+import time
+import cv2
+import numpy as np
+from src.config.regions import *
+from src.utils.screen_capture import PngScreenCapture, RawScreenCapture, RawFrame
+
+def regions_read_per_tick():
+    """Every region the detectors slice out of a frame during one table-state extraction"""
+    regions = HERO_CARD_REGIONS + COMMUNITY_CARD_REGIONS
+    regions += list(STACK_REGIONS.values()) + list(BET_REGIONS.values()) + list(BUTTON_REGIONS.values())
+    regions += [POT_REGION_PREFLOP, POT_REGION_POSTFLOP, HERO_TURN_REGION]
+    regions.append({'x1': 35, 'y1': 1567, 'x2': 1046, 'y2': 1904})   # action strip
+    regions.append({'x1': 400, 'y1': 1100, 'x2': 700, 'y2': 1200})   # preflop pot type banner
+    return regions
+
+def read_regions(screen):
+    for region in regions_read_per_tick():
+        screen[region['y1']:region['y2'], region['x1']:region['x2']]
+    height = screen.shape[0]
+    screen[height // 2:, :]   # next hand search area
+
+def time_calls(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def print_timings(name, timings):
+    print(f"{name:<28} mean {np.mean(timings):8.2f} ms | p50 {np.percentile(timings, 50):8.2f} ms | "
+          f"p95 {np.percentile(timings, 95):8.2f} ms")
+
+def benchmark_offline(image_path, iterations):
+    """Decode-side cost only, using a saved screenshot encoded both ways"""
+    bgr = cv2.imread(image_path)
+    if bgr is None:
+        raise FileNotFoundError(f"Could not load {image_path}")
+    height, width = bgr.shape[:2]
+
+    png_bytes = cv2.imencode('.png', bgr)[1].tobytes()
+    rgba = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGBA)
+    raw_bytes = struct.pack('<IIII', width, height, RawScreenCapture.RGBA_8888, 0) + rgba.tobytes()
+
+    print(f"Frame {width}x{height}: PNG {len(png_bytes) / 1024:.0f} KiB, raw {len(raw_bytes) / 1024:.0f} KiB")
+
+    def png_path():
+        read_regions(cv2.imdecode(np.frombuffer(png_bytes, np.uint8), cv2.IMREAD_COLOR))
+
+    def raw_path():
+        read_regions(RawFrame(RawScreenCapture.parse_framebuffer(raw_bytes)))
+
+    print_timings("png decode + regions", time_calls(png_path, iterations))
+    print_timings("raw wrap + regions", time_calls(raw_path, iterations))
+
+def benchmark_device(iterations):
+    """End-to-end capture latency against the connected emulator"""
+    from src.utils.device_connector import DeviceConnector
+    device = DeviceConnector.connect_device()
+
+    png_capture = PngScreenCapture(device)
+    raw_capture = RawScreenCapture(device)
+
+    print_timings("png capture + regions", time_calls(lambda: read_regions(png_capture.capture()), iterations))
+    print_timings("raw capture + regions", time_calls(lambda: read_regions(raw_capture.capture()), iterations))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PNG and raw framebuffer capture backends")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--offline', metavar='PNG', nargs='?', const='debug_images/full_screen.png',
+                        help="Benchmark decoding only, using a saved screenshot instead of a device")
+    args = parser.parse_args()
+
+    if args.offline:
+        benchmark_offline(args.offline, args.iterations)
+    else:
+        benchmark_device(args.iterations)
+
+if __name__ == "__main__":
+    main()
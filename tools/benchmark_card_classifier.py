@@ -0,0 +1,80 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import cv2
+import numpy as np
+from src.config.regions import HERO_CARD_REGIONS, COMMUNITY_CARD_REGIONS
+from src.detector.template_matcher import TemplateMatcher
+from src.detector.table_detector import PokerTableDetector
+from src.detector.table_frame import TableFrame
+
+def load_frames(directories):
+    """Full-size screenshots (same size as the card regions assume) from the given folders"""
+    frames = []
+    for directory in directories:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.lower().endswith('.png'):
+                continue
+            image = cv2.imread(os.path.join(directory, filename))
+            if image is not None and image.shape[:2] == (1920, 1080):
+                frames.append((os.path.join(directory, filename), image))
+    return frames
+
+def card_str(card):
+    return f"{card.rank}{card.suit}" if card else "--"
+
+def compare(frames, detector):
+    slots = [(f'hero_card_{i}', True) for i in range(len(HERO_CARD_REGIONS))]
+    slots += [(f'community_card_{i}', False) for i in range(len(COMMUNITY_CARD_REGIONS))]
+
+    timings = {'per_template': [], 'batched': []}
+    mismatches = []
+    max_conf_diff = 0.0
+    total = 0
+
+    for path, image in frames:
+        frame = TableFrame(image)
+        for region_name, is_hero in slots:
+            roi, gray = frame.crop(region_name), frame.gray(region_name)
+
+            start = time.perf_counter()
+            reference = detector.detect_card_per_template(roi, is_hero, gray)
+            timings['per_template'].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            batched = detector.card_classifier.classify(roi, is_hero, gray)
+            timings['batched'].append((time.perf_counter() - start) * 1000)
+
+            total += 1
+            if card_str(reference) != card_str(batched):
+                mismatches.append((path, region_name, card_str(reference), card_str(batched)))
+            elif reference:
+                max_conf_diff = max(max_conf_diff, abs(reference.confidence - batched.confidence))
+
+    print(f"\n{len(frames)} frames, {total} card slots")
+    for engine, values in timings.items():
+        print(f"{engine:<13} mean {np.mean(values):6.2f} ms | p50 {np.percentile(values, 50):6.2f} ms | "
+              f"p95 {np.percentile(values, 95):6.2f} ms per card")
+    print(f"Agreement: {total - len(mismatches)}/{total}, max confidence difference {max_conf_diff:.2e}")
+    for path, region_name, expected, got in mismatches:
+        print(f"  MISMATCH {path} {region_name}: per_template={expected} batched={got}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy/latency comparison of the card recognition engines")
+    parser.add_argument('frames', nargs='*', default=['debug_images'],
+                        help="Folders with saved 1080x1920 screenshots")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print("No 1080x1920 frames found")
+        return
+
+    detector = PokerTableDetector(TemplateMatcher('card_templates'))
+    compare(frames, detector)
+
+if __name__ == "__main__":
+    main()
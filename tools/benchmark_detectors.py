@@ -0,0 +1,307 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import time
+import cv2
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Tuple
+from src.detector.template_matcher import TemplateMatcher
+from src.detector.table_detector import PokerTableDetector
+from src.detector.table_frame import TableFrame
+
+# A flop and a preflop screenshot: a smoke test of the detectors, see its description
+GOLDEN_DEFAULT = 'golden_frames/golden.json'
+
+# Percentiles and accuracy only mean something once the golden set labels all of these
+STREETS = ['Preflop', 'Flop', 'Turn', 'River']
+HERO_TURN_STATES = {True: 'hero to act', False: 'hero waiting'}
+
+# Two runs are compared on p95; slower by both the tolerance and this many ms is a regression
+REGRESSION_TOLERANCE = 0.2
+REGRESSION_MIN_MS = 0.5
+
+class GoldenFrame:
+    def __init__(self, path: str, labels: Dict, image: np.ndarray, matcher: TemplateMatcher):
+        self.path = path
+        self.labels = labels
+        self.image = image
+        # Calibrated outside the timed calls, like the live loop does once per session
+        self.geometry = matcher.calibrate(image)
+
+    @property
+    def position_tolerance(self) -> float:
+        return max(4.0, 0.01 * self.image.shape[1])
+
+def load_golden(path: str, matcher: TemplateMatcher) -> List[GoldenFrame]:
+    with open(path, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    if golden.get('description'):
+        print(golden['description'])
+    frames = []
+    for entry in golden['frames']:
+        frame_path = os.path.join(os.path.dirname(path), entry['file'])
+        image = cv2.imread(frame_path)
+        if image is None:
+            print(f"Warning: Could not read golden frame {frame_path}")
+            continue
+        frames.append(GoldenFrame(frame_path, entry['labels'], image, matcher))
+    return frames
+
+def coverage_gaps(frames: List[GoldenFrame]) -> List[str]:
+    """Streets and hero-turn states no golden frame labels"""
+    streets = {f.labels.get('street') for f in frames}
+    turns = {f.labels.get('hero_turn') for f in frames}
+    return ([street for street in STREETS if street not in streets] +
+            [state for turn, state in HERO_TURN_STATES.items() if turn not in turns])
+
+def card_str(card):
+    return f"{card.rank}{card.suit}" if card else None
+
+def close(a: float, b: float) -> bool:
+    return abs(a - b) < 0.01
+
+class DetectorBench:
+    """
+    Times each detector entry point on fresh state: a new TableFrame and empty
+    region/hand caches per call, so no result is served from an earlier call.
+    Every case yields (elapsed ms, correct).
+    """
+
+    def __init__(self, matcher: TemplateMatcher, detector: PokerTableDetector):
+        self.matcher = matcher
+        self.detector = detector
+
+    def fresh_frame(self, golden: GoldenFrame) -> TableFrame:
+        self.matcher.set_scale(golden.geometry.scale)
+        self.detector.region_cache.invalidate()
+        self.detector.reset_hand_cache()
+        return TableFrame(golden.image, golden.geometry)
+
+    def timed(self, golden: GoldenFrame, call: Callable[[TableFrame], object]) -> Tuple[float, object]:
+        frame = self.fresh_frame(golden)
+        start = time.perf_counter()
+        result = call(frame)
+        return (time.perf_counter() - start) * 1000, result
+
+    def bench_match_template(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        for case in golden.labels['templates']:
+            frame = self.fresh_frame(golden)
+            template = self.matcher.get_template(case['family'], case['name'])
+            roi = frame.gray(case['region'])
+            start = time.perf_counter()
+            confidence, _ = self.matcher.match_template(roi, template.gray)
+            elapsed = (time.perf_counter() - start) * 1000
+            yield elapsed, (confidence > 0.8) == case['found']
+
+    def bench_detect_card(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        for region_name, expected in golden.labels['cards'].items():
+            # Empty slots never reach detect_card, detect_card_in_region skips them
+            if expected is None:
+                continue
+            frame = self.fresh_frame(golden)
+            roi, gray = frame.crop(region_name), frame.gray(region_name)
+            start = time.perf_counter()
+            card = self.detector.detect_card(roi, region_name.startswith('hero'), gray)
+            elapsed = (time.perf_counter() - start) * 1000
+            yield elapsed, card_str(card) == expected
+
+    def bench_detect_button_position(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, result = self.timed(golden, self.detector.detect_button_position)
+        yield elapsed, result == golden.labels['button_positions']
+
+    def bench_detect_hero_turn(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, result = self.timed(golden, self.detector.detect_hero_turn)
+        yield elapsed, bool(result) == golden.labels['hero_turn']
+
+    def bench_detect_pot_size(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, result = self.timed(golden, self.detector.detect_pot_size)
+        yield elapsed, close(result, golden.labels['pot_size'])
+
+    def bench_detect_action_buttons(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, detections = self.timed(golden, self.detector.action_detector.detect_action_buttons)
+        yield elapsed, self.buttons_match(golden, detections)
+
+    def bench_extract_action_value(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        for button in golden.labels['action_buttons']:
+            if 'value' not in button:
+                continue
+            position = tuple(button['position'])
+            elapsed, value = self.timed(golden, lambda frame: self.detector.extract_action_value(frame, position))
+            yield elapsed, close(value, button['value'])
+
+    def bench_detect_preflop_pot_type(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, result = self.timed(golden, self.matcher.detect_preflop_pot_type)
+        yield elapsed, result == golden.labels['preflop_pot_type']
+
+    def bench_detect_table_state(self, golden: GoldenFrame) -> Iterator[Tuple[float, bool]]:
+        elapsed, state = self.timed(golden, self.detector.detect_table_state)
+        yield elapsed, not self.state_errors(golden, state)
+
+    @staticmethod
+    def buttons_match(golden: GoldenFrame, detections: List[Dict]) -> bool:
+        """Same buttons as labelled, each within the position tolerance"""
+        expected = golden.labels['action_buttons']
+        if len(detections) != len(expected):
+            return False
+        remaining = list(expected)
+        for detection in detections:
+            x, y = detection['position']
+            match = next((b for b in remaining if b['type'] == detection['type'] and
+                          max(abs(b['position'][0] - x), abs(b['position'][1] - y)) <= golden.position_tolerance),
+                         None)
+            if match is None:
+                return False
+            remaining.remove(match)
+        return True
+
+    @staticmethod
+    def state_errors(golden: GoldenFrame, state: Dict) -> List[str]:
+        """Fields of a detect_table_state result that differ from the labels"""
+        labels = golden.labels
+        errors = []
+        hero_cards = [card_str(c) for c in state['hero_cards']]
+        if hero_cards != [labels['cards'][f'hero_card_{i}'] for i in range(len(hero_cards))] or len(hero_cards) != 2:
+            errors.append('hero_cards')
+        community = [card_str(c) for c in state['community_cards']]
+        if community != [c for name, c in labels['cards'].items() if name.startswith('community') and c]:
+            errors.append('community_cards')
+        for field in ['street', 'preflop_pot_type', 'button_positions']:
+            if state[field] != labels[field]:
+                errors.append(field)
+        if not close(state['pot_size'], labels['pot_size']):
+            errors.append('pot_size')
+        for field in ['stacks', 'bets']:
+            if any(not close(state[field][player], value) for player, value in labels[field].items()):
+                errors.append(field)
+        return errors
+
+DETECTORS = [
+    'match_template', 'detect_card', 'detect_button_position', 'detect_hero_turn', 'detect_pot_size',
+    'detect_action_buttons', 'extract_action_value', 'detect_preflop_pot_type', 'detect_table_state'
+]
+
+def run(bench: DetectorBench, frames: List[GoldenFrame], detectors: List[str], repeat: int) -> Dict[str, Dict]:
+    results = {}
+    for name in detectors:
+        timings, correct = [], []
+        for _ in range(repeat):
+            for golden in frames:
+                for elapsed, ok in getattr(bench, f'bench_{name}')(golden):
+                    timings.append(elapsed)
+                    correct.append(bool(ok))
+        results[name] = {
+            'calls': len(timings),
+            'p50_ms': float(np.percentile(timings, 50)),
+            'p95_ms': float(np.percentile(timings, 95)),
+            'p99_ms': float(np.percentile(timings, 99)),
+            'accuracy': float(np.mean(correct)),
+            'correct': int(np.sum(correct)),
+        }
+    return results
+
+def print_results(results: Dict[str, Dict], partial: bool = False):
+    if partial:
+        # A handful of frames: the median and the raw count are all the data supports
+        print(f"\n{'detector':<26} {'calls':>6} {'p50 ms':>9} {'correct':>9}")
+        for name, r in results.items():
+            correct = f"{r['correct']}/{r['calls']}"
+            print(f"{name:<26} {r['calls']:>6} {r['p50_ms']:>9.3f} {correct:>9}")
+        return
+    print(f"\n{'detector':<26} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'accuracy':>9}")
+    for name, r in results.items():
+        print(f"{name:<26} {r['calls']:>6} {r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} "
+              f"{r['accuracy']:>8.1%}")
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            tolerance: float = REGRESSION_TOLERANCE, partial: bool = False) -> List[str]:
+    """
+    Regressions of this run against a saved one: slower or fewer correct results
+
+    Compares p95 and accuracy, or with partial coverage the median and the
+    correct counts (the same calls in both runs, so counts are comparable).
+    """
+    regressions = []
+    latency = 'p50_ms' if partial else 'p95_ms'
+    label = latency[:3]
+    if partial:
+        print(f"\n{'detector':<26} {label + ' before':>11} {label + ' now':>9} {'change':>8} "
+              f"{'ok before':>11} {'ok now':>8}")
+    else:
+        print(f"\n{'detector':<26} {'p95 before':>11} {'p95 now':>9} {'change':>8} {'acc before':>11} {'acc now':>8}")
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        b = baseline[name]
+        change = r[latency] / b[latency] - 1 if b[latency] else 0.0
+        flags = []
+        if r[latency] > b[latency] * (1 + tolerance) and r[latency] - b[latency] > REGRESSION_MIN_MS:
+            flags.append('SLOWER')
+        if r['accuracy'] < b['accuracy']:
+            flags.append('LESS ACCURATE')
+        if flags:
+            regressions.append(f"{name}: {', '.join(flags)}")
+        if partial:
+            before = f"{b.get('correct', round(b['accuracy'] * b['calls']))}/{b['calls']}"
+            now = f"{r['correct']}/{r['calls']}"
+            print(f"{name:<26} {b[latency]:>11.3f} {r[latency]:>9.3f} {change:>+7.0%} {before:>11} {now:>8} "
+                  f"{' '.join(flags)}")
+        else:
+            print(f"{name:<26} {b['p95_ms']:>11.3f} {r['p95_ms']:>9.3f} {change:>+7.0%} {b['accuracy']:>10.1%} "
+                  f"{r['accuracy']:>7.1%} {' '.join(flags)}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Latency and accuracy of each detector on labelled frames; percentiles and accuracy are "
+                    "only reported once the frames cover every street and both hero-turn states")
+    parser.add_argument('--golden', default=GOLDEN_DEFAULT, help="Golden set: JSON labels next to the frames")
+    parser.add_argument('--detectors', nargs='+', default=DETECTORS, choices=DETECTORS)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--ocr', default='auto', help="OCR engine, see src/detector/ocr_engine.py")
+    parser.add_argument('--save', help="Write the results as JSON, e.g. as a baseline for --compare")
+    parser.add_argument('--compare', help="Results JSON of an earlier run; exit status 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="Relative p95 (p50 with partial coverage) slowdown allowed before --compare "
+                             "flags a detector")
+    args = parser.parse_args()
+
+    matcher = TemplateMatcher('card_templates', reload_interval=0)
+    detector = PokerTableDetector(matcher, ocr_engine=args.ocr)
+    try:
+        frames = load_golden(args.golden, matcher)
+        if not frames:
+            print("No golden frames found")
+            return
+        bench = DetectorBench(matcher, detector)
+        # One untimed pass so template spectra and OCR engines are warm
+        run(bench, frames, args.detectors, 1)
+        results = run(bench, frames, args.detectors, args.repeat)
+    finally:
+        detector.shutdown()
+
+    gaps = coverage_gaps(frames)
+    print(f"{len(frames)} golden frames x {args.repeat} repeats")
+    if gaps:
+        print(f"Partial coverage, no frame labels: {', '.join(gaps)}. Showing correct counts and medians only; "
+              f"they say nothing about the missing states")
+    print_results(results, partial=bool(gaps))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, partial=bool(gaps))
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
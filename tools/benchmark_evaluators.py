@@ -0,0 +1,112 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+import eval7
+import numpy as np
+from treys import Card as TreysCard
+from treys import Evaluator as TreysEvaluator
+from src.utils import hand_evaluator
+from src.utils.equity_calculator import EquityCalculator
+from src.utils.hand_evaluator import card_index, card_name
+
+# Hero, board and villain range of the equity benchmarks, one per street
+SITUATIONS = [
+    ('flop', ['Jh', '6h'], ['As', '9d', '8c'], 'bb_3bet'),
+    ('turn', ['Jh', '6h'], ['As', '9d', '8c', '2h'], 'bb_3bet'),
+    ('river', ['Jh', '6h'], ['As', '9d', '8c', '2h', 'Kd'], 'bb_3bet'),
+]
+
+def timed(call: Callable, repeat: int) -> Tuple[float, object]:
+    """Best wall time of `repeat` calls in ms, and the last result"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def bench_evaluators(hands: np.ndarray, repeat: int) -> Dict[str, float]:
+    """ms to score every hand with each evaluator, after checking they rank hands alike"""
+    eval7_cards = [eval7.Card(card_name(i)) for i in range(52)]
+    treys_cards = [TreysCard.new(card_name(i)) for i in range(52)]
+    treys = TreysEvaluator()
+
+    def numpy_batch():
+        return hand_evaluator.evaluate(hands)
+
+    def eval7_loop():
+        return np.array([eval7.evaluate([eval7_cards[c] for c in hand]) for hand in hands])
+
+    def treys_loop():
+        # treys scores 1 (royal flush) to 7462, lower is better
+        return -np.array([treys.evaluate([treys_cards[c] for c in hand[2:]], [treys_cards[c] for c in hand[:2]])
+                          for hand in hands])
+
+    results, scores = {}, {}
+    for name, call in [('numpy batch', numpy_batch), ('eval7 loop', eval7_loop), ('treys loop', treys_loop)]:
+        results[name], scores[name] = timed(call, repeat)
+
+    # Same order of hands (ties included) as eval7 means the same showdown results
+    order = np.argsort(scores['eval7 loop'], kind='stable')
+    for name, values in scores.items():
+        steps, reference = np.diff(values[order]), np.diff(scores['eval7 loop'][order])
+        if not (np.all(steps >= 0) and np.array_equal(steps == 0, reference == 0)):
+            print(f"Warning: {name} ranks the hands differently from eval7")
+    return results
+
+def bench_equity(calculator: EquityCalculator, repeat: int) -> List[Tuple[str, Dict[str, Tuple[float, float]]]]:
+    """(ms, equity) of hand-vs-range per street: vectorized evaluator vs eval7 per combo"""
+    rows = []
+    for street, hero, board, range_key in SITUATIONS:
+        combo_range = calculator.ranges[range_key]
+        hero_cards, board_cards = [eval7.Card(c) for c in hero], [eval7.Card(c) for c in board]
+        hero_idx, board_idx = [card_index(c) for c in hero], [card_index(c) for c in board]
+        calls = {
+            'numpy': lambda: hand_evaluator.hand_vs_range(hero_idx, board_idx, combo_range.cards, combo_range.weights),
+            'eval7 exact': lambda: combo_range.exact_equity(hero_cards, board_cards),
+            'eval7 MC 5000': lambda: combo_range.monte_carlo_equity(hero_cards, board_cards, 5000),
+        }
+        rows.append((street, {name: timed(call, repeat) for name, call in calls.items()}))
+    return rows
+
+def bench_range_vs_range(calculator: EquityCalculator, repeat: int) -> List[Tuple[str, float, float]]:
+    """(street, ms, equity) of sb_4bet vs bb_call_vs_4bet with the vectorized evaluator"""
+    hero, villain = calculator.ranges['sb_4bet'], calculator.ranges['bb_call_vs_4bet']
+    rows = []
+    for street, _, board, _ in SITUATIONS:
+        board_idx = [card_index(c) for c in board]
+        ms, (equity, _) = timed(lambda: hand_evaluator.range_vs_range(
+            hero.cards, hero.weights, villain.cards, villain.weights, board_idx, max_runouts=200), repeat)
+        rows.append((street, ms, equity))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized NumPy hand evaluator vs eval7 and treys")
+    parser.add_argument('--hands', type=int, default=100000, help="Random 7-card hands scored per evaluator")
+    parser.add_argument('--repeat', type=int, default=3, help="Best of this many runs")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    hands = np.argsort(rng.random((args.hands, 52)), axis=1)[:, :7].astype(np.int32)
+    hand_evaluator.evaluate(hands[:10])
+
+    print(f"\n{'evaluator':<14} {'ms':>10} {'us/hand':>9} {'hands/s':>12}   ({args.hands} random 7-card hands)")
+    for name, ms in bench_evaluators(hands, args.repeat).items():
+        print(f"{name:<14} {ms:>10.1f} {ms * 1000 / args.hands:>9.3f} {args.hands / ms * 1000:>12,.0f}")
+
+    calculator = EquityCalculator()
+    print(f"\n{'hand vs range':<14} " + " ".join(f"{name:>22}" for name in ['numpy', 'eval7 exact', 'eval7 MC 5000']))
+    for street, results in bench_equity(calculator, args.repeat):
+        print(f"{street:<14} " + " ".join(f"{ms:>9.1f} ms ({equity:6.2%})" for ms, equity in results.values()))
+
+    print(f"\n{'range vs range':<14} {'ms':>10} {'equity':>8}   (sb_4bet vs bb_call_vs_4bet, <= 200 runouts)")
+    for street, ms, equity in bench_range_vs_range(calculator, args.repeat):
+        print(f"{street:<14} {ms:>10.1f} {equity:>8.2%}")
+
+if __name__ == "__main__":
+    main()
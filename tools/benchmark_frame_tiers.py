@@ -0,0 +1,71 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import cv2
+import numpy as np
+from src.detector.template_matcher import TemplateMatcher
+from src.detector.table_detector import PokerTableDetector
+from src.detector.table_frame import TableFrame
+from src.utils.screen_capture import RawFrame
+from tools.benchmark_card_classifier import load_frames
+
+def run(downscale, frames, repeat, ocr_engine, cold):
+    """One main-loop tick per frame: next hand, hero turn and the full table state"""
+    matcher = TemplateMatcher('card_templates', reload_interval=0, presence_downscale=downscale)
+    detector = PokerTableDetector(matcher, ocr_engine=ocr_engine)
+    timings, pixels = [], []
+    try:
+        for _ in range(repeat):
+            for _, screen in frames:
+                if cold:
+                    detector.region_cache.invalidate()
+                    detector.reset_hand_cache()
+                start = time.perf_counter()
+                frame = TableFrame(screen)
+                matcher.detect_next_hand_button(frame)
+                is_hero_turn = detector.detect_hero_turn(frame)
+                detector.detect_table_state(frame, is_hero_turn)
+                timings.append((time.perf_counter() - start) * 1000)
+                pixels.append(frame.pixel_reads())
+    finally:
+        detector.shutdown()
+
+    timings = timings[len(frames):] or timings
+    pixels = pixels[len(frames):] or pixels
+    tiers = sorted({factor for reads in pixels for factor in reads})
+    per_tier = ', '.join(f"{factor}x {np.mean([reads.get(factor, 0) for reads in pixels]) / 1e3:7.1f} kpx"
+                         for factor in tiers)
+    total = np.mean([sum(reads.values()) for reads in pixels])
+    print(f"downscale {downscale}: {total / 1e3:7.1f} kpx per tick ({per_tier}) | "
+          f"mean {np.mean(timings):7.2f} ms | p95 {np.percentile(timings, 95):7.2f} ms | "
+          f"{total / np.mean(timings) / 1e3:6.2f} Mpx/s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pixels read per tick with and without the downscaled presence tier")
+    parser.add_argument('frames', nargs='*', default=['debug_images'],
+                        help="Folders with saved 1080x1920 screenshots")
+    parser.add_argument('--downscales', nargs='+', type=int, default=[1, 2],
+                        help="Presence tier factors to compare, 1 reads everything at full resolution")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--ocr', default='auto', help="OCR engine, see src/detector/ocr_engine.py")
+    parser.add_argument('--raw', action='store_true',
+                        help="Feed frames as RawFrame, like the raw/stream capture backends")
+    parser.add_argument('--cold', action='store_true',
+                        help="Clear region and hand caches before every tick")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print("No 1080x1920 frames found")
+        return
+    if args.raw:
+        frames = [(name, RawFrame(cv2.cvtColor(image, cv2.COLOR_BGR2RGBA))) for name, image in frames]
+
+    for downscale in args.downscales:
+        run(downscale, frames, args.repeat, args.ocr, args.cold)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import cv2
+import numpy as np
+from src.config.regions import STACK_REGIONS, BET_REGIONS
+from src.detector.ocr_engine import OCR_ENGINES, create_ocr_engine
+from src.detector.table_frame import TableFrame
+from src.detector.text_detector import TextDetector
+
+NUMERIC_REGIONS = ['pot_preflop', 'pot_postflop'] + \
+    [f'stack_{player}' for player in STACK_REGIONS] + [f'bet_{player}' for player in BET_REGIONS]
+
+def load_frame_rois(directories):
+    """The numeric ROIs of every full-size screenshot, grouped per frame like detect_table_state submits them"""
+    batches = []
+    for directory in directories:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.lower().endswith('.png'):
+                continue
+            image = cv2.imread(os.path.join(directory, filename))
+            if image is not None and image.shape[:2] == (1920, 1080):
+                frame = TableFrame(image)
+                batches.append([frame.crop(region) for region in NUMERIC_REGIONS])
+    return batches
+
+def run_engine(name, batches):
+    try:
+        engine = create_ocr_engine(name)
+    except (ImportError, RuntimeError, OSError) as e:
+        print(f"{name:<12} unavailable: {e}")
+        return None
+
+    per_roi, values = [], []
+    try:
+        for rois in batches:
+            start = time.perf_counter()
+            texts = engine.recognize(rois)
+            per_roi.append((time.perf_counter() - start) * 1000 / len(rois))
+            values.append([TextDetector.extract_number(text) for text in texts])
+    except (RuntimeError, OSError) as e:
+        # e.g. tesseract binary missing
+        print(f"{name:<12} failed: {e}")
+        return None
+    finally:
+        engine.close()
+
+    print(f"{name:<12} mean {np.mean(per_roi):7.2f} ms | p50 {np.percentile(per_roi, 50):7.2f} ms | "
+          f"p95 {np.percentile(per_roi, 95):7.2f} ms per ROI")
+    return values
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-ROI latency of the OCR engines on saved screenshots")
+    parser.add_argument('frames', nargs='*', default=['debug_images'],
+                        help="Folders with saved 1080x1920 screenshots")
+    parser.add_argument('--engines', nargs='+', default=list(OCR_ENGINES), choices=list(OCR_ENGINES))
+    args = parser.parse_args()
+
+    batches = load_frame_rois(args.frames)
+    if not batches:
+        print("No 1080x1920 frames found")
+        return
+    print(f"{len(batches)} frames, {len(NUMERIC_REGIONS)} numeric ROIs each\n")
+
+    results = {name: run_engine(name, batches) for name in args.engines}
+
+    # Every engine must read the same numbers as the original per-ROI pytesseract path
+    reference = results.get('pytesseract')
+    if reference is None:
+        return
+    for name, values in results.items():
+        if name == 'pytesseract' or values is None:
+            continue
+        agree = sum(a == b for ref, got in zip(reference, values) for a, b in zip(ref, got))
+        print(f"{name} agrees with pytesseract on {agree}/{len(batches) * len(NUMERIC_REGIONS)} ROIs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import numpy as np
+from src.detector.region_executor import EXECUTOR_MODES
+from src.detector.template_matcher import TemplateMatcher
+from src.detector.table_detector import PokerTableDetector
+from src.detector.table_frame import TableFrame
+from tools.benchmark_card_classifier import load_frames
+
+def run(mode, workers, frames, repeat, ocr_engine):
+    detector = PokerTableDetector(TemplateMatcher('card_templates', reload_interval=0),
+                                  ocr_engine=ocr_engine, executor=mode, workers=workers)
+    timings = []
+    try:
+        for _ in range(repeat):
+            for _, image in frames:
+                # Cold caches: every region is extracted, as on the first frame of a hand
+                detector.region_cache.invalidate()
+                detector.reset_hand_cache()
+                start = time.perf_counter()
+                detector.detect_table_state(TableFrame(image))
+                timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        detector.shutdown()
+
+    # The first frames include pool start-up and template spectra
+    timings = timings[len(frames):] or timings
+    print(f"{mode:<8} mean {np.mean(timings):7.2f} ms | p50 {np.percentile(timings, 50):7.2f} ms | "
+          f"p95 {np.percentile(timings, 95):7.2f} ms per frame")
+
+def main():
+    parser = argparse.ArgumentParser(description="detect_table_state latency per region executor")
+    parser.add_argument('frames', nargs='*', default=['debug_images'],
+                        help="Folders with saved 1080x1920 screenshots")
+    parser.add_argument('--modes', nargs='+', default=EXECUTOR_MODES, choices=EXECUTOR_MODES)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--ocr', default='auto', help="OCR engine, see src/detector/ocr_engine.py")
+    args = parser.parse_args()
+
+    frames = load_frames(args.frames)
+    if not frames:
+        print("No 1080x1920 frames found")
+        return
+
+    for mode in args.modes:
+        run(mode, args.workers, frames, args.repeat, args.ocr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import itertools
+import json
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+import eval7
+import numpy as np
+from src.utils.combo_range import ComboRange
+from src.utils.equity_calculator import EquityCalculator
+from src.utils.flop_equity_table import (
+    FLOPS_FILE, META_FILE, NUM_COMBOS, TABLES_DIR, canonical_flops, table_path
+)
+from src.utils.hand_evaluator import card_name
+
+_ranges: Dict[str, ComboRange] = {}
+_flops: List[Tuple[int, ...]] = []
+
+def _init_worker(ranges: Dict[str, Dict[str, float]], flops: List[Tuple[int, ...]]):
+    global _ranges, _flops
+    _ranges = {key: ComboRange(key, weights) for key, weights in ranges.items()}
+    _flops = flops
+
+def build_row(task: Tuple[int, int]) -> Tuple[int, Dict[str, np.ndarray]]:
+    """Equity of every hero combo on one canonical flop against each range"""
+    row, iterations = task
+    flop = [card_name(c) for c in _flops[row]]
+    board = [eval7.Card(c) for c in flop]
+    equities = {key: np.full(NUM_COMBOS, np.nan, dtype=np.float16) for key in _ranges}
+    for combo, (a, b) in enumerate(itertools.combinations(range(52), 2)):
+        hero = [card_name(a), card_name(b)]
+        if hero[0] in flop or hero[1] in flop:
+            continue
+        hero_hand = [eval7.Card(c) for c in hero]
+        for key, combo_range in _ranges.items():
+            equities[key][combo] = combo_range.monte_carlo_equity(hero_hand, board, iterations)
+    return row, equities
+
+def open_table(path: str, rows: int):
+    """Existing table to resume, or a new one with every entry missing"""
+    if os.path.isfile(path):
+        return np.lib.format.open_memmap(path, mode='r+')
+    table = np.lib.format.open_memmap(path, mode='w+', dtype=np.float16, shape=(rows, NUM_COMBOS))
+    table[:] = np.nan
+    return table
+
+def main():
+    calculator = EquityCalculator()
+    parser = argparse.ArgumentParser(
+        description="Precompute flop equity of every hero combo vs each preflop range for EquityCalculator")
+    parser.add_argument('--output', default=TABLES_DIR)
+    parser.add_argument('--ranges', nargs='+', default=list(calculator.raw_ranges),
+                        choices=list(calculator.raw_ranges))
+    parser.add_argument('--iterations', type=int, default=3000, help="Monte Carlo samples per hero combo and range")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--limit', type=int, default=0, help="Only build this many missing flops (resumable)")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    flops = canonical_flops()
+    digests = {key: calculator.ranges[key].digest for key in args.ranges}
+    meta_path = os.path.join(args.output, META_FILE)
+    meta = {'iterations': args.iterations, 'flops': len(flops), 'ranges': [], 'digests': {}}
+    if os.path.isfile(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        meta.setdefault('digests', {})
+        # Every row of a build shares one sample size, which the reported std_error relies on
+        if meta['iterations'] != args.iterations:
+            sys.exit(f"{args.output} was built with --iterations {meta['iterations']}; resume with that "
+                     f"or build into a new directory")
+        stale = [key for key in args.ranges
+                 if os.path.isfile(table_path(args.output, key)) and meta['digests'].get(key) != digests[key]]
+        if stale:
+            sys.exit(f"Range files changed since their tables were built: {stale}; "
+                     f"delete those tables to rebuild them")
+
+    if not os.path.isfile(meta_path) or any(meta['digests'].get(key) != digests[key] for key in args.ranges):
+        np.save(os.path.join(args.output, FLOPS_FILE), np.array(flops, dtype=np.int8))
+        meta['ranges'] = sorted(set(meta['ranges']) | set(args.ranges))
+        meta['digests'].update(digests)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    tables = {key: open_table(table_path(args.output, key), len(flops)) for key in args.ranges}
+    # A flop is done once every range has it; a row never has all 1,326 combos blocked
+    missing = [row for row in range(len(flops)) if any(np.isnan(t[row]).all() for t in tables.values())]
+    if args.limit:
+        missing = missing[:args.limit]
+    print(f"{len(flops)} canonical flops, {len(missing)} to build for {len(args.ranges)} ranges "
+          f"at {args.iterations} iterations")
+
+    ranges = {key: calculator.raw_ranges[key] for key in args.ranges}
+    start = time.perf_counter()
+    with Pool(args.workers, initializer=_init_worker, initargs=(ranges, flops)) as pool:
+        tasks = [(row, args.iterations) for row in missing]
+        for done, (row, equities) in enumerate(pool.imap_unordered(build_row, tasks), 1):
+            for key, values in equities.items():
+                tables[key][row] = values
+            if done % 25 == 0 or done == len(missing):
+                for table in tables.values():
+                    table.flush()
+                elapsed = time.perf_counter() - start
+                print(f"{done}/{len(missing)} flops, {elapsed:.0f}s elapsed, "
+                      f"{elapsed / done * (len(missing) - done):.0f}s left")
+
+    size = sum(t.nbytes for t in tables.values())
+    print(f"Tables written to {args.output} ({size / 1024 / 1024:.1f} MiB)")
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,7 @@ def debug_template_matching():
         raise ValueError(f"Failed to load test image from {test_image_path}")
     
     # Detect buttons
-    detected_actions = detector.detect_action_buttons(test_image)
+    detected_actions = detector.detect_action_buttons(test_image, debug=True)
     
     # Print results
     print("\nDetected actions:")
@@ -0,0 +1,192 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import cv2
+import numpy as np
+from src.detector.digit_reader import DIGIT_FAMILY, segment_glyphs
+from src.detector.table_frame import TableFrame
+from src.config.regions import STACK_REGIONS, BET_REGIONS
+
+# Key pressed while a glyph is shown -> template file name
+LABEL_KEYS = {ord(str(d)): str(d) for d in range(10)}
+LABEL_KEYS.update({ord('.'): 'dot', ord(','): 'comma', ord('b'): 'B'})
+
+# Character -> template file name, for labels given as text
+CHAR_NAMES = {char: name for name, char in ((LABEL_KEYS[key], chr(key)) for key in LABEL_KEYS)}
+CHAR_NAMES['B'] = 'B'
+
+AMOUNT_REGIONS = ['pot_postflop'] + [f'stack_{p}' for p in STACK_REGIONS] + [f'bet_{p}' for p in BET_REGIONS]
+
+class DigitTemplateCapture:
+    def __init__(self, image_path: str = None, template_path: str = 'card_templates'):
+        # Create output directory if it doesn't exist
+        self.output_dir = os.path.join(template_path, DIGIT_FAMILY)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.image_path = image_path
+        self.device = None
+        if image_path is None:
+            from src.utils.device_connector import DeviceConnector
+            self.device = DeviceConnector.connect_device()
+
+        # Initialize variables for region selection
+        self.start_point = None
+        self.drawing = False
+        self.current_image = None
+        self.pending_region = None
+
+    def take_screenshot(self):
+        """Take a screenshot of the device (or reload the image file) as an OpenCV image."""
+        if self.device is None:
+            self.current_image = cv2.imread(self.image_path)
+        else:
+            screenshot_data = self.device.screencap()
+            nparr = np.frombuffer(screenshot_data, np.uint8)
+            self.current_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        return self.current_image.copy()
+
+    def mouse_callback(self, event, x, y, flags, param):
+        """Handle mouse events for selecting an amount."""
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self.drawing = True
+            self.start_point = (x, y)
+
+        elif event == cv2.EVENT_MOUSEMOVE and self.drawing:
+            temp_img = self.current_image.copy()
+            cv2.rectangle(temp_img, self.start_point, (x, y), (0, 255, 0), 2)
+            cv2.imshow('Capture Digits', temp_img)
+
+        elif event == cv2.EVENT_LBUTTONUP:
+            self.drawing = False
+            x1, x2 = sorted((self.start_point[0], x))
+            y1, y2 = sorted((self.start_point[1], y))
+            if (x2 - x1) > 0 and (y2 - y1) > 0:
+                # Labelling needs waitKey, so it runs from the main loop
+                self.pending_region = {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2}
+
+    def next_filename(self, name: str) -> str:
+        """name.png for the first sample of a glyph, name_1.png, name_2.png, ... after that"""
+        filename = os.path.join(self.output_dir, f'{name}.png')
+        index = 1
+        while os.path.exists(filename):
+            filename = os.path.join(self.output_dir, f'{name}_{index}.png')
+            index += 1
+        return filename
+
+    def label_glyphs(self, frame: TableFrame, region) -> int:
+        """Show each glyph of a region and save it under the label typed for it"""
+        glyphs = segment_glyphs(frame.gray(region))
+        if not glyphs:
+            print("No single line of white text found in that region")
+            return 0
+
+        saved = 0
+        for glyph in glyphs:
+            preview = cv2.resize(glyph, None, fx=6, fy=6, interpolation=cv2.INTER_NEAREST)
+            cv2.imshow('Glyph', preview)
+            key = cv2.waitKey(0) & 0xFF
+            if key == ord('q'):
+                break
+            if key not in LABEL_KEYS:
+                print("Skipped glyph")
+                continue
+            filename = self.next_filename(LABEL_KEYS[key])
+            cv2.imwrite(filename, glyph)
+            print(f"Saved {filename}")
+            saved += 1
+        cv2.destroyWindow('Glyph')
+        return saved
+
+    def label_text(self, frame: TableFrame, region, text: str) -> int:
+        """
+        Save the glyphs of a region under the characters of its known text, without prompting
+
+        Args:
+            frame (TableFrame): Screenshot holding the amount
+            region: Named region or box of the amount
+            text (str): What the amount reads, e.g. '12.5 BB'; spaces are ignored
+
+        Returns:
+            int: Templates saved; glyphs whose character already has a template are skipped
+        """
+        chars = text.replace(' ', '')
+        glyphs = segment_glyphs(frame.gray(region))
+        if not glyphs or len(glyphs) != len(chars):
+            print(f"{region}: found {len(glyphs or [])} glyphs for '{text}', skipped")
+            return 0
+
+        saved = 0
+        for glyph, char in zip(glyphs, chars):
+            name = CHAR_NAMES.get(char)
+            if name is None:
+                print(f"{region}: no template name for '{char}', skipped")
+                continue
+            if os.path.exists(os.path.join(self.output_dir, f'{name}.png')):
+                continue
+            filename = self.next_filename(name)
+            cv2.imwrite(filename, glyph)
+            print(f"Saved {filename}")
+            saved += 1
+        return saved
+
+    def capture_templates(self):
+        """Main loop for capturing templates."""
+        print("Instructions:")
+        print("1. Click and drag around a stack, bet or pot amount")
+        print("   or press 'a' to go through all amount regions of the table")
+        print("2. For each glyph shown press its character: 0-9, '.', ',' or 'b' for B")
+        print("   (any other key skips the glyph)")
+        print("3. Press 'r' to refresh screenshot")
+        print("4. Press 'q' to quit")
+
+        cv2.namedWindow('Capture Digits')
+        cv2.setMouseCallback('Capture Digits', self.mouse_callback)
+
+        screen = self.take_screenshot()
+        while True:
+            cv2.imshow('Capture Digits', screen)
+
+            if self.pending_region is not None:
+                self.label_glyphs(TableFrame(self.current_image), self.pending_region)
+                self.pending_region = None
+
+            key = cv2.waitKey(50) & 0xFF
+            if key == ord('q'):
+                break
+            elif key == ord('r'):
+                print("Refreshing screenshot...")
+                screen = self.take_screenshot()
+            elif key == ord('a'):
+                frame = TableFrame(self.current_image)
+                for region in AMOUNT_REGIONS:
+                    print(f"\n{region}:")
+                    self.label_glyphs(frame, region)
+
+        cv2.destroyAllWindows()
+
+def main():
+    parser = argparse.ArgumentParser(description="Harvest digit glyph templates for GlyphDigitReader")
+    parser.add_argument('--image', help="Label glyphs from a saved screenshot instead of the device")
+    parser.add_argument('--templates', default='card_templates', help="Template root directory")
+    parser.add_argument('--text', nargs='+', metavar='REGION=TEXT',
+                        help="With --image, label amount regions from their known text instead of "
+                             "prompting, e.g. bet_hero=2.5 stack_villain=90")
+    args = parser.parse_args()
+
+    try:
+        capturer = DigitTemplateCapture(args.image, args.templates)
+        if args.text:
+            if args.image is None:
+                raise ValueError("--text needs --image")
+            frame = TableFrame(capturer.take_screenshot())
+            saved = sum(capturer.label_text(frame, *item.split('=', 1)) for item in args.text)
+            print(f"{saved} new glyph templates in {capturer.output_dir}")
+            return
+        capturer.capture_templates()
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import numpy as np
+from src.utils.fake_device import FakeDevice
+from src.utils.frame_recorder import to_json
+from src.detector.region_executor import EXECUTOR_MODES
+
+def span_totals(timer) -> dict:
+    """ms per span path of the tick, e.g. 'table_state/ocr/tesseract'"""
+    totals = {}
+    for path, _, seconds, _ in timer.spans:
+        totals[path] = totals.get(path, 0.0) + seconds * 1000
+    return {path: round(ms, 3) for path, ms in totals.items()}
+
+def tick_record(app, index: int, frame_name: str, taps) -> dict:
+    """One JSONL line: what the tick saw, what it tapped and how long each stage took"""
+    action = app.last_tick['action']
+    return {
+        'frame': index,
+        'source': frame_name,
+        'timings_ms': span_totals(app.tick_timer),
+        'total_ms': round(app.tick_timer.total() * 1000, 3),
+        'next_hand': app.last_tick['next_hand'],
+        'hero_turn': bool(app.last_tick['hero_turn']),
+        'state': to_json(app.last_tick['state']),
+        'action': to_json({k: v for k, v in action.items() if k != 'reasoning'}) if action else None,
+        'taps': [list(tap) for tap in taps],
+        'capture_to_tap_ms': round(app.tick_timer.marks['tap'] * 1000, 3) if 'tap' in app.tick_timer.marks else None,
+    }
+
+def print_summary(records):
+    if not records:
+        print("No frames replayed")
+        return
+    totals = [r['total_ms'] for r in records]
+    print(f"\n{len(records)} frames | {sum(r['hero_turn'] for r in records)} hero turns | "
+          f"{sum(len(r['taps']) for r in records)} taps")
+    print(f"{'tick':<40} mean {np.mean(totals):8.2f} ms | p50 {np.percentile(totals, 50):8.2f} ms | "
+          f"p95 {np.percentile(totals, 95):8.2f} ms")
+    stages = sorted({name for r in records for name in r['timings_ms']})
+    for stage in stages:
+        timings = [r['timings_ms'][stage] for r in records if stage in r['timings_ms']]
+        print(f"{stage:<40} mean {np.mean(timings):8.2f} ms | p50 {np.percentile(timings, 50):8.2f} ms | "
+              f"p95 {np.percentile(timings, 95):8.2f} ms ({len(timings)} frames)")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive PokerDetectorApp from recorded frames and write per-frame timings and state as JSONL")
+    parser.add_argument('source', help="Directory of PNG screenshots, a screen recording video "
+                                       "or a frame archive recorded with RECORD_FRAMES=1")
+    parser.add_argument('--output', help="JSONL path, defaults to replay.jsonl in the session log directory")
+    parser.add_argument('--limit', type=int, default=0, help="Stop after this many frames")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the preflop strategy's mixed frequencies")
+    parser.add_argument('--ai-provider', default='stub', help="Post-flop engine: 'stub', 'openai' or 'claude'")
+    parser.add_argument('--ocr', default=os.environ.get("OCR_ENGINE", "auto"),
+                        help="OCR engine, see src/detector/ocr_engine.py")
+    parser.add_argument('--executor', default=os.environ.get("REGION_EXECUTOR", "serial"), choices=EXECUTOR_MODES)
+    args = parser.parse_args()
+
+    # Frames must advance exactly once per tick, which only the PNG backend guarantees
+    os.environ["CAPTURE_BACKEND"] = "png"
+    os.environ["OCR_ENGINE"] = args.ocr
+    os.environ["REGION_EXECUTOR"] = args.executor
+    random.seed(args.seed)
+
+    from main import PokerDetectorApp
+    device = FakeDevice(args.source, loop=False)
+    app = PokerDetectorApp(device=device, ai_provider=args.ai_provider, realtime=False)
+    output = args.output or os.path.join(app.logger.session_dir, 'replay.jsonl')
+
+    records = []
+    previous_state = None
+    try:
+        with open(output, 'w', encoding='utf-8') as f:
+            while app.bot_controller.should_continue() and (not args.limit or len(records) < args.limit):
+                taps_before = len(device.taps)
+                try:
+                    previous_state = app.tick(previous_state)
+                except EOFError:
+                    break
+                app.trace_log.record(app.tick_timer)
+                record = tick_record(app, len(records), device.current_frame, device.taps[taps_before:])
+                f.write(json.dumps(record) + '\n')
+                records.append(record)
+    finally:
+        app.table_detector.shutdown()
+        app.trace_log.close()
+        app.logger.close()
+
+    print_summary(records)
+    print(f"Replay written to {output}")
+
+if __name__ == "__main__":
+    main()
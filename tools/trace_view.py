@@ -0,0 +1,74 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import glob
+import json
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from src.utils.trace_log import CAPTURE_TO_TAP, TraceLog
+
+def latest_trace(log_dir: str) -> Optional[str]:
+    traces = glob.glob(os.path.join(log_dir, 'session_*', 'trace.jsonl'))
+    return max(traces, key=os.path.getmtime) if traces else None
+
+def tick_durations(line: Dict) -> Dict[str, float]:
+    """Same per-stage ms a live TraceLog keeps for one tick"""
+    durations: Dict[str, float] = {}
+    for span in line['spans']:
+        durations[span['name']] = durations.get(span['name'], 0.0) + span['ms']
+    durations['total'] = line['total_ms']
+    if 'tap' in line['marks']:
+        durations[CAPTURE_TO_TAP] = line['marks']['tap']
+    return durations
+
+def rolling_stats(recent: deque) -> Dict[str, Dict[str, float]]:
+    values: Dict[str, List[float]] = {}
+    for durations in recent:
+        for path, ms in durations.items():
+            values.setdefault(path, []).append(ms)
+    return TraceLog._percentiles(values)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling p50/p95 per stage of a running (or finished) bot session")
+    parser.add_argument('trace', nargs='?', help="trace.jsonl, defaults to the newest session in --log-dir")
+    parser.add_argument('--log-dir', default='logs')
+    parser.add_argument('--window', type=int, default=200, help="Ticks the percentiles are computed over")
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between refreshes")
+    parser.add_argument('--once', action='store_true', help="Print the table for the whole file and exit")
+    args = parser.parse_args()
+
+    path = args.trace or latest_trace(args.log_dir)
+    if not path or not os.path.isfile(path):
+        print(f"No trace found in {args.log_dir}, run the bot first")
+        return
+
+    recent: deque = deque(maxlen=args.window)
+    ticks = 0
+    pending = ''
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            while True:
+                for line in f.readlines():
+                    # The bot may be halfway through writing the last line
+                    if not line.endswith('\n'):
+                        pending += line
+                        continue
+                    line, pending = pending + line, ''
+                    if line.strip():
+                        recent.append(tick_durations(json.loads(line)))
+                        ticks += 1
+                table = TraceLog.format_stats(rolling_stats(recent),
+                                              f"{path}: last {len(recent)} of {ticks} ticks")
+                if args.once:
+                    print(table)
+                    return
+                print("\033[2J\033[H" + table, flush=True)
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()